@@ -18,6 +18,8 @@ class Settings(BaseModel):
     openai_api_key: str = Field(alias="OPENAI_API_KEY")
     scite_api_key: str = Field(alias="SCITE_API_KEY")
     openalex_mailto: str | None = Field(default=None, alias="OPENALEX_MAILTO")
+    openalex_cache_path: str | None = Field(default=None, alias="OPENALEX_CACHE_PATH")
+    openalex_snapshot_path: str | None = Field(default=None, alias="OPENALEX_SNAPSHOT_PATH")
     e2b_api_key: str | None = Field(default=None, alias="E2B_API_KEY")
 
     langchain_tracing_v2: bool = Field(default=False, alias="LANGCHAIN_TRACING_V2")
@@ -30,6 +32,8 @@ def _collect_settings(secret_manager: SecretManager) -> tuple[dict[str, Any], li
     required_keys = ["OPENAI_API_KEY", "SCITE_API_KEY"]
     optional_keys = [
         "OPENALEX_MAILTO",
+        "OPENALEX_CACHE_PATH",
+        "OPENALEX_SNAPSHOT_PATH",
         "E2B_API_KEY",
         "LANGCHAIN_TRACING_V2",
         "LANGCHAIN_ENDPOINT",
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from collections.abc import Callable
+from pathlib import Path
 from typing import Any
 
 from langgraph.checkpoint.memory import MemorySaver
@@ -12,6 +13,7 @@ from thesis_generator.agents.validator import validate_documents
 from thesis_generator.agents.writer import draft_manuscript
 from thesis_generator.graph.supervisor import RouteResponse, route_next
 from thesis_generator.state import ResearchDocument, Section, ThesisState
+from thesis_generator.tools.ingest import restore_vector_store, snapshot_vector_store
 
 
 def _coerce_state(state: ThesisState | dict[str, Any]) -> ThesisState:
@@ -66,6 +68,39 @@ def _analyst_node(state: ThesisState) -> ThesisState:
     return state
 
 
+def _with_store_snapshots(
+    node: Callable[[ThesisState], ThesisState], directory: str | Path
+) -> Callable[[ThesisState | dict[str, Any]], ThesisState]:
+    """Reattach the state's store before ``node`` and snapshot it afterwards.
+
+    Snapshots are taken at the same steps the checkpointer saves state, so a resumed
+    thread finds its ``memory://`` store instead of a dangling ``vector_store_uri``.
+    A store the registry evicted without spilling is reattached from its last
+    snapshot; one that was never snapshotted is lost and raises ``ValueError``.
+    """
+
+    def run(state: ThesisState | dict[str, Any]) -> ThesisState:
+        current = _coerce_state(state)
+        if current.vector_store_uri:
+            restore_vector_store(current.vector_store_uri, directory)
+        result: ThesisState | dict[str, Any] = node(current)
+        # Nodes may also return a partial update, as LangGraph allows.
+        if not isinstance(result, ThesisState):
+            result = {**dict(current), **result}
+        updated = _coerce_state(result)
+        uri = updated.vector_store_uri
+        if uri and uri.startswith("memory://"):
+            if not restore_vector_store(uri, directory):
+                raise ValueError(
+                    f"Vector store {uri} was evicted before its first snapshot; "
+                    "configure a registry spill_directory to keep evicted stores"
+                )
+            snapshot_vector_store(uri, directory)
+        return updated
+
+    return run
+
+
 def _routing_key(state: ThesisState | dict[str, Any]) -> str:
     current = _coerce_state(state)
     return route_next(current).next_agent
@@ -78,15 +113,26 @@ def build_main_graph(
     writer_node: Callable[[ThesisState], ThesisState] = _writer_node,
     validator_node: Callable[[ThesisState], ThesisState] = _validator_node,
     analyst_node: Callable[[ThesisState], ThesisState] = _analyst_node,
+    snapshot_directory: str | Path | None = None,
 ) -> Any:
-    """Construct the main StateGraph for the thesis workflow."""
-
+    """Construct the main StateGraph for the thesis workflow.
+
+    With ``snapshot_directory`` the worker nodes snapshot the state's in-memory
+    vector store after each step and reattach it before the next one.
+    """
+
+    workers = {
+        "researcher": researcher_node,
+        "writer": writer_node,
+        "validator": validator_node,
+        "analyst": analyst_node,
+    }
     workflow = StateGraph(ThesisState)
     workflow.add_node("supervisor", _supervisor_node)
-    workflow.add_node("researcher", researcher_node)
-    workflow.add_node("writer", writer_node)
-    workflow.add_node("validator", validator_node)
-    workflow.add_node("analyst", analyst_node)
+    for name, worker in workers.items():
+        if snapshot_directory is not None:
+            worker = _with_store_snapshots(worker, snapshot_directory)
+        workflow.add_node(name, worker)
 
     workflow.add_edge(START, "supervisor")
     workflow.add_conditional_edges(
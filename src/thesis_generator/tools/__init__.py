@@ -1,19 +1,39 @@
+from .ann import IVFFlatIndex
 from .citation_check import SciteClient, check_citations, evaluate_citations_with_fallback
+from .citation_graph import CitationGraph, expand_citation_graph
 from .code_execution import (
     ExecutionFailed,
     ExecutionResult,
     SandboxUnavailableError,
     execute_python,
 )
+from .dedupe import MinHashLSH
+from .embeddings import Embedder, HashingEmbedder
 from .ingest import (
+    AnnRecallReport,
+    ChildSpan,
     Chunk,
     ParentChildVectorStore,
+    ParentSearchResult,
+    PassageMatch,
+    SearchCacheInfo,
     SearchResult,
     SourceDocument,
     SourceSection,
+    VectorStoreRegistry,
+    ann_recall_report,
+    append_documents,
+    configure_vector_store_registry,
     ingest_documents,
+    release_vector_store,
+    remove_document,
+    rerank_search,
     reset_vector_store_registry,
+    search_many,
+    search_parents,
     search_sections,
+    vector_store_sizes,
+    verify_passage,
 )
 from .openalex import (
     OpenAlexAPI,
@@ -21,27 +41,69 @@ from .openalex import (
     openalex_get_paper,
     openalex_search,
 )
+from .openalex_cache import OpenAlexCache, OpenAlexCacheInfo
+from .openalex_snapshot import OpenAlexSnapshot
+from .passages import ShingleIndex
 from .pdf_parser import parse_pdf_from_url
+from .rate_limit import HostBudget, RateLimitStats, TokenBucketScheduler, shared_scheduler
+from .rerank import LexicalReranker, Reranker, RerankInfo, RerankStage
+from .sharding import ShardedVectorStore, ingest_sharded_documents
 
 __all__ = [
+    "ann_recall_report",
+    "AnnRecallReport",
+    "append_documents",
     "check_citations",
+    "CitationGraph",
+    "ChildSpan",
+    "configure_vector_store_registry",
     "Chunk",
     "ParentChildVectorStore",
+    "ParentSearchResult",
+    "PassageMatch",
+    "SearchCacheInfo",
     "SearchResult",
     "SourceDocument",
     "SourceSection",
+    "Embedder",
     "ExecutionFailed",
     "ExecutionResult",
     "SandboxUnavailableError",
     "execute_python",
+    "expand_citation_graph",
+    "HashingEmbedder",
+    "HostBudget",
     "ingest_documents",
+    "ingest_sharded_documents",
+    "IVFFlatIndex",
+    "LexicalReranker",
+    "MinHashLSH",
     "OpenAlexAPI",
+    "OpenAlexCache",
+    "OpenAlexCacheInfo",
     "OpenAlexPaper",
+    "OpenAlexSnapshot",
     "openalex_get_paper",
     "openalex_search",
     "parse_pdf_from_url",
+    "RateLimitStats",
+    "release_vector_store",
+    "remove_document",
+    "rerank_search",
+    "Reranker",
+    "RerankInfo",
+    "RerankStage",
     "reset_vector_store_registry",
     "SciteClient",
+    "ShardedVectorStore",
+    "shared_scheduler",
+    "ShingleIndex",
+    "TokenBucketScheduler",
+    "search_many",
+    "search_parents",
     "search_sections",
     "evaluate_citations_with_fallback",
+    "vector_store_sizes",
+    "VectorStoreRegistry",
+    "verify_passage",
 ]
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import Mapping, MutableSequence
+from typing import Any, cast
+
+import numpy as np
+
+
+class IVFFlatIndex:
+    """Inverted-file index for approximate inner-product search over unit vectors.
+
+    Rows are clustered into ``nlist`` lists with spherical k-means trained on a sample
+    of ``train_per_list * nlist`` rows. A query scores the centroids, then scans the
+    rows of the ``nprobe`` best lists exactly, so raising ``nprobe`` trades latency
+    for recall up to exact search at ``nprobe == nlist``. Rows added after training
+    are assigned to their nearest centroid without retraining.
+    """
+
+    def __init__(
+        self,
+        nlist: int = 100,
+        nprobe: int = 8,
+        *,
+        iterations: int = 10,
+        train_per_list: int = 64,
+        seed: int = 0,
+    ) -> None:
+        if nlist <= 0 or nprobe <= 0:
+            raise ValueError("nlist and nprobe must be positive")
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.iterations = iterations
+        self.train_per_list = train_per_list
+        self.seed = seed
+        self.centroids = np.empty((0, 0), dtype=np.float32)
+        self._assignments: MutableSequence[int] | np.ndarray = array("i")
+        self._lists: tuple[np.ndarray, np.ndarray] | None = None
+
+    @property
+    def trained(self) -> bool:
+        return len(self.centroids) > 0
+
+    def __len__(self) -> int:
+        return len(self._assignments)
+
+    def train(self, vectors: np.ndarray) -> None:
+        """Fit centroids on a sample of ``vectors`` and assign every row to a list."""
+
+        if not len(vectors):
+            raise ValueError("Cannot train an IVF index without vectors")
+        rng = np.random.default_rng(self.seed)
+        nlist = min(self.nlist, len(vectors))
+        sample_size = min(len(vectors), nlist * self.train_per_list)
+        sample = np.asarray(vectors[np.sort(rng.choice(len(vectors), sample_size, replace=False))])
+        centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+        for _ in range(self.iterations):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            counts = np.bincount(labels, minlength=nlist)
+            empty = counts == 0
+            # Re-seed empty lists from random sample rows instead of leaving them dead.
+            sums[empty] = sample[rng.choice(len(sample), int(empty.sum()))]
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            centroids = np.divide(sums, norms, out=np.zeros_like(sums), where=norms > 0)
+        self.nlist = nlist
+        self.nprobe = min(self.nprobe, nlist)
+        self.centroids = centroids.astype(np.float32)
+        self._assignments = array("i")
+        self.add(vectors)
+
+    def add(self, vectors: np.ndarray) -> None:
+        """Assign new rows (appended after the existing ones) to their nearest list."""
+
+        if not isinstance(self._assignments, array):
+            self._assignments = array("i", np.asarray(self._assignments).tolist())
+        for start in range(0, len(vectors), 65536):
+            block = np.asarray(vectors[start : start + 65536], dtype=np.float32)
+            labels = np.argmax(block @ self.centroids.T, axis=1).astype(np.int32)
+            self._assignments.extend(labels.tolist())
+        self._lists = None
+
+    def keep(self, rows: np.ndarray) -> None:
+        """Drop every row not listed in ``rows``, renumbering the survivors in order."""
+
+        assignments = np.asarray(self._assignments, dtype=np.int32)[rows]
+        self._assignments = array("i", assignments.tolist())
+        self._lists = None
+
+    def probe(self, query: np.ndarray, nprobe: int | None = None) -> np.ndarray:
+        """Row ids stored in the ``nprobe`` lists whose centroids best match ``query``."""
+
+        nprobe = min(nprobe or self.nprobe, self.nlist)
+        scores = self.centroids @ query
+        best = np.argpartition(-scores, nprobe - 1)[:nprobe] if nprobe < self.nlist else None
+        order, indptr = self._inverted_lists()
+        if best is None:
+            return order
+        return np.concatenate([order[indptr[lst] : indptr[lst + 1]] for lst in best])
+
+    def _inverted_lists(self) -> tuple[np.ndarray, np.ndarray]:
+        if self._lists is None:
+            assignments = np.asarray(self._assignments, dtype=np.int32)
+            order = np.argsort(assignments, kind="stable")
+            indptr = np.zeros(self.nlist + 1, dtype=np.int64)
+            np.cumsum(np.bincount(assignments, minlength=self.nlist), out=indptr[1:])
+            self._lists = (order, indptr)
+        return self._lists
+
+    def describe(self) -> dict[str, Any]:
+        return {
+            "nlist": self.nlist,
+            "nprobe": self.nprobe,
+            "iterations": self.iterations,
+            "train_per_list": self.train_per_list,
+            "seed": self.seed,
+        }
+
+    def arrays(self) -> dict[str, np.ndarray]:
+        return {
+            "centroids": self.centroids,
+            "assignments": np.asarray(self._assignments, dtype=np.int32),
+        }
+
+    @classmethod
+    def from_arrays(
+        cls, description: Mapping[str, Any], arrays: Mapping[str, np.ndarray]
+    ) -> IVFFlatIndex:
+        index = cls(**description)
+        index.centroids = arrays["centroids"]
+        index._assignments = cast(np.ndarray, arrays["assignments"])
+        return index
+
+
+__all__ = ["IVFFlatIndex"]
@@ -7,6 +7,12 @@ from typing import Any
 import requests
 
 from thesis_generator.config import load_settings
+from thesis_generator.tools.rate_limit import (
+    Priority,
+    TokenBucketScheduler,
+    retry_after_seconds,
+    shared_scheduler,
+)
 
 SCITE_TALLIES_URL = "https://api.scite.ai/tallies"
 
@@ -24,7 +30,12 @@ class CoverageError(SciteError):
 
 
 class SciteClient:
-    """Lightweight client for Scite tallies."""
+    """Lightweight client for Scite tallies.
+
+    Requests wait on ``rate_limiter`` (the process-wide scheduler by default) at
+    ``priority``. A 429 pauses the host for its ``Retry-After`` and is retried up to
+    ``max_retries`` times before falling back.
+    """
 
     def __init__(
         self,
@@ -32,15 +43,26 @@ class SciteClient:
         *,
         session: requests.Session | None = None,
         base_url: str = SCITE_TALLIES_URL,
+        rate_limiter: TokenBucketScheduler | None = None,
+        priority: Priority = "interactive",
+        max_retries: int = 0,
     ) -> None:
         self.api_key = api_key
         self.session = session or requests.Session()
         self.base_url = base_url.rstrip("/")
+        self.rate_limiter = rate_limiter or shared_scheduler()
+        self.priority = priority
+        self.max_retries = max_retries
 
     def _fetch_tallies(self, doi: str) -> dict[str, int]:
         url = f"{self.base_url}/{doi}"
         headers = {"x-api-key": self.api_key}
-        response = self.session.get(url, headers=headers, timeout=10)
+        for _ in range(self.max_retries + 1):
+            self.rate_limiter.acquire(url, priority=self.priority)
+            response = self.session.get(url, headers=headers, timeout=10)
+            if response.status_code != 429:
+                break
+            self.rate_limiter.penalize(url, retry_after_seconds(response))
 
         if response.status_code == 429:
             raise RateLimitError("Scite API rate limit reached")
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Literal
+
+import numpy as np
+
+from thesis_generator.tools.openalex import OpenAlexAPI, OpenAlexPaper
+from thesis_generator.tools.openalex_cache import work_key
+
+Direction = Literal["backward", "forward", "both"]
+GraphRanking = Literal["pagerank", "in_degree"]
+_DIRECTIONS: tuple[str, ...] = ("backward", "forward", "both")
+
+
+@dataclass(frozen=True, eq=False)
+class CitationGraph:
+    """Citation edges between discovered works, stored as CSR integer arrays.
+
+    Node ``i`` is ``work_ids[i]`` (short ``W…`` ids) with its parsed ``papers[i]``
+    and BFS ``levels[i]`` (0 for seeds). The works node ``i`` references are
+    ``indices[indptr[i]:indptr[i + 1]]``, sorted; only edges between discovered
+    works are kept.
+    """
+
+    work_ids: tuple[str, ...]
+    papers: tuple[OpenAlexPaper, ...]
+    levels: np.ndarray
+    indptr: np.ndarray
+    indices: np.ndarray
+    _positions: dict[str, int] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        positions = {work_id: node for node, work_id in enumerate(self.work_ids)}
+        object.__setattr__(self, "_positions", positions)
+
+    @classmethod
+    def from_papers(cls, papers: Sequence[OpenAlexPaper], levels: Sequence[int]) -> CitationGraph:
+        work_ids = tuple(work_key(paper.paper_id) for paper in papers)
+        position = {work_id: node for node, work_id in enumerate(work_ids)}
+        rows: list[int] = []
+        columns: list[int] = []
+        for node, paper in enumerate(papers):
+            cited = {
+                position[key] for key in map(work_key, paper.referenced_works) if key in position
+            }
+            cited.discard(node)
+            rows.extend([node] * len(cited))
+            columns.extend(sorted(cited))
+        indptr = np.zeros(len(work_ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=len(work_ids)), out=indptr[1:])
+        return cls(
+            work_ids,
+            tuple(papers),
+            np.asarray(levels, dtype=np.int32),
+            indptr,
+            np.asarray(columns, dtype=np.int32),
+        )
+
+    def __len__(self) -> int:
+        return len(self.work_ids)
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.indices)
+
+    def node(self, work_id: str) -> int:
+        try:
+            return self._positions[work_key(work_id)]
+        except KeyError:
+            raise KeyError(work_id) from None
+
+    def references(self, work_id: str) -> list[str]:
+        """Discovered works that ``work_id`` cites."""
+
+        node = self.node(work_id)
+        return [self.work_ids[i] for i in self.indices[self.indptr[node] : self.indptr[node + 1]]]
+
+    def cited_by(self, work_id: str) -> list[str]:
+        """Discovered works that cite ``work_id``."""
+
+        node = self.node(work_id)
+        return [self.work_ids[i] for i in self._sources()[self.indices == node]]
+
+    def in_degree(self) -> np.ndarray:
+        return np.bincount(self.indices, minlength=len(self))
+
+    def out_degree(self) -> np.ndarray:
+        return np.diff(self.indptr)
+
+    def pagerank(
+        self, damping: float = 0.85, *, tol: float = 1e-9, max_iter: int = 100
+    ) -> np.ndarray:
+        """PageRank over citation edges; rank mass flows from citing to cited works."""
+
+        count = len(self)
+        if not count:
+            return np.zeros(0)
+        sources = self._sources()
+        out_degree = self.out_degree()
+        dangling = out_degree == 0
+        ranks = np.full(count, 1 / count)
+        for _ in range(max_iter):
+            shares = ranks[sources] / out_degree[sources]
+            spread = damping * (
+                np.bincount(self.indices, shares, count) + ranks[dangling].sum() / count
+            )
+            updated = spread + (1 - damping) / count
+            converged = np.abs(updated - ranks).sum() < tol
+            ranks = updated
+            if converged:
+                break
+        return ranks
+
+    def rank(
+        self, k: int | None = None, *, by: GraphRanking = "pagerank"
+    ) -> list[tuple[OpenAlexPaper, float]]:
+        """Papers by descending ``pagerank`` or ``in_degree`` score (ties keep BFS order)."""
+
+        if by == "pagerank":
+            scores = self.pagerank()
+        elif by == "in_degree":
+            scores = self.in_degree().astype(np.float64)
+        else:
+            raise ValueError(f"Unknown graph ranking: {by}")
+        order = np.argsort(-scores, kind="stable")[:k]
+        return [(self.papers[node], float(scores[node])) for node in order]
+
+    def _sources(self) -> np.ndarray:
+        return np.repeat(np.arange(len(self), dtype=np.int32), self.out_degree())
+
+
+def expand_citation_graph(
+    api: OpenAlexAPI,
+    seeds: Sequence[str],
+    *,
+    depth: int = 1,
+    max_per_level: int = 100,
+    direction: Direction = "both",
+    max_workers: int = 4,
+) -> CitationGraph:
+    """Snowball a citation graph breadth-first from ``seeds`` (OpenAlex work ids).
+
+    Each level follows the frontier's ``referenced_works`` backward (fetched with
+    :meth:`OpenAlexAPI.get_papers_bulk`) and/or its citing works forward (via
+    :meth:`OpenAlexAPI.get_citing_papers`). New works are deduplicated by id and at
+    most ``max_per_level`` are kept per level, preferring those linked to the most
+    frontier works. ``max_workers`` bounds concurrent requests. Seeds OpenAlex does
+    not return are dropped.
+    """
+
+    if depth < 0 or max_per_level <= 0:
+        raise ValueError("depth must be non-negative and max_per_level positive")
+    if direction not in _DIRECTIONS:
+        raise ValueError(f"Unknown citation direction: {direction}")
+    unique: dict[str, OpenAlexPaper] = {}
+    for paper in api.get_papers_bulk(seeds, max_workers=max_workers):
+        if paper is not None:
+            unique.setdefault(work_key(paper.paper_id), paper)
+    papers = list(unique.values())
+    levels = [0] * len(papers)
+    seen = {work_key(paper.paper_id) for paper in papers}
+    frontier = papers
+
+    for level in range(1, depth + 1):
+        if not frontier:
+            break
+        frontier_ids = list(dict.fromkeys(work_key(paper.paper_id) for paper in frontier))
+        links: Counter[str] = Counter()
+        fetched: dict[str, OpenAlexPaper] = {}
+        if direction != "forward":
+            for paper in frontier:
+                links.update(
+                    key
+                    for key in dict.fromkeys(map(work_key, paper.referenced_works))
+                    if key not in seen
+                )
+        if direction != "backward":
+            targets = set(frontier_ids)
+            citing = api.get_citing_papers(
+                frontier_ids, limit=max_per_level, max_workers=max_workers
+            )
+            for paper in citing:
+                key = work_key(paper.paper_id)
+                if key not in seen:
+                    fetched[key] = paper
+                    links[key] += len(targets.intersection(map(work_key, paper.referenced_works)))
+        chosen = [key for key, _ in links.most_common(max_per_level)]
+        missing = [key for key in chosen if key not in fetched]
+        fetched.update(
+            (work_key(paper.paper_id), paper)
+            for paper in api.get_papers_bulk(missing, max_workers=max_workers)
+            if paper is not None
+        )
+        frontier = [fetched[key] for key in chosen if key in fetched]
+        seen.update(chosen)
+        papers.extend(frontier)
+        levels.extend([level] * len(frontier))
+
+    return CitationGraph.from_papers(papers, levels)
+
+
+__all__ = ["CitationGraph", "Direction", "expand_citation_graph"]
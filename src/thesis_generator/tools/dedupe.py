@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import hashlib
+from collections import defaultdict
+from collections.abc import Hashable
+from functools import lru_cache
+
+import numpy as np
+
+
+@lru_cache(maxsize=65536)
+def _shingle_hash(shingle: str) -> int:
+    return int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def _lsh_bands(num_perm: int, threshold: float) -> tuple[int, int]:
+    """Pick ``(bands, rows)`` whose S-curve midpoint ``(1/b) ** (1/r)`` is nearest ``threshold``."""
+
+    splits = [
+        (bands, num_perm // bands) for bands in range(1, num_perm + 1) if num_perm % bands == 0
+    ]
+    return min(splits, key=lambda split: abs((1 / split[0]) ** (1 / split[1]) - threshold))
+
+
+class MinHashLSH:
+    """Near-duplicate index over word shingles using MinHash signatures and LSH banding.
+
+    A signature keeps the minimum of ``num_perm`` multiply-shift hashes over a text's
+    ``shingle_size``-word shingles, so the fraction of equal positions estimates the
+    Jaccard similarity of two texts. Signatures are split into bands and bucketed per
+    band; a query only compares against items sharing a bucket, which keeps inserting a
+    whole corpus roughly linear in its size.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.8,
+        *,
+        num_perm: int = 128,
+        shingle_size: int = 3,
+        seed: int = 0,
+    ) -> None:
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold must be in (0, 1]")
+        if num_perm <= 0 or shingle_size <= 0:
+            raise ValueError("num_perm and shingle_size must be positive")
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(0, 2**64, size=(num_perm, 1), dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2**64, size=(num_perm, 1), dtype=np.uint64)
+        self.bands, self.rows = _lsh_bands(num_perm, threshold)
+        self._buckets: list[defaultdict[bytes, list[Hashable]]] = [
+            defaultdict(list) for _ in range(self.bands)
+        ]
+        self._signatures: dict[Hashable, np.ndarray] = {}
+
+    def signature(self, text: str) -> np.ndarray:
+        words = text.lower().split()
+        size = self.shingle_size
+        shingles = {" ".join(words[i : i + size]) for i in range(max(1, len(words) - size + 1))}
+        hashes = np.fromiter(map(_shingle_hash, shingles), dtype=np.uint64, count=len(shingles))
+        # Multiply-shift hashing: uint64 arithmetic wraps, the high 32 bits are the hash.
+        mixed = (self._a * hashes + self._b) >> np.uint64(32)
+        return mixed.min(axis=1).astype(np.uint32)
+
+    def query(self, signature: np.ndarray) -> list[tuple[Hashable, float]]:
+        """Items whose estimated similarity reaches ``threshold``, most similar first."""
+
+        similarities: dict[Hashable, float] = {}
+        for band, buckets in enumerate(self._buckets):
+            key = signature[band * self.rows : (band + 1) * self.rows].tobytes()
+            for item in buckets.get(key, ()):
+                if item not in similarities:
+                    similarities[item] = float(np.mean(self._signatures[item] == signature))
+        matches = [(item, score) for item, score in similarities.items() if score >= self.threshold]
+        return sorted(matches, key=lambda match: -match[1])
+
+    def insert(self, item: Hashable, signature: np.ndarray) -> None:
+        self._signatures[item] = signature
+        for band, buckets in enumerate(self._buckets):
+            buckets[signature[band * self.rows : (band + 1) * self.rows].tobytes()].append(item)
+
+    def __contains__(self, item: object) -> bool:
+        return item in self._signatures
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+
+__all__ = ["MinHashLSH"]
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Sequence
+from functools import lru_cache
+from typing import Protocol
+
+import numpy as np
+
+
+class Embedder(Protocol):
+    """Maps a batch of texts to an ``(n, dim)`` float32 matrix of unit vectors."""
+
+    dim: int
+
+    def __call__(self, texts: Sequence[str]) -> np.ndarray: ...
+
+
+@lru_cache(maxsize=65536)
+def _token_hash(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class HashingEmbedder:
+    """Deterministic, offline bag-of-words embedder using the signed hashing trick.
+
+    Every token is hashed into one of ``dim`` buckets with a pseudo-random sign, so
+    texts sharing vocabulary have a positive cosine similarity without any model or
+    network access. Vectors are L2-normalized so dot products are cosine scores.
+    """
+
+    def __init__(self, dim: int = 256) -> None:
+        if dim <= 0:
+            raise ValueError("dim must be positive")
+        self.dim = dim
+
+    def __call__(self, texts: Sequence[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token in text.lower().split():
+                hashed = _token_hash(token)
+                sign = 1.0 if hashed & 1 else -1.0
+                matrix[row, (hashed >> 1) % self.dim] += sign
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
+    def __repr__(self) -> str:
+        return f"HashingEmbedder(dim={self.dim})"
+
+
+__all__ = ["Embedder", "HashingEmbedder"]
@@ -1,9 +1,51 @@
 from __future__ import annotations
 
+import hashlib
+import heapq
+import json
+import math
+import mmap
+import os
+import re
+import shutil
+import time
 import uuid
-from collections.abc import Iterable, Mapping, Sequence
-from dataclasses import dataclass, field
-from typing import Any
+from array import array
+from collections import Counter, OrderedDict, deque
+from collections.abc import (
+    Callable,
+    Hashable,
+    Iterable,
+    Iterator,
+    Mapping,
+    MutableMapping,
+    MutableSequence,
+    Sequence,
+)
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from functools import cache, cached_property, partial
+from itertools import islice
+from pathlib import Path
+from typing import Any, Literal, Protocol, TypeGuard, TypeVar, cast
+
+import numpy as np
+
+from thesis_generator.tools.ann import IVFFlatIndex
+from thesis_generator.tools.dedupe import MinHashLSH
+from thesis_generator.tools.embeddings import Embedder, HashingEmbedder
+from thesis_generator.tools.passages import ShingleIndex
+from thesis_generator.tools.rerank import RerankStage
+
+ScoringMode = Literal["overlap", "bm25", "dense", "hybrid"]
+ParentCombiner = Literal["max", "sum"]
+FusionMode = Literal["rrf", "weighted"]
+_SCORING_MODES: tuple[str, ...] = ("overlap", "bm25", "dense", "hybrid")
+_FUSION_MODES: tuple[str, ...] = ("rrf", "weighted")
+_RRF_K = 60
+_Key = TypeVar("_Key", bound=Hashable)
+# A child folded into a near-duplicate: span, chunk index, text and metadata overrides.
+_CollapsedChild = tuple[int, int, int, str | None, dict[str, Any] | None]
 
 
 @dataclass
@@ -32,50 +74,1672 @@ class SourceSection:
 @dataclass
 class SourceDocument:
     title: str
+    id: str | None = None
     year: int | None = None
     citations: int | None = None
     authors: list[str] = field(default_factory=list)
     sections: list[SourceSection] = field(default_factory=list)
 
 
+@dataclass
+class _PreparedSection:
+    """A section split into child spans with per-child term statistics."""
+
+    heading: str
+    content: str
+    spans: list[tuple[int, int]]
+    term_counts: list[tuple[int, Counter[str]]]
+
+
+@dataclass
+class ChildSpan:
+    """A matching child inside a parent: character span, chunk index and score.
+
+    The span is empty for children added with text that is not part of the parent.
+    """
+
+    start: int
+    end: int
+    chunk_index: int
+    score: float
+
+
+@dataclass
+class ParentSearchResult:
+    """A parent section ranked by the combined scores of its matching children."""
+
+    parent: Chunk
+    score: float
+    children: list[ChildSpan]
+
+
+@dataclass
+class PassageMatch:
+    """A region of a source parent that covers a verified passage."""
+
+    parent: Chunk
+    children: list[Chunk]
+    start: int
+    end: int
+    overlap: float
+
+    @property
+    def text(self) -> str:
+        return self.parent.page_content[self.start : self.end]
+
+
+@dataclass(frozen=True)
+class CorpusStats:
+    """BM25 corpus statistics: live children, their total length and per-term df."""
+
+    documents: int
+    total_length: int
+    doc_freqs: dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def combine(cls, parts: Iterable[CorpusStats]) -> CorpusStats:
+        documents = total_length = 0
+        doc_freqs: Counter[str] = Counter()
+        for part in parts:
+            documents += part.documents
+            total_length += part.total_length
+            doc_freqs.update(part.doc_freqs)
+        return cls(documents, total_length, dict(doc_freqs))
+
+
+@dataclass(frozen=True)
+class AnnRecallReport:
+    """Recall of the ANN index against exact dense search, with mean query latency."""
+
+    k: int
+    nprobe: int
+    queries: int
+    recall: float
+    exact_ms: float
+    ann_ms: float
+
+
+@dataclass(frozen=True)
+class SearchCacheInfo:
+    """Counters for a store's search result cache."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class _ResultCache:
+    """LRU of ranked ``(child_id, score)`` lists tagged with the store version.
+
+    Entries are dropped wholesale as soon as a lookup or insert arrives with a newer
+    store version, so mutations never serve stale rankings.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._version = 0
+        self._entries: OrderedDict[Hashable, list[tuple[int, float]]] = OrderedDict()
+
+    def get(self, version: int, key: Hashable) -> list[tuple[int, float]] | None:
+        self._sync(version)
+        ranked = self._entries.get(key)
+        if ranked is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return ranked
+
+    def put(self, version: int, key: Hashable, ranked: list[tuple[int, float]]) -> None:
+        if self.maxsize <= 0:
+            return
+        self._sync(version)
+        self._entries[key] = ranked
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def info(self) -> SearchCacheInfo:
+        return SearchCacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+    def _sync(self, version: int) -> None:
+        if version != self._version:
+            self._entries.clear()
+            self._version = version
+
+
+_STORE_FORMAT_VERSION = 3
+_INGEST_BATCH_SIZE = 16
+_WORD = re.compile(r"\S+")
+_INHERITED_METADATA: tuple[str, ...] = ("section_heading", "title", "year", "citations", "authors")
+_NUMERIC_COLUMNS: tuple[str, ...] = ("year", "citations")
+_CATEGORICAL_COLUMNS: tuple[str, ...] = ("title", "section_heading")
+_FILTER_OPS: dict[str, Any] = {
+    "gte": np.greater_equal,
+    "lte": np.less_equal,
+    "gt": np.greater,
+    "lt": np.less,
+    "eq": np.equal,
+}
+
+
+class _Postings:
+    """Child ids and term frequencies for a single term, in insertion order."""
+
+    __slots__ = ("child_ids", "term_freqs")
+
+    def __init__(
+        self,
+        child_ids: MutableSequence[int] | None = None,
+        term_freqs: MutableSequence[int] | None = None,
+    ) -> None:
+        self.child_ids = child_ids if child_ids is not None else array("I")
+        self.term_freqs = term_freqs if term_freqs is not None else array("I")
+
+
+class _StoreFiles:
+    """Memory-mapped view over a persisted store directory.
+
+    Arrays are opened with ``mmap_mode="r"`` so several processes share the page
+    cache instead of each holding a private copy. JSON side files are parsed when the
+    view is created: ``save`` replaces files by rename, so a view that read them later
+    could pair a newer generation's metadata with the arrays it already mapped.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self.manifest: dict[str, Any] = json.loads(self.text("manifest"))
+        self.parent_metadata: list[dict[str, Any]] = json.loads(self.text("parents"))
+        self.parent_rows = {
+            metadata["id"]: row for row, metadata in enumerate(self.parent_metadata)
+        }
+        terms = json.loads(self.text("vocabulary"))
+        self.vocabulary: dict[str, int] = {term: row for row, term in enumerate(terms)}
+        self.column_values: dict[str, list[Any]] = json.loads(self.text("column_values"))
+        self.child_overrides: dict[str, Any] = json.loads(self.text("child_overrides"))
+
+    def text(self, name: str) -> str:
+        return (self.directory / f"{name}.json").read_text()
+
+    def array(self, name: str) -> np.ndarray:
+        return np.load(self.directory / f"{name}.npy", mmap_mode="r")
+
+    def blob(self, name: str) -> bytes | mmap.mmap:
+        path = self.directory / f"{name}.bin"
+        if path.stat().st_size == 0:
+            return b""
+        with path.open("rb") as handle:
+            return mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class _MappedParentRows(Sequence[Chunk]):
+    """Parent chunks by row, decoded from the persisted text blob on access."""
+
+    def __init__(self, files: _StoreFiles) -> None:
+        self._files = files
+        self._texts = files.blob("parent_texts")
+        self._offsets = files.array("parent_offsets")
+
+    def __getitem__(self, row: int) -> Chunk:  # type: ignore[override]
+        if not 0 <= row < len(self):
+            raise IndexError(row)
+        text = bytes(self._texts[self._offsets[row] : self._offsets[row + 1]]).decode("utf-8")
+        return Chunk(page_content=text, metadata=dict(self._files.parent_metadata[row]))
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+
+class _MappedParents(Mapping[str, Chunk]):
+    """Parent chunks by id over :class:`_MappedParentRows`."""
+
+    def __init__(self, files: _StoreFiles, rows: _MappedParentRows) -> None:
+        self._files = files
+        self._rows = rows
+
+    def __getitem__(self, parent_id: str) -> Chunk:
+        return self._rows[self._files.parent_rows[parent_id]]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._files.parent_rows)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+
+class _ChildView(Sequence[Chunk]):
+    """Sequence facade that materializes child chunks from the store's records."""
+
+    def __init__(self, store: ParentChildVectorStore) -> None:
+        self._store = store
+
+    def __getitem__(self, child_id: int) -> Chunk:  # type: ignore[override]
+        if child_id < 0:
+            child_id += len(self)
+        if not 0 <= child_id < len(self):
+            raise IndexError(child_id)
+        return self._store._child_chunk(child_id)
+
+    def __len__(self) -> int:
+        return len(self._store._child_parent)
+
+
+class _MappedPostings(Mapping[str, _Postings]):
+    """Read-only term postings over CSR arrays (``indptr``/ids/frequencies)."""
+
+    def __init__(self, files: _StoreFiles) -> None:
+        self._files = files
+        self._indptr = files.array("postings_indptr")
+        self._child_ids = files.array("postings_child_ids")
+        self._term_freqs = files.array("postings_term_freqs")
+
+    def __getitem__(self, term: str) -> _Postings:
+        row = self._files.vocabulary[term]
+        start, end = int(self._indptr[row]), int(self._indptr[row + 1])
+        return _Postings(self._child_ids[start:end].tolist(), self._term_freqs[start:end].tolist())
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._files.vocabulary)
+
+    def __len__(self) -> int:
+        return len(self._indptr) - 1
+
+
+class _MetadataColumns:
+    """Typed per-child metadata columns that turn filters into vectorized masks.
+
+    Year and citation counts are float64 with NaN for missing values; titles and
+    section headings are interned to int32 codes. Conditions a column cannot express
+    (other keys, non-numeric operands, irregular values) are returned as residual
+    filters for the per-chunk ``_passes_filters`` check.
+    """
+
+    def __init__(self) -> None:
+        self.numeric: dict[str, MutableSequence[float] | np.ndarray] = {
+            key: array("d") for key in _NUMERIC_COLUMNS
+        }
+        self.codes: dict[str, MutableSequence[int] | np.ndarray] = {
+            key: array("i") for key in _CATEGORICAL_COLUMNS
+        }
+        self.values: dict[str, list[Any]] = {key: [] for key in _CATEGORICAL_COLUMNS}
+        self.irregular: set[str] = set()
+
+    @cached_property
+    def lookup(self) -> dict[str, dict[Any, int]]:
+        return {
+            key: {value: code for code, value in enumerate(values)}
+            for key, values in self.values.items()
+        }
+
+    def append(self, metadata: Mapping[str, Any]) -> None:
+        for key in _NUMERIC_COLUMNS:
+            value = metadata.get(key)
+            number = math.nan
+            if _is_number(value):
+                number = float(value)
+            elif value is not None:
+                self.irregular.add(key)
+            cast(array, self.numeric[key]).append(number)
+        for key in _CATEGORICAL_COLUMNS:
+            value = metadata.get(key)
+            try:
+                code = self.lookup[key].get(value)
+            except TypeError:
+                self.irregular.add(key)
+                code = -1
+            if code is None:
+                code = self.lookup[key][value] = len(self.values[key])
+                self.values[key].append(value)
+            cast(array, self.codes[key]).append(code)
+
+    @property
+    def nbytes(self) -> int:
+        columns = [*self.numeric.values(), *self.codes.values()]
+        return sum(_heap_nbytes(column) for column in columns)
+
+    def mask(self, filters: Mapping[str, Any]) -> tuple[np.ndarray | None, dict[str, Any]]:
+        mask: np.ndarray | None = None
+        residual: dict[str, Any] = {}
+        for key, condition in filters.items():
+            key_mask = None if key in self.irregular else self._key_mask(key, condition)
+            if key_mask is None:
+                residual[key] = condition
+            else:
+                mask = key_mask if mask is None else mask & key_mask
+        return mask, residual
+
+    def _key_mask(self, key: str, condition: Any) -> np.ndarray | None:
+        if key in self.numeric:
+            column = _as_array(self.numeric[key], np.float64)
+            present = ~np.isnan(column)
+            if not isinstance(condition, Mapping):
+                if condition is None:
+                    return ~present
+                return column == condition if _is_number(condition) else None
+            result = present if condition else np.ones(len(column), dtype=bool)
+            for op, expected in condition.items():
+                if op not in _FILTER_OPS:
+                    continue
+                if not _is_number(expected):
+                    return None
+                result = result & _FILTER_OPS[op](column, expected)
+            return result
+
+        if key in self.codes:
+            codes = _as_array(self.codes[key], np.int32)
+            if not isinstance(condition, Mapping):
+                return self._code_mask(key, codes, condition)
+            if set(condition) - {"eq"}:
+                return None
+            result = np.ones(len(codes), dtype=bool)
+            for expected in condition.values():
+                # A missing value never satisfies an operator condition.
+                if expected is None:
+                    return np.zeros(len(codes), dtype=bool)
+                code_mask = self._code_mask(key, codes, expected)
+                if code_mask is None:
+                    return None
+                result &= code_mask
+            return result
+        return None
+
+    def _code_mask(self, key: str, codes: np.ndarray, expected: Any) -> np.ndarray | None:
+        try:
+            code = self.lookup[key].get(expected)
+        except TypeError:
+            return None
+        if code is None:
+            return np.zeros(len(codes), dtype=bool)
+        return codes == code
+
+    def save(self, directory: Path) -> dict[str, Any]:
+        for key, numeric in self.numeric.items():
+            _save_array(directory / f"column_{key}.npy", np.asarray(numeric, dtype=np.float64))
+        for key, codes in self.codes.items():
+            _save_array(directory / f"column_{key}.npy", np.asarray(codes, dtype=np.int32))
+        _write_file(directory / "column_values.json", json.dumps(self.values, ensure_ascii=False))
+        return {"irregular_columns": sorted(self.irregular)}
+
+    @classmethod
+    def load(cls, files: _StoreFiles) -> _MetadataColumns:
+        columns = cls()
+        for key in _NUMERIC_COLUMNS:
+            columns.numeric[key] = files.array(f"column_{key}")
+        for key in _CATEGORICAL_COLUMNS:
+            columns.codes[key] = files.array(f"column_{key}")
+        columns.values = files.column_values
+        columns.irregular = set(files.manifest.get("irregular_columns", []))
+        return columns
+
+    def thaw(self) -> None:
+        for key, numeric in self.numeric.items():
+            self.numeric[key] = array("d", np.asarray(numeric, dtype=np.float64).tolist())
+        for key, codes in self.codes.items():
+            self.codes[key] = array("i", np.asarray(codes, dtype=np.int32).tolist())
+
+
 class ParentChildVectorStore:
-    """In-memory vector-like store that tracks parent/child chunks."""
+    """In-memory vector-like store that tracks parent/child chunks.
+
+    Child chunks are indexed into term postings as they are added, so a query only
+    touches the children that share at least one term with it. Corpus statistics for
+    BM25 (document frequencies, chunk lengths, total length) are maintained at the same
+    time. ``scoring`` selects the default ranking; ``search`` can override it per query.
+
+    When an ``embedder`` is configured (or ``scoring="dense"``/``"hybrid"``, which
+    default to a :class:`HashingEmbedder`), child embeddings are kept in one contiguous
+    float32 matrix and dense queries are a single matrix-vector product.
+
+    ``"hybrid"`` scoring runs BM25 and dense retrieval concurrently over the same
+    filtered candidates and fuses their top ``hybrid_depth`` hits with ``fusion``:
+    reciprocal rank fusion ("rrf") or min-max normalized scores mixed with
+    ``fusion_weight`` on the dense side ("weighted").
+
+    Year, citations, title and section heading are also kept as typed columns, so
+    metadata filters become vectorized masks intersected with the candidates before
+    they are scored.
+
+    Children are compact records (parent row, character span in the parent text,
+    chunk index) rather than objects: their text and inherited metadata live on the
+    parent once, and ``Chunk`` objects are only materialized for returned hits or when
+    ``children`` is indexed. Chunks whose text or metadata cannot be derived from the
+    parent keep a small override entry.
 
-    def __init__(self, uri: str) -> None:
+    ``save`` writes the store to a directory and ``open`` maps it back read-only;
+    adding sections to an opened store first copies it into memory.
+    """
+
+    def __init__(
+        self,
+        uri: str,
+        *,
+        scoring: ScoringMode = "overlap",
+        bm25_k1: float = 1.2,
+        bm25_b: float = 0.75,
+        embedder: Embedder | None = None,
+        chunk_size: int = 400,
+        chunk_overlap: int = 40,
+        cache_size: int = 128,
+        dedupe_threshold: float | None = None,
+        fusion: FusionMode = "rrf",
+        fusion_weight: float = 0.5,
+    ) -> None:
         self.uri = uri
-        self.parents: dict[str, Chunk] = {}
-        self.children: list[Chunk] = []
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.scoring = _validate_scoring(scoring)
+        self.bm25_k1 = bm25_k1
+        self.bm25_b = bm25_b
+        self.fusion = _validate_fusion(fusion, fusion_weight)
+        self.fusion_weight = fusion_weight
+        self.hybrid_depth = 50
+        if embedder is None and self.scoring in ("dense", "hybrid"):
+            embedder = HashingEmbedder()
+        self.embedder = embedder
+        self.parents: Mapping[str, Chunk] = {}
+        self._parent_rows: Sequence[Chunk] = []
+        self._child_parent: MutableSequence[int] | np.ndarray = array("I")
+        self._child_start: MutableSequence[int] | np.ndarray = array("I")
+        self._child_end: MutableSequence[int] | np.ndarray = array("I")
+        self._child_index: MutableSequence[int] | np.ndarray = array("I")
+        self._text_overrides: dict[int, str] = {}
+        self._metadata_overrides: dict[int, dict[str, Any]] = {}
+        self._collapsed: dict[str, list[_CollapsedChild]] = {}
+        self._postings: Mapping[str, _Postings] = {}
+        self._lengths: MutableSequence[int] | np.ndarray = array("I")
+        self._total_length = 0
+        self._embeddings = np.empty((0, embedder.dim if embedder else 0), dtype=np.float32)
+        self._columns = _MetadataColumns()
+        self._parent_spans: dict[str, tuple[int, int]] = {}
+        self._deleted = bytearray()
+        self._deleted_count = 0
+        self._removed_doc_freq: Counter[str] = Counter()
+        self._files: _StoreFiles | None = None
+        self.version = 0
+        self._cache = _ResultCache(cache_size)
+        self.dedupe_threshold = dedupe_threshold
+        self._dedupe: MinHashLSH | None = None
+        self.ann: IVFFlatIndex | None = None
+        self.passage_shingle_size = 5
+        self._passages: ShingleIndex | None = None
+        self._snapshot: tuple[Path, int, str] | None = None
+
+    @property
+    def children(self) -> Sequence[Chunk]:
+        """All child chunks in insertion order, materialized lazily on access."""
+
+        return _ChildView(self)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate heap bytes held by the store; memory-mapped files count as zero."""
+
+        arrays = (
+            self._child_parent,
+            self._child_start,
+            self._child_end,
+            self._child_index,
+            self._lengths,
+            self._embeddings,
+        )
+        total = sum(_heap_nbytes(column) for column in arrays) + len(self._deleted)
+        total += self._columns.nbytes
+        if isinstance(self._parent_rows, list):
+            total += sum(len(parent.page_content) for parent in self._parent_rows)
+        if isinstance(self._postings, dict):
+            total += sum(
+                len(term) + _heap_nbytes(entry.child_ids) + _heap_nbytes(entry.term_freqs)
+                for term, entry in self._postings.items()
+            )
+        total += sum(len(text) for text in self._text_overrides.values())
+        return total
 
     def add_section(self, parent: Chunk, children: Sequence[Chunk]) -> None:
-        self.parents[parent.metadata["id"]] = parent
-        self.children.extend(children)
+        """Add a parent and its child chunks.
+
+        Child text that occurs in the parent text is stored as a span into it; other
+        text and metadata that differs from the parent's are kept as overrides.
+        """
+
+        text = parent.page_content
+        spans: list[tuple[int, int]] = []
+        text_overrides: dict[int, str] = {}
+        metadata_overrides: dict[int, dict[str, Any]] = {}
+        cursor = 0
+        for position, child in enumerate(children):
+            start = text.find(child.page_content, cursor)
+            if start < 0:
+                text_overrides[position] = child.page_content
+                spans.append((0, 0))
+            else:
+                spans.append((start, start + len(child.page_content)))
+                cursor = start
+            inherited = _inherited_metadata(parent.metadata, position)
+            extra = {
+                key: value
+                for key, value in child.metadata.items()
+                if key not in inherited or inherited[key] != value
+            }
+            if extra:
+                metadata_overrides[position] = extra
+        self._add_section_spans(parent, spans, text_overrides, metadata_overrides)
+
+    def _add_section_spans(
+        self,
+        parent: Chunk,
+        spans: Sequence[tuple[int, int]],
+        text_overrides: Mapping[int, str] | None = None,
+        metadata_overrides: Mapping[int, dict[str, Any]] | None = None,
+        term_counts: Sequence[tuple[int, Counter[str]]] | None = None,
+        chunk_indexes: Sequence[int] | None = None,
+    ) -> int:
+        """Append a parent and its child spans; returns the number of children indexed."""
+
+        self._thaw()
+        self.version += 1
+        parent_id = parent.metadata["id"]
+        if parent_id in self.parents:
+            self.remove_parent(parent_id)
+        cast(dict[str, Chunk], self.parents)[parent_id] = parent
+        parent_row = len(self._parent_rows)
+        cast(list[Chunk], self._parent_rows).append(parent)
+
+        first_child = len(self._child_parent)
+        texts: list[str] = []
+        kept_counts: list[tuple[int, Counter[str]]] = []
+        for position, (start, end) in enumerate(spans):
+            override = text_overrides.get(position) if text_overrides else None
+            text = parent.page_content[start:end] if override is None else override
+            extra = metadata_overrides.get(position) if metadata_overrides else None
+            chunk_index = chunk_indexes[position] if chunk_indexes else position
+            child_id = first_child + len(texts)
+            if self._collapse_duplicate(parent_id, text, child_id):
+                # Kept so the child can be re-indexed if its canonical copy is removed.
+                record = (start, end, chunk_index, override, extra)
+                self._collapsed.setdefault(parent_id, []).append(record)
+                continue
+            texts.append(text)
+            if term_counts is not None:
+                kept_counts.append(term_counts[position])
+            if override is not None:
+                self._text_overrides[child_id] = override
+            if extra:
+                self._metadata_overrides[child_id] = extra
+            for column, value in (
+                (self._child_parent, parent_row),
+                (self._child_start, start),
+                (self._child_end, end),
+                (self._child_index, chunk_index),
+            ):
+                cast(array, column).append(value)
+        end_child = len(self._child_parent)
+
+        if self.embedder is not None and texts:
+            vectors = self.embedder(texts)
+            self._append_embeddings(first_child, vectors)
+            if self.ann is not None:
+                self.ann.add(vectors)
+        if term_counts is None:
+            kept_counts = [_term_counts(text) for text in texts]
+        for child_id, (length, counts) in zip(range(first_child, end_child), kept_counts):
+            self._index_child(child_id, length, counts)
+            self._columns.append(self._child_metadata(child_id))
+        self._deleted.extend(bytes(end_child - first_child))
+        self._parent_spans[parent_id] = (first_child, end_child)
+        return end_child - first_child
+
+    def _collapse_duplicate(self, parent_id: str, text: str, child_id: int) -> bool:
+        """Fold ``text`` into a live near-duplicate child, recording ``parent_id`` on it.
+
+        Returns False (and registers the text under ``child_id``) when deduplication is
+        off or no live child is similar enough.
+        """
+
+        if self.dedupe_threshold is None:
+            return False
+        if self._dedupe is None:
+            self._dedupe = MinHashLSH(self.dedupe_threshold)
+            for existing in range(len(self._child_parent)):
+                if not self._deleted[existing]:
+                    existing_text = self._child_text(existing)
+                    self._dedupe.insert(existing, self._dedupe.signature(existing_text))
+        signature = self._dedupe.signature(text)
+        for match, _ in self._dedupe.query(signature):
+            canonical = cast(int, match)
+            # Children of the section being added are not in ``_deleted`` yet.
+            if canonical < len(self._deleted) and self._deleted[canonical]:
+                continue
+            owner = self._parent_rows[int(self._child_parent[canonical])].metadata["id"]
+            if owner != parent_id:
+                extra = self._metadata_overrides.setdefault(canonical, {})
+                sources = extra.setdefault("duplicate_parent_ids", [])
+                if parent_id not in sources:
+                    sources.append(parent_id)
+            return True
+        self._dedupe.insert(child_id, signature)
+        return False
+
+    def _child_text(self, child_id: int) -> str:
+        override = self._text_overrides.get(child_id)
+        if override is not None:
+            return override
+        parent = self._parent_rows[int(self._child_parent[child_id])]
+        start, end = int(self._child_start[child_id]), int(self._child_end[child_id])
+        return parent.page_content[start:end]
+
+    def _child_metadata(self, child_id: int, parent: Chunk | None = None) -> dict[str, Any]:
+        parent = parent or self._parent_rows[int(self._child_parent[child_id])]
+        metadata = _inherited_metadata(parent.metadata, int(self._child_index[child_id]))
+        metadata.update(self._metadata_overrides.get(child_id, {}))
+        if "duplicate_parent_ids" in metadata:
+            # Provenance outlives removed duplicates only until they leave ``parents``.
+            metadata["duplicate_parent_ids"] = [
+                duplicate
+                for duplicate in metadata["duplicate_parent_ids"]
+                if duplicate in self.parents
+            ]
+        return metadata
+
+    def _child_chunk(self, child_id: int, parent: Chunk | None = None) -> Chunk:
+        parent = parent or self._parent_rows[int(self._child_parent[child_id])]
+        return Chunk(
+            page_content=self._child_text(child_id),
+            metadata=self._child_metadata(child_id, parent),
+        )
+
+    def parents_for_document(self, document: str) -> list[str]:
+        """Return parent ids whose document id or title equals ``document``."""
+
+        return [
+            parent_id
+            for parent_id, parent in self.parents.items()
+            if document in (parent.metadata.get("document_id"), parent.metadata.get("title"))
+        ]
+
+    def remove_parent(self, parent_id: str) -> int:
+        """Tombstone a parent and its children; returns the number of children removed.
+
+        Postings keep stale entries that queries mask out, while BM25 statistics are
+        corrected immediately. Surviving parents whose near-duplicate children were
+        collapsed onto the removed ones are re-indexed, so the first of them becomes
+        the new canonical copy. The store compacts itself once half of its children
+        are tombstones.
+        """
+
+        self._thaw()
+        self.version += 1
+        start, end = self._parent_spans.pop(parent_id)
+        self._collapsed.pop(parent_id, None)
+        orphaned: dict[str, None] = {}
+        for child_id in range(start, end):
+            terms = _tokenize(self._child_text(child_id))
+            self._total_length -= len(terms)
+            self._removed_doc_freq.update(set(terms))
+            self._deleted[child_id] = 1
+            extra = self._metadata_overrides.get(child_id, {})
+            orphaned.update(dict.fromkeys(extra.get("duplicate_parent_ids", ())))
+        cast(dict[str, Chunk], self.parents).pop(parent_id)
+        self._deleted_count += end - start
+        for duplicate in orphaned:
+            if duplicate in self.parents:
+                self._reindex_parent(duplicate)
+        if self._deleted_count * 2 > len(self._child_parent):
+            self.compact()
+        return end - start
+
+    def _reindex_parent(self, parent_id: str) -> None:
+        """Re-add a parent with all of its children, including collapsed duplicates."""
+
+        start, end = self._parent_spans[parent_id]
+        records: list[_CollapsedChild] = [
+            (
+                int(self._child_start[child_id]),
+                int(self._child_end[child_id]),
+                int(self._child_index[child_id]),
+                self._text_overrides.get(child_id),
+                self._metadata_overrides.get(child_id),
+            )
+            for child_id in range(start, end)
+        ]
+        records += self._collapsed.get(parent_id, [])
+        records.sort(key=lambda record: record[2])
+        # Provenance is rebuilt: re-adding this parent re-indexes its own duplicates.
+        extras = [
+            {key: value for key, value in (extra or {}).items() if key != "duplicate_parent_ids"}
+            for *_, extra in records
+        ]
+        self._add_section_spans(
+            self.parents[parent_id],
+            [(record[0], record[1]) for record in records],
+            {pos: record[3] for pos, record in enumerate(records) if record[3] is not None},
+            {pos: extra for pos, extra in enumerate(extras) if extra},
+            chunk_indexes=[record[2] for record in records],
+        )
+
+    def compact(self) -> None:
+        """Drop removed parents and children and rebuild the indexes over the rest."""
+
+        if not self._deleted_count and len(self._parent_rows) == len(self.parents):
+            return
+        self._thaw()
+        sections = [
+            (
+                parent,
+                [
+                    (
+                        (int(self._child_start[child_id]), int(self._child_end[child_id])),
+                        self._text_overrides.get(child_id),
+                        self._metadata_overrides.get(child_id),
+                        int(self._child_index[child_id]),
+                    )
+                    for child_id in range(*self._parent_spans[parent.metadata["id"]])
+                ],
+            )
+            for parent in self._parent_rows
+            if self.parents.get(parent.metadata["id"]) is parent
+        ]
+        live = [child_id for child_id, deleted in enumerate(self._deleted) if not deleted]
+        embeddings = self._embeddings[live] if self.embedder is not None else None
+        embedder = self.embedder
+
+        self.parents = {}
+        self._parent_rows = []
+        for column in ("_child_parent", "_child_start", "_child_end", "_child_index"):
+            setattr(self, column, array("I"))
+        self._text_overrides = {}
+        self._metadata_overrides = {}
+        self._postings = {}
+        self._lengths = array("I")
+        self._total_length = 0
+        self._columns = _MetadataColumns()
+        self._parent_spans = {}
+        self._deleted = bytearray()
+        self._deleted_count = 0
+        self._removed_doc_freq = Counter()
+        self._passages = None
+        # Re-adding sections reuses the surviving embedding rows instead of re-embedding,
+        # and survivors are already deduplicated, so the MinHash index is rebuilt lazily.
+        self.embedder = None
+        dedupe_threshold, self.dedupe_threshold, self._dedupe = self.dedupe_threshold, None, None
+        for parent, records in sections:
+            self._add_section_spans(
+                parent,
+                [span for span, _, _, _ in records],
+                {pos: text for pos, (_, text, _, _) in enumerate(records) if text is not None},
+                {pos: extra for pos, (_, _, extra, _) in enumerate(records) if extra},
+                chunk_indexes=[index for _, _, _, index in records],
+            )
+        self.embedder = embedder
+        self.dedupe_threshold = dedupe_threshold
+        if embeddings is not None:
+            self._embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+        if self.ann is not None:
+            self.ann.keep(np.asarray(live, dtype=np.intp))
+
+    def _append_embeddings(self, start: int, vectors: np.ndarray) -> None:
+        needed = start + len(vectors)
+        if needed > len(self._embeddings):
+            # Grow geometrically so the matrix stays contiguous with amortized copies.
+            grown = np.empty(
+                (max(needed, 2 * len(self._embeddings), 64), vectors.shape[1]), dtype=np.float32
+            )
+            grown[:start] = self._embeddings[:start]
+            self._embeddings = grown
+        self._embeddings[start:needed] = vectors
+
+    def _index_child(self, child_id: int, length: int, counts: Counter[str]) -> None:
+        cast(array, self._lengths).append(length)
+        self._total_length += length
+        postings_by_term = cast(dict[str, _Postings], self._postings)
+        for term, count in counts.items():
+            postings = postings_by_term.get(term)
+            if postings is None:
+                postings = postings_by_term[term] = _Postings()
+            postings.child_ids.append(child_id)
+            postings.term_freqs.append(count)
+
+    def save(self, directory: str | Path) -> None:
+        """Persist parents, child records, metadata columns and indexes under ``directory``.
+
+        Pending removals are compacted first. Every file is replaced atomically and
+        ``manifest.json`` is written last, so a directory without it is incomplete.
+        """
+
+        self.compact()
+        path = Path(directory)
+        path.mkdir(parents=True, exist_ok=True)
+        parents = list(self._parent_rows)
+        count = len(self._child_parent)
+
+        _write_texts(path, "parent", [parent.page_content for parent in parents])
+        _write_file(
+            path / "parents.json",
+            json.dumps([parent.metadata for parent in parents], ensure_ascii=False),
+        )
+        for name, column in (
+            ("child_parents", self._child_parent),
+            ("child_starts", self._child_start),
+            ("child_ends", self._child_end),
+            ("child_chunk_indexes", self._child_index),
+            ("lengths", self._lengths),
+        ):
+            _save_array(path / f"{name}.npy", _as_array(column, np.uint32))
+        _write_file(
+            path / "child_overrides.json",
+            json.dumps(
+                {
+                    "texts": self._text_overrides,
+                    "metadata": self._metadata_overrides,
+                    "collapsed": self._collapsed,
+                },
+                ensure_ascii=False,
+            ),
+        )
+
+        terms = sorted(self._postings)
+        postings = [self._postings[term] for term in terms]
+        indptr = np.zeros(len(terms) + 1, dtype=np.int64)
+        np.cumsum([len(entry.child_ids) for entry in postings], out=indptr[1:])
+        _write_file(path / "vocabulary.json", json.dumps(terms, ensure_ascii=False))
+        _save_array(path / "postings_indptr.npy", indptr)
+        for name in ("child_ids", "term_freqs"):
+            _save_array(
+                path / f"postings_{name}.npy",
+                np.concatenate(
+                    [np.asarray(getattr(entry, name), dtype=np.uint32) for entry in postings]
+                    or [np.empty(0, np.uint32)]
+                ),
+            )
+        if self.embedder is not None:
+            _save_array(path / "embeddings.npy", self._embeddings[:count])
+        if self.ann is not None:
+            for name, values in self.ann.arrays().items():
+                _save_array(path / f"ann_{name}.npy", values)
+        column_manifest = self._columns.save(path)
+
+        manifest = {
+            "format_version": _STORE_FORMAT_VERSION,
+            "scoring": self.scoring,
+            "bm25_k1": self.bm25_k1,
+            "bm25_b": self.bm25_b,
+            "chunk_size": self.chunk_size,
+            "chunk_overlap": self.chunk_overlap,
+            "dedupe_threshold": self.dedupe_threshold,
+            "fusion": self.fusion,
+            "fusion_weight": self.fusion_weight,
+            "ann": self.ann.describe() if self.ann is not None else None,
+            "total_length": self._total_length,
+            "embedder": _describe_embedder(self.embedder),
+            **column_manifest,
+        }
+        _write_file(path / "manifest.json", json.dumps(manifest))
+
+    @classmethod
+    def open(
+        cls, directory: str | Path, *, uri: str | None = None, embedder: Embedder | None = None
+    ) -> ParentChildVectorStore:
+        """Map a directory written by :meth:`save` without reading it into memory.
+
+        Stores built with a custom embedder need the same ``embedder`` passed back in
+        for dense queries; hashing embedders are restored from the manifest.
+        """
+
+        path = Path(directory)
+        if not (path / "manifest.json").exists():
+            raise ValueError(f"No persisted vector store at {path}")
+        files = _StoreFiles(path)
+        manifest = files.manifest
+        if manifest.get("format_version") != _STORE_FORMAT_VERSION:
+            raise ValueError(f"Unsupported vector store format in {path}")
+
+        described = manifest.get("embedder")
+        if not described:
+            embedder = None
+        else:
+            if embedder is None and described["kind"] == "hashing":
+                embedder = HashingEmbedder(dim=described["dim"])
+            if embedder is not None and embedder.dim != described["dim"]:
+                raise ValueError(f"Embedder dim {embedder.dim} does not match store in {path}")
+
+        store = cls(
+            uri or file_vector_store_uri(path),
+            bm25_k1=manifest["bm25_k1"],
+            bm25_b=manifest["bm25_b"],
+            embedder=embedder,
+            chunk_size=manifest["chunk_size"],
+            chunk_overlap=manifest["chunk_overlap"],
+            dedupe_threshold=manifest.get("dedupe_threshold"),
+            fusion=manifest.get("fusion", "rrf"),
+            fusion_weight=manifest.get("fusion_weight", 0.5),
+        )
+        store.scoring = _validate_scoring(manifest["scoring"])
+        parent_rows = _MappedParentRows(files)
+        store._parent_rows = parent_rows
+        store.parents = _MappedParents(files, parent_rows)
+        store._child_parent = files.array("child_parents")
+        store._child_start = files.array("child_starts")
+        store._child_end = files.array("child_ends")
+        store._child_index = files.array("child_chunk_indexes")
+        overrides = files.child_overrides
+        store._text_overrides = {int(key): text for key, text in overrides["texts"].items()}
+        store._metadata_overrides = {
+            int(key): extra for key, extra in overrides["metadata"].items()
+        }
+        store._collapsed = {
+            parent_id: [cast(_CollapsedChild, tuple(record)) for record in records]
+            for parent_id, records in overrides.get("collapsed", {}).items()
+        }
+        store._postings = _MappedPostings(files)
+        store._lengths = files.array("lengths")
+        store._total_length = manifest["total_length"]
+        store._columns = _MetadataColumns.load(files)
+        store._deleted = bytearray(len(store._child_parent))
+        if embedder is not None:
+            store._embeddings = files.array("embeddings")
+            if manifest.get("ann"):
+                store.ann = IVFFlatIndex.from_arrays(
+                    manifest["ann"],
+                    {name: files.array(f"ann_{name}") for name in ("centroids", "assignments")},
+                )
+        store._files = files
+        return store
+
+    def _thaw(self) -> None:
+        """Copy a memory-mapped store into mutable in-memory structures."""
+
+        if self._files is None:
+            return
+        self._parent_rows = list(self._parent_rows)
+        self.parents = {parent.metadata["id"]: parent for parent in self._parent_rows}
+        for name in ("_child_parent", "_child_start", "_child_end", "_child_index", "_lengths"):
+            setattr(self, name, array("I", np.asarray(getattr(self, name)).tolist()))
+        self._postings = {
+            term: _Postings(array("I", entry.child_ids), array("I", entry.term_freqs))
+            for term, entry in self._postings.items()
+        }
+        self._embeddings = np.array(self._embeddings, dtype=np.float32)
+        self._columns.thaw()
+        self._parent_spans = {}
+        for child_id, row in enumerate(self._child_parent):
+            parent_id = self._parent_rows[row].metadata["id"]
+            start, _ = self._parent_spans.get(parent_id, (child_id, child_id))
+            self._parent_spans[parent_id] = (start, child_id + 1)
+        for parent in self._parent_rows:
+            # Parents whose children were all collapsed into duplicates own no rows.
+            self._parent_spans.setdefault(parent.metadata["id"], (0, 0))
+        self._files = None
 
     def search(
         self,
         query: str,
         filters: Mapping[str, Any] | None = None,
         k: int = 5,
+        *,
+        scoring: ScoringMode | None = None,
+        timings: MutableMapping[str, float] | None = None,
     ) -> list[SearchResult]:
-        filtered_children = [
-            child for child in self.children if _passes_filters(child.metadata, filters)
-        ]
-        scored = [
-            (self._score(query, child.page_content), child) for child in filtered_children
-        ]
-        scored.sort(key=lambda pair: pair[0], reverse=True)
-        top = scored[:k]
-        return [
-            SearchResult(
-                chunk=child,
-                parent=self.parents[child.metadata["parent_id"]],
-                score=score,
+        """Return the top ``k`` children for ``query``.
+
+        Rankings are cached per normalized query, filters, ``k``, BM25 parameters and
+        ANN ``nprobe``; any mutation bumps ``version`` and invalidates them.
+        ``timings`` receives per-stage latency in milliseconds: ``filter_ms``,
+        ``lexical_ms``/``dense_ms`` for the retrievers that ran, ``fusion_ms`` for
+        hybrid scoring, and always ``total_ms`` (a cache hit reports only the total).
+        """
+
+        started = time.perf_counter()
+        mode = _validate_scoring(scoring or self.scoring)
+        # Sparse scoring only sees the set of query terms; dense embedders see the text.
+        if mode in ("dense", "hybrid"):
+            normalized = query
+        else:
+            normalized = " ".join(sorted(set(_tokenize(query))))
+        key: tuple[Any, ...] = (mode, normalized, _filters_key(filters), k)
+        if mode in ("bm25", "hybrid"):
+            # Like ``nprobe``, the BM25 parameters can change without bumping ``version``.
+            key += (self.bm25_k1, self.bm25_b)
+        if mode == "hybrid":
+            key += (self.fusion, self.fusion_weight, self.hybrid_depth)
+        if mode in ("dense", "hybrid") and self.ann is not None:
+            # ``ann.nprobe`` is tuned in place without bumping ``version``.
+            key += (self.ann.nprobe,)
+        ranked = self._cache.get(self.version, key)
+        if ranked is None:
+            ranked = self._rank(query, filters, k, mode, timings=timings)
+            self._cache.put(self.version, key, ranked)
+        results = [self._result(child_id, score) for child_id, score in ranked]
+        if timings is not None:
+            timings["total_ms"] = 1000 * (time.perf_counter() - started)
+        return results
+
+    def close(self) -> None:
+        """Drop derived caches (results, passage and dedupe indexes); they rebuild on demand."""
+
+        self._cache = _ResultCache(self._cache.maxsize)
+        self._passages = None
+        self._dedupe = None
+
+    def cache_info(self) -> SearchCacheInfo:
+        """Hit/miss counters and occupancy of the search result cache."""
+
+        return self._cache.info()
+
+    def search_parents(
+        self,
+        query: str,
+        filters: Mapping[str, Any] | None = None,
+        k: int = 5,
+        *,
+        scoring: ScoringMode | None = None,
+        combine: ParentCombiner = "max",
+        stats: CorpusStats | None = None,
+    ) -> list[ParentSearchResult]:
+        """Return the top ``k`` distinct parents for ``query``.
+
+        Child scores are grouped by parent before selection, so one parent's many
+        hits never crowd out others; ``combine`` picks the best child ("max") or adds
+        them up ("sum"). Each result lists its matching children as spans into the
+        parent text, best first, instead of repeating the parent per child.
+        """
+
+        if combine not in ("max", "sum"):
+            raise ValueError(f"Unknown parent combiner: {combine}")
+        mode = _validate_scoring(scoring or self.scoring)
+        count = len(self._child_parent)
+        if not count or k <= 0:
+            return []
+        allowed, residual = self._candidate_mask(filters)
+
+        if mode == "hybrid":
+            # Fusion only sees the top children, so deepen it until they span k parents.
+            depth = max(k, self.hybrid_depth)
+            while True:
+                fused = self._hybrid_rank(query, allowed, residual, depth, stats)
+                parents = {int(self._child_parent[child_id]) for child_id, _ in fused}
+                if len(parents) >= k or len(fused) < depth or depth >= count:
+                    break
+                depth *= 4
+            ids = np.array([child_id for child_id, _ in fused], dtype=np.intp)
+            scores = np.array([score for _, score in fused], dtype=np.float64)
+            residual = {}
+        elif mode == "dense":
+            if self.embedder is None:
+                raise ValueError(f"Vector store {self.uri} has no embeddings for dense search")
+            query_vector = self.embedder([query])[0]
+            if self.ann is not None:
+                ids = self.ann.probe(query_vector)
+            else:
+                ids = np.arange(count)
+            if allowed is not None:
+                ids = ids[allowed[ids]]
+            scores = self._embeddings[ids] @ query_vector
+            positive = scores > 0
+            ids, scores = ids[positive], scores[positive].astype(np.float64)
+        else:
+            terms = set(_tokenize(query))
+            if mode == "bm25":
+                child_scores = self._bm25_scores(terms, allowed, stats)
+            else:
+                child_scores = self._overlap_scores(terms, allowed)
+            ids = np.fromiter(child_scores, dtype=np.intp, count=len(child_scores))
+            scores = np.fromiter(child_scores.values(), dtype=np.float64, count=len(ids))
+        if residual and len(ids):
+            keep = [_passes_filters(self._child_metadata(int(i)), residual) for i in ids]
+            ids, scores = ids[keep], scores[keep]
+        if not len(ids):
+            return []
+
+        rows = np.asarray(self._child_parent)[ids].astype(np.intp)
+        if combine == "sum":
+            totals = np.bincount(rows, weights=scores, minlength=len(self._parent_rows))
+        else:
+            totals = np.full(len(self._parent_rows), -np.inf)
+            np.maximum.at(totals, rows, scores)
+        candidates = np.unique(rows)
+        # Ties keep parent insertion order, like child ties in ``search``.
+        best = candidates[np.lexsort((candidates, -totals[candidates]))][:k]
+
+        order = np.lexsort((ids, -scores))
+        ids, scores, rows = ids[order], scores[order], rows[order]
+        results = []
+        for row in best.tolist():
+            matching = rows == row
+            children = [
+                ChildSpan(
+                    int(self._child_start[child_id]),
+                    int(self._child_end[child_id]),
+                    int(self._child_index[child_id]),
+                    float(score),
+                )
+                for child_id, score in zip(ids[matching].tolist(), scores[matching].tolist())
+            ]
+            results.append(ParentSearchResult(self._parent_rows[row], float(totals[row]), children))
+        return results
+
+    def corpus_stats(self, terms: Iterable[str]) -> CorpusStats:
+        """Live child count, total length and document frequencies of ``terms``."""
+
+        doc_freqs = {}
+        for term in set(terms):
+            postings = self._postings.get(term)
+            if postings is not None:
+                doc_freqs[term] = len(postings.child_ids) - self._removed_doc_freq.get(term, 0)
+        return CorpusStats(len(self._lengths) - self._deleted_count, self._total_length, doc_freqs)
+
+    def _rank(
+        self,
+        query: str,
+        filters: Mapping[str, Any] | None,
+        k: int,
+        mode: ScoringMode,
+        stats: CorpusStats | None = None,
+        timings: MutableMapping[str, float] | None = None,
+    ) -> list[tuple[int, float]]:
+        """Rank children as ``(child_id, score)`` pairs.
+
+        ``stats`` replaces this store's BM25 statistics, e.g. with shard-wide totals;
+        ``timings`` receives per-stage latency as documented on :meth:`search`.
+        """
+
+        started = time.perf_counter()
+        allowed, residual = self._candidate_mask(filters)
+        masked = time.perf_counter()
+        if mode == "hybrid":
+            ranked = self._hybrid_rank(query, allowed, residual, k, stats, timings)
+        elif mode == "dense":
+            ranked = self._dense_search(query, allowed, residual, k)
+        else:
+            ranked = self._sparse_rank(query, allowed, residual, k, mode, stats)
+        if timings is not None:
+            timings["filter_ms"] = 1000 * (masked - started)
+            if mode != "hybrid":
+                stage = "dense_ms" if mode == "dense" else "lexical_ms"
+                timings[stage] = 1000 * (time.perf_counter() - masked)
+        return ranked
+
+    def _candidate_mask(
+        self, filters: Mapping[str, Any] | None
+    ) -> tuple[np.ndarray | None, dict[str, Any]]:
+        """Columnar filter mask intersected with live rows, plus the residual filters."""
+
+        allowed, residual = self._columns.mask(filters) if filters else (None, {})
+        if self._deleted_count:
+            live = ~np.frombuffer(self._deleted, dtype=bool)
+            allowed = live if allowed is None else allowed & live
+        return allowed, residual
+
+    def _sparse_rank(
+        self,
+        query: str,
+        allowed: np.ndarray | None,
+        residual: Mapping[str, Any],
+        k: int,
+        mode: ScoringMode,
+        stats: CorpusStats | None = None,
+    ) -> list[tuple[int, float]]:
+        query_terms = set(_tokenize(query))
+        if mode == "bm25":
+            scores = self._bm25_scores(query_terms, allowed, stats)
+        else:
+            scores = self._overlap_scores(query_terms, allowed)
+
+        candidates: Iterable[tuple[int, float]] = scores.items()
+        if residual:
+            candidates = (
+                (child_id, score)
+                for child_id, score in candidates
+                if _passes_filters(self._child_metadata(child_id), residual)
             )
-            for score, child in top
-            if score > 0
-        ]
+        # Ties keep insertion order, matching a stable descending sort over children.
+        return heapq.nlargest(k, candidates, key=lambda pair: (pair[1], -pair[0]))
+
+    def _hybrid_candidates(
+        self,
+        query: str,
+        allowed: np.ndarray | None,
+        residual: Mapping[str, Any],
+        depth: int,
+        stats: CorpusStats | None = None,
+    ) -> tuple[list[tuple[int, float]], list[tuple[int, float]], float, float]:
+        """BM25 and dense top-``depth`` lists over one mask, plus their seconds.
+
+        BM25 runs on a pool thread while the dense product runs here; NumPy releases
+        the GIL for the matrix work, so the two overlap.
+        """
+
+        if self.embedder is None:
+            raise ValueError(f"Vector store {self.uri} has no embeddings for hybrid search")
+
+        def lexical() -> tuple[list[tuple[int, float]], float]:
+            started = time.perf_counter()
+            ranked = self._sparse_rank(query, allowed, residual, depth, "bm25", stats)
+            return ranked, time.perf_counter() - started
+
+        future = _hybrid_executor().submit(lexical)
+        started = time.perf_counter()
+        dense = self._dense_search(query, allowed, residual, depth)
+        dense_seconds = time.perf_counter() - started
+        lexical_ranked, lexical_seconds = future.result()
+        return lexical_ranked, dense, lexical_seconds, dense_seconds
+
+    def _hybrid_rank(
+        self,
+        query: str,
+        allowed: np.ndarray | None,
+        residual: Mapping[str, Any],
+        k: int,
+        stats: CorpusStats | None = None,
+        timings: MutableMapping[str, float] | None = None,
+    ) -> list[tuple[int, float]]:
+        lexical, dense, lexical_seconds, dense_seconds = self._hybrid_candidates(
+            query, allowed, residual, max(k, self.hybrid_depth), stats
+        )
+        started = time.perf_counter()
+        fused = _fuse_rankings(lexical, dense, self.fusion, self.fusion_weight)[:k]
+        if timings is not None:
+            timings["lexical_ms"] = 1000 * lexical_seconds
+            timings["dense_ms"] = 1000 * dense_seconds
+            timings["fusion_ms"] = 1000 * (time.perf_counter() - started)
+        return fused
+
+    def search_many(
+        self,
+        queries: Sequence[str],
+        filters: Mapping[str, Any] | Sequence[Mapping[str, Any] | None] | None = None,
+        k: int = 5,
+        *,
+        scoring: ScoringMode | None = None,
+    ) -> list[list[SearchResult]]:
+        """Run several queries together and return one top-``k`` list per query.
+
+        ``filters`` is either shared by every query or a sequence with one entry per
+        query. Each distinct filter is turned into a mask once; dense queries are
+        scored as one matrix product and sparse queries walk each posting list once.
+        """
+
+        mode = _validate_scoring(scoring or self.scoring)
+        if filters is None or isinstance(filters, Mapping):
+            per_query: list[Mapping[str, Any] | None] = [filters] * len(queries)
+        else:
+            per_query = list(filters)
+            if len(per_query) != len(queries):
+                raise ValueError("filters must be shared or given once per query")
+        if mode == "hybrid":
+            return [
+                [
+                    self._result(child_id, score)
+                    for child_id, score in self._rank(query, query_filters, k, mode)
+                ]
+                for query, query_filters in zip(queries, per_query)
+            ]
+
+        live = ~np.frombuffer(self._deleted, dtype=bool) if self._deleted_count else None
+        groups: dict[str, tuple[np.ndarray | None, dict[str, Any], dict[int, bool]]] = {}
+        query_groups = []
+        for query_filters in per_query:
+            key = _filters_key(query_filters)
+            if key not in groups:
+                allowed, residual = (
+                    self._columns.mask(query_filters) if query_filters else (None, {})
+                )
+                if live is not None:
+                    allowed = live if allowed is None else allowed & live
+                groups[key] = (allowed, residual, {})
+            query_groups.append(groups[key])
+
+        def passes(group: tuple[Any, dict[str, Any], dict[int, bool]], child_id: int) -> bool:
+            _, residual, seen = group
+            if not residual:
+                return True
+            if child_id not in seen:
+                seen[child_id] = _passes_filters(self._child_metadata(child_id), residual)
+            return seen[child_id]
+
+        count = len(self._child_parent)
+        if not queries or not count or k <= 0:
+            return [[] for _ in queries]
+        if mode == "dense":
+            if self.embedder is None:
+                raise ValueError(f"Vector store {self.uri} has no embeddings for dense search")
+            vectors = self.embedder(list(queries))
+            if self.ann is not None:
+                return [
+                    [
+                        self._result(child_id, score)
+                        for child_id, score in self._ann_top(vector, group[0], group[1], k)
+                    ]
+                    for vector, group in zip(vectors, query_groups)
+                ]
+            matrix = self._embeddings[:count] @ vectors.T
+            return [
+                [
+                    self._result(child_id, score)
+                    for child_id, score in self._dense_top(matrix[:, column], group[0], group[1], k)
+                ]
+                for column, group in enumerate(query_groups)
+            ]
+
+        query_terms = [set(_tokenize(query)) for query in queries]
+        weights = self._term_weights(set().union(*query_terms), mode)
+        lengths = _as_array(self._lengths, np.uint32)
+        results: list[list[SearchResult]] = []
+        for terms, group in zip(query_terms, query_groups):
+            matched = [weights[term] for term in terms if term in weights]
+            ids = np.concatenate([term_ids for term_ids, _ in matched] or [np.empty(0, np.intp)])
+            contributions = np.concatenate(
+                [term_weights for _, term_weights in matched] or [np.empty(0)]
+            )
+            allowed = group[0]
+            if allowed is not None:
+                keep = allowed[ids]
+                ids, contributions = ids[keep], contributions[keep]
+            # Accumulate over the matched children only, not the whole corpus.
+            candidates, slots = np.unique(ids, return_inverse=True)
+            scores = np.bincount(slots, weights=contributions, minlength=len(candidates))
+            if mode == "overlap":
+                scores = scores / lengths[candidates]
+            top: list[tuple[int, float]] = []
+            window = min(len(candidates), k if not group[1] else 4 * k)
+            while window:
+                best = np.arange(len(candidates))
+                if window < len(candidates):
+                    # Widen the partition to every tie of its lowest score, so ties
+                    # still resolve by insertion order.
+                    cutoff = scores[np.argpartition(-scores, window - 1)[:window]].min()
+                    best = np.flatnonzero(scores >= cutoff)
+                best = best[np.lexsort((candidates[best], -scores[best]))]
+                top = []
+                for slot in best.tolist():
+                    child_id = int(candidates[slot])
+                    if passes(group, child_id):
+                        top.append((child_id, float(scores[slot])))
+                        if len(top) == k:
+                            break
+                if len(top) == k or len(best) == len(candidates):
+                    break
+                window = min(len(candidates), window * 4)
+            results.append([self._result(child_id, score) for child_id, score in top])
+        return results
+
+    def _term_weights(
+        self, terms: set[str], mode: ScoringMode
+    ) -> dict[str, tuple[np.ndarray, np.ndarray]]:
+        """Per-term ``(child_ids, contributions)`` for a merged postings traversal.
+
+        Overlap contributions are raw term frequencies (normalized by length after
+        summing); BM25 contributions are the per-child BM25 term scores.
+        """
+
+        total = len(self._lengths) - self._deleted_count
+        if not total:
+            return {}
+        avg_length = self._total_length / total
+        k1, b = self.bm25_k1, self.bm25_b
+        all_lengths = _as_array(self._lengths, np.uint32)
+        weights = {}
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            ids = np.asarray(postings.child_ids, dtype=np.intp)
+            counts = np.asarray(postings.term_freqs, dtype=np.float64)
+            if mode == "bm25":
+                doc_freq = len(ids) - self._removed_doc_freq.get(term, 0)
+                idf = math.log(1 + (total - doc_freq + 0.5) / (doc_freq + 0.5))
+                norm = k1 * (1 - b + b * all_lengths[ids] / avg_length)
+                counts = idf * counts * (k1 + 1) / (counts + norm)
+            weights[term] = (ids, counts)
+        return weights
+
+    def _matching_postings(
+        self, query_terms: set[str], allowed: np.ndarray | None
+    ) -> Iterator[tuple[str, int, Sequence[int], Sequence[int]]]:
+        """Yield ``(term, doc_freq, child_ids, term_freqs)`` masked by ``allowed``."""
+
+        for term in query_terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            child_ids: Sequence[int] = postings.child_ids
+            term_freqs: Sequence[int] = postings.term_freqs
+            doc_freq = len(child_ids)
+            if allowed is not None:
+                ids = np.asarray(child_ids, dtype=np.uint32)
+                keep = allowed[ids]
+                child_ids = ids[keep].tolist()
+                term_freqs = np.asarray(term_freqs, dtype=np.uint32)[keep].tolist()
+            yield term, doc_freq, child_ids, term_freqs
+
+    def _overlap_scores(
+        self, query_terms: set[str], allowed: np.ndarray | None = None
+    ) -> dict[int, float]:
+        overlaps: dict[int, int] = {}
+        for _, _, child_ids, term_freqs in self._matching_postings(query_terms, allowed):
+            for child_id, count in zip(child_ids, term_freqs):
+                overlaps[child_id] = overlaps.get(child_id, 0) + count
+        return {
+            child_id: overlap / self._lengths[child_id] for child_id, overlap in overlaps.items()
+        }
+
+    def _bm25_scores(
+        self,
+        query_terms: set[str],
+        allowed: np.ndarray | None = None,
+        stats: CorpusStats | None = None,
+    ) -> dict[int, float]:
+        stats = stats or self.corpus_stats(query_terms)
+        total = stats.documents
+        if not total:
+            return {}
+        avg_length = stats.total_length / total
+        k1, b = self.bm25_k1, self.bm25_b
+        scores: dict[int, float] = {}
+        for term, _, child_ids, term_freqs in self._matching_postings(query_terms, allowed):
+            doc_freq = stats.doc_freqs[term]
+            idf = math.log(1 + (total - doc_freq + 0.5) / (doc_freq + 0.5))
+            for child_id, count in zip(child_ids, term_freqs):
+                norm = k1 * (1 - b + b * self._lengths[child_id] / avg_length)
+                scores[child_id] = scores.get(child_id, 0.0) + idf * count * (k1 + 1) / (
+                    count + norm
+                )
+        return scores
+
+    def _dense_search(
+        self,
+        query: str,
+        allowed: np.ndarray | None,
+        residual: Mapping[str, Any],
+        k: int,
+    ) -> list[tuple[int, float]]:
+        if self.embedder is None:
+            raise ValueError(f"Vector store {self.uri} has no embeddings for dense search")
+        count = len(self._child_parent)
+        if not count or k <= 0:
+            return []
+        query_vector = self.embedder([query])[0]
+        if self.ann is not None:
+            return self._ann_top(query_vector, allowed, residual, k)
+        return self._dense_top(self._embeddings[:count] @ query_vector, allowed, residual, k)
+
+    def _ann_top(
+        self,
+        query_vector: np.ndarray,
+        allowed: np.ndarray | None,
+        residual: Mapping[str, Any],
+        k: int,
+        nprobe: int | None = None,
+    ) -> list[tuple[int, float]]:
+        """Exactly score the rows of the probed IVF lists.
+
+        More lists are probed while filters leave fewer than ``k`` hits.
+        """
+
+        ann = cast(IVFFlatIndex, self.ann)
+        nprobe = nprobe or ann.nprobe
+        while True:
+            ids = ann.probe(query_vector, nprobe)
+            if allowed is not None:
+                ids = ids[allowed[ids]]
+            scores = self._embeddings[ids] @ query_vector
+            positive = scores > 0
+            ids, scores = ids[positive], scores[positive]
+            hits: list[tuple[int, float]] = []
+            for row in np.lexsort((ids, -scores)).tolist():
+                child_id = int(ids[row])
+                if residual and not _passes_filters(self._child_metadata(child_id), residual):
+                    continue
+                hits.append((child_id, float(scores[row])))
+                if len(hits) == k:
+                    return hits
+            if nprobe >= ann.nlist:
+                return hits
+            nprobe = min(ann.nlist, nprobe * 2)
+
+    def passage_index(self) -> ShingleIndex:
+        """The positional shingle index over parent texts, extended to the newest parents."""
+
+        if self._passages is None:
+            self._passages = ShingleIndex(self.passage_shingle_size)
+        if len(self._passages) < len(self._parent_rows):
+            rows = range(len(self._passages), len(self._parent_rows))
+            self._passages.extend(self._parent_rows[row].page_content for row in rows)
+        return self._passages
+
+    def verify_passage(
+        self, passage: str, *, min_overlap: float = 0.5, k: int = 3
+    ) -> list[PassageMatch]:
+        """Find source regions that contain ``passage`` verbatim or nearly so.
+
+        Matches are ranked by the fraction of the passage's word shingles found along
+        one alignment in a parent; each carries the parent, the matched character span
+        and the live children overlapping it. Passages shorter than the shingle size
+        cannot be verified and return no matches.
+        """
+
+        results: list[PassageMatch] = []
+        for row, start, end, overlap in self.passage_index().match(passage):
+            if overlap < min_overlap or len(results) == k:
+                break
+            parent = self._parent_rows[row]
+            parent_id = parent.metadata["id"]
+            current = self.parents.get(parent_id)
+            # Replaced sections leave their old row behind until the store compacts.
+            if current is None or (isinstance(self.parents, dict) and current is not parent):
+                continue
+            children = [
+                self._child_chunk(child_id, parent)
+                for child_id in self._child_range(parent_id, row)
+                if not self._deleted[child_id]
+                and child_id not in self._text_overrides
+                and self._child_start[child_id] < end
+                and self._child_end[child_id] > start
+            ]
+            results.append(PassageMatch(parent, children, start, end, overlap))
+        return results
+
+    def _child_range(self, parent_id: str, row: int) -> range:
+        if self._files is None:
+            return range(*self._parent_spans.get(parent_id, (0, 0)))
+        # Persisted stores are compacted, so child rows are sorted by parent row.
+        child_parent = self._child_parent
+        return range(
+            int(np.searchsorted(child_parent, row, side="left")),
+            int(np.searchsorted(child_parent, row, side="right")),
+        )
+
+    def build_ann_index(self, nlist: int = 100, nprobe: int = 8, **options: Any) -> IVFFlatIndex:
+        """Train an IVF-flat index over the dense matrix; dense queries then use it.
+
+        ``options`` are passed to :class:`IVFFlatIndex` (``iterations``,
+        ``train_per_list``, ``seed``). Tune ``store.ann.nprobe`` for recall vs latency.
+        """
+
+        if self.embedder is None:
+            raise ValueError(f"Vector store {self.uri} has no embeddings to index")
+        self._thaw()
+        self.version += 1
+        ann = IVFFlatIndex(nlist, nprobe, **options)
+        ann.train(self._embeddings[: len(self._child_parent)])
+        self.ann = ann
+        return ann
+
+    def ann_recall(self, queries: Sequence[str], k: int = 10) -> AnnRecallReport:
+        """Compare the ANN top-``k`` against exact dense search for ``queries``.
+
+        Recall counts ANN hits scoring at least the exact ``k``-th score, so ties
+        between identical chunks do not count as misses.
+        """
+
+        if self.ann is None or self.embedder is None:
+            raise ValueError(f"Vector store {self.uri} has no ANN index")
+        count = len(self._child_parent)
+        live = ~np.frombuffer(self._deleted, dtype=bool) if self._deleted_count else None
+        vectors = self.embedder(list(queries))
+        exact_seconds = ann_seconds = 0.0
+        recalls = []
+        for vector in vectors:
+            started = time.perf_counter()
+            exact = self._dense_top(self._embeddings[:count] @ vector, live, {}, k)
+            exact_seconds += time.perf_counter() - started
+            started = time.perf_counter()
+            approximate = self._ann_top(vector, live, {}, k)
+            ann_seconds += time.perf_counter() - started
+            if exact:
+                # Count by score so rows tied with the k-th exact hit are interchangeable.
+                cutoff = exact[-1][1] - 1e-6
+                found = sum(score >= cutoff for _, score in approximate)
+                recalls.append(min(found, len(exact)) / len(exact))
+        return AnnRecallReport(
+            k=k,
+            nprobe=self.ann.nprobe,
+            queries=len(recalls),
+            recall=float(np.mean(recalls)) if recalls else 1.0,
+            exact_ms=1000 * exact_seconds / max(len(vectors), 1),
+            ann_ms=1000 * ann_seconds / max(len(vectors), 1),
+        )
+
+    def _dense_top(
+        self,
+        scores: np.ndarray,
+        allowed: np.ndarray | None,
+        residual: Mapping[str, Any],
+        k: int,
+    ) -> list[tuple[int, float]]:
+        count = len(scores)
+        if allowed is not None:
+            scores = np.where(allowed, scores, -np.inf)
+
+        # Partition out a window of the best rows, widening it only while residual
+        # (non-columnar) filters reject too many of them.
+        window = min(count, k if not residual else 4 * k)
+        while True:
+            top = (
+                np.argpartition(-scores, window - 1)[:window]
+                if window < count
+                else np.arange(count)
+            )
+            top = top[np.lexsort((top, -scores[top]))]
+            hits = [
+                (int(child_id), float(scores[child_id]))
+                for child_id in top
+                if scores[child_id] > 0
+                and (not residual or _passes_filters(self._child_metadata(child_id), residual))
+            ]
+            if len(hits) >= k or window >= count:
+                return hits[:k]
+            window = min(count, window * 4)
+
+    def _result(self, child_id: int, score: float) -> SearchResult:
+        parent = self._parent_rows[int(self._child_parent[child_id])]
+        return SearchResult(chunk=self._child_chunk(child_id, parent), parent=parent, score=score)
 
     @staticmethod
     def _score(query: str, text: str) -> float:
+        """Reference overlap score; the postings index reproduces it exactly."""
+
         query_terms = set(query.lower().split())
         if not query_terms:
             return 0
@@ -84,13 +1748,269 @@ class ParentChildVectorStore:
         return overlap / len(text_terms)
 
 
-_VECTOR_STORES: dict[str, ParentChildVectorStore] = {}
+class VectorStore(Protocol):
+    """What the registry and the ``vector_store_uri`` search functions need from a store."""
+
+    uri: str
+
+    @property
+    def nbytes(self) -> int: ...
+
+    def search(
+        self,
+        query: str,
+        filters: Mapping[str, Any] | None = None,
+        k: int = 5,
+        *,
+        scoring: ScoringMode | None = None,
+        timings: MutableMapping[str, float] | None = None,
+    ) -> list[SearchResult]: ...
+
+    def search_many(
+        self,
+        queries: Sequence[str],
+        filters: Mapping[str, Any] | Sequence[Mapping[str, Any] | None] | None = None,
+        k: int = 5,
+        *,
+        scoring: ScoringMode | None = None,
+    ) -> list[list[SearchResult]]: ...
+
+    def search_parents(
+        self,
+        query: str,
+        filters: Mapping[str, Any] | None = None,
+        k: int = 5,
+        *,
+        scoring: ScoringMode | None = None,
+        combine: ParentCombiner = "max",
+    ) -> list[ParentSearchResult]: ...
+
+    def close(self) -> None: ...
+
+
+@dataclass
+class _RegistryEntry:
+    store: VectorStore
+    nbytes: int
+    last_access: float
+
+
+class VectorStoreRegistry(MutableMapping[str, VectorStore]):
+    """Open vector stores by URI, bounded by count, bytes and idle time.
+
+    Lookups refresh a store's recency; inserting past ``max_stores`` or
+    ``max_bytes`` evicts the least recently used stores, and stores idle for longer
+    than ``ttl_seconds`` are evicted on the next registry access. With a
+    ``spill_directory`` evicted ``memory://`` stores are saved there and reopened
+    memory-mapped on their next lookup; otherwise they are dropped. ``file://``
+    stores are always reopenable from their own directory; other store types are
+    closed on eviction. With a ``snapshot_directory`` URIs missing from the registry
+    are reattached from their latest :func:`snapshot_vector_store` on lookup through
+    :func:`open_vector_store`.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_stores: int | None = None,
+        max_bytes: int | None = None,
+        ttl_seconds: float | None = None,
+        spill_directory: str | Path | None = None,
+        snapshot_directory: str | Path | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._entries: OrderedDict[str, _RegistryEntry] = OrderedDict()
+        self._spilled: dict[str, tuple[Path, Embedder | None]] = {}
+        self._clock = clock
+        self.configure(
+            max_stores=max_stores,
+            max_bytes=max_bytes,
+            ttl_seconds=ttl_seconds,
+            spill_directory=spill_directory,
+            snapshot_directory=snapshot_directory,
+        )
+
+    def configure(
+        self,
+        *,
+        max_stores: int | None = None,
+        max_bytes: int | None = None,
+        ttl_seconds: float | None = None,
+        spill_directory: str | Path | None = None,
+        snapshot_directory: str | Path | None = None,
+    ) -> None:
+        """Replace the limits and evict whatever no longer fits."""
+
+        if max_stores is not None and max_stores < 1:
+            raise ValueError("max_stores must be a positive integer or None")
+        self.max_stores = max_stores
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.spill_directory = Path(spill_directory) if spill_directory is not None else None
+        self.snapshot_directory = (
+            Path(snapshot_directory) if snapshot_directory is not None else None
+        )
+        self._enforce()
+
+    def __getitem__(self, uri: str) -> VectorStore:
+        self._expire()
+        entry = self._entries.get(uri)
+        if entry is None:
+            spilled = self._spilled.pop(uri, None)
+            if spilled is None:
+                raise KeyError(uri)
+            path, embedder = spilled
+            self[uri] = ParentChildVectorStore.open(path, uri=uri, embedder=embedder)
+            return self._entries[uri].store
+        entry.last_access = self._clock()
+        self._entries.move_to_end(uri)
+        return entry.store
+
+    def __setitem__(self, uri: str, store: VectorStore) -> None:
+        self._spilled.pop(uri, None)
+        self._entries[uri] = _RegistryEntry(store, store.nbytes, self._clock())
+        self._entries.move_to_end(uri)
+        self._enforce(keep=uri)
+
+    def __delitem__(self, uri: str) -> None:
+        self._spilled.pop(uri, None)
+        del self._entries[uri]
+
+    def __contains__(self, uri: object) -> bool:
+        self._expire()
+        return uri in self._entries or uri in self._spilled
+
+    def __iter__(self) -> Iterator[str]:
+        self._expire()
+        return iter(list(self._entries))
+
+    def __len__(self) -> int:
+        self._expire()
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """Forget every store, closing loaded ones and dropping spill records."""
+
+        for entry in self._entries.values():
+            entry.store.close()
+        self._entries.clear()
+        self._spilled.clear()
+
+    def refresh(self, uri: str) -> None:
+        """Re-measure a store after it was mutated in place."""
+
+        entry = self._entries.get(uri)
+        if entry is not None:
+            entry.nbytes = entry.store.nbytes
+            self._enforce(keep=uri)
+
+    def release(self, uri: str) -> bool:
+        """Evict a store now, spilling it if configured; returns whether it was loaded."""
+
+        if uri not in self._entries:
+            return False
+        self._evict(uri)
+        return True
+
+    def close(self) -> None:
+        """Release every loaded store."""
+
+        for uri in list(self._entries):
+            self._evict(uri)
+
+    def nbytes(self, uri: str) -> int:
+        """Accounted bytes for a loaded store (0 once evicted)."""
+
+        entry = self._entries.get(uri)
+        return entry.nbytes if entry is not None else 0
+
+    def sizes(self) -> dict[str, int]:
+        """Accounted bytes per loaded ``vector_store_uri``, least recently used first."""
+
+        self._expire()
+        return {uri: entry.nbytes for uri, entry in self._entries.items()}
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(entry.nbytes for entry in self._entries.values())
+
+    def _expire(self) -> None:
+        if self.ttl_seconds is None:
+            return
+        deadline = self._clock() - self.ttl_seconds
+        for uri, entry in list(self._entries.items()):
+            if entry.last_access < deadline:
+                self._evict(uri)
+
+    def _enforce(self, keep: str | None = None) -> None:
+        self._expire()
+        while self._entries:
+            over_count = self.max_stores is not None and len(self._entries) > self.max_stores
+            over_bytes = self.max_bytes is not None and self.total_bytes > self.max_bytes
+            if not (over_count or over_bytes):
+                return
+            victim = next((uri for uri in self._entries if uri != keep), None)
+            if victim is None:
+                # A single store larger than max_bytes stays loaded rather than thrash.
+                return
+            self._evict(victim)
+
+    def _evict(self, uri: str) -> None:
+        store = self._entries.pop(uri).store
+        store.close()
+        if (
+            not isinstance(store, ParentChildVectorStore)
+            or uri.startswith(_FILE_URI_PREFIX)
+            or self.spill_directory is None
+        ):
+            return
+        path = self.spill_directory / hashlib.sha1(uri.encode("utf-8")).hexdigest()
+        if store._files is None or store._files.directory != path:
+            store.save(path)
+        self._spilled[uri] = (path, store.embedder)
+
+
+_VECTOR_STORES = VectorStoreRegistry()
+_FILE_URI_PREFIX = "file://"
 
 
 def reset_vector_store_registry() -> None:
-    """Testing helper to clear in-memory registry."""
+    """Testing helper to clear in-memory registry and its limits."""
 
     _VECTOR_STORES.clear()
+    _VECTOR_STORES.configure()
+
+
+def configure_vector_store_registry(
+    *,
+    max_stores: int | None = None,
+    max_bytes: int | None = None,
+    ttl_seconds: float | None = None,
+    spill_directory: str | Path | None = None,
+    snapshot_directory: str | Path | None = None,
+) -> VectorStoreRegistry:
+    """Set the limits of the process-wide store registry and return it."""
+
+    _VECTOR_STORES.configure(
+        max_stores=max_stores,
+        max_bytes=max_bytes,
+        ttl_seconds=ttl_seconds,
+        spill_directory=spill_directory,
+        snapshot_directory=snapshot_directory,
+    )
+    return _VECTOR_STORES
+
+
+def release_vector_store(vector_store_uri: str) -> bool:
+    """Evict a store from the registry, spilling it to disk if the registry is configured to."""
+
+    return _VECTOR_STORES.release(vector_store_uri)
+
+
+def vector_store_sizes() -> dict[str, int]:
+    """Accounted bytes per loaded ``vector_store_uri``."""
+
+    return _VECTOR_STORES.sizes()
 
 
 def ingest_documents(
@@ -98,6 +2018,16 @@ def ingest_documents(
     *,
     chunk_size: int = 400,
     chunk_overlap: int = 40,
+    scoring: ScoringMode = "overlap",
+    embedder: Embedder | None = None,
+    vector_store_uri: str | None = None,
+    workers: int | None = 1,
+    dedupe_threshold: float | None = None,
+    ann_nlist: int | None = None,
+    ann_nprobe: int = 8,
+    index_passages: bool = False,
+    fusion: FusionMode = "rrf",
+    fusion_weight: float = 0.5,
 ) -> str:
     """Create parent-child chunks and register them in an in-memory store.
 
@@ -106,21 +2036,181 @@ def ingest_documents(
     - generates parent (section) and child (chunk) pairs
     - attaches metadata (year/citations/authors)
     - registers results and returns a vector_store_uri handle
+
+    ``scoring`` sets the store's default ranking ("overlap", "bm25", "dense" or
+    "hybrid", which fuses BM25 and dense rankings with ``fusion`` and
+    ``fusion_weight``). Passing an ``embedder`` also builds the dense matrix for
+    sparse defaults.
+    A ``file://`` ``vector_store_uri`` persists the store to that directory so other
+    processes can open it memory-mapped through :func:`search_sections`.
+
+    ``workers`` > 1 normalizes, splits and tokenizes documents in that many worker
+    processes (``None`` uses one per CPU); the partial results are merged in input
+    order, so the store is identical to a serial ingest. Embeddings are still
+    computed in the calling process.
+
+    ``dedupe_threshold`` enables near-duplicate collapsing: a child chunk whose
+    estimated shingle Jaccard similarity (MinHash/LSH) to an existing child reaches the
+    threshold is not indexed again; its parent id is recorded in that child's
+    ``duplicate_parent_ids`` metadata instead. Later appends dedupe against the store,
+    and removing a canonical copy re-indexes its surviving duplicates.
+
+    ``ann_nlist`` trains an IVF-flat index with that many lists once the documents
+    are in; dense queries then scan only ``ann_nprobe`` lists (see
+    :func:`ann_recall_report`).
+
+    ``index_passages`` builds the positional shingle index used by
+    :func:`verify_passage` up front instead of on the first verification.
     """
 
-    normalized = [_normalize_document(doc) for doc in documents]
-    vector_store_uri = f"memory://ingest-{uuid.uuid4()}"
-    store = ParentChildVectorStore(vector_store_uri)
+    vector_store_uri = vector_store_uri or f"memory://ingest-{uuid.uuid4()}"
+    store = ParentChildVectorStore(
+        vector_store_uri,
+        scoring=scoring,
+        embedder=embedder,
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        dedupe_threshold=dedupe_threshold,
+        fusion=fusion,
+        fusion_weight=fusion_weight,
+    )
+    _ingest_into(store, documents, workers=workers)
+    if ann_nlist is not None:
+        store.build_ann_index(ann_nlist, ann_nprobe)
+    if index_passages:
+        store.passage_index()
+
+    if vector_store_uri.startswith(_FILE_URI_PREFIX):
+        store.save(_file_uri_path(vector_store_uri))
+    _VECTOR_STORES[vector_store_uri] = store
+    return vector_store_uri
+
+
+def append_documents(
+    documents: Iterable[Mapping[str, Any] | SourceDocument],
+    *,
+    vector_store_uri: str,
+    replace: bool = False,
+    workers: int | None = 1,
+) -> int:
+    """Stream documents into an existing store and return the number of chunks added.
+
+    Documents are consumed one at a time from the iterable, so memory stays bounded
+    by the store itself rather than the batch. With ``replace=True`` any document
+    already present under the same id (or title, for documents without an id) is
+    removed first. ``file://`` stores are rewritten after the append; stores other
+    handles already opened keep serving the previous generation. ``workers``
+    behaves as in :func:`ingest_documents`.
+    """
+
+    store = _local_store(vector_store_uri)
+    added = _ingest_into(store, documents, replace=replace, workers=workers)
+    if vector_store_uri.startswith(_FILE_URI_PREFIX):
+        store.save(_file_uri_path(vector_store_uri))
+    _VECTOR_STORES.refresh(vector_store_uri)
+    return added
+
+
+def remove_document(document: str, *, vector_store_uri: str) -> int:
+    """Remove every section of a document matched by id or title; returns chunks removed."""
+
+    store = _local_store(vector_store_uri)
+    removed = sum(
+        store.remove_parent(parent_id) for parent_id in store.parents_for_document(document)
+    )
+    if removed and vector_store_uri.startswith(_FILE_URI_PREFIX):
+        store.save(_file_uri_path(vector_store_uri))
+    _VECTOR_STORES.refresh(vector_store_uri)
+    return removed
+
+
+def _ingest_into(
+    store: ParentChildVectorStore,
+    documents: Iterable[Mapping[str, Any] | SourceDocument],
+    *,
+    replace: bool = False,
+    workers: int | None = 1,
+) -> int:
+    if workers is not None and workers < 1:
+        raise ValueError("workers must be a positive integer or None")
+    prepare = partial(
+        _prepare_document, chunk_size=store.chunk_size, chunk_overlap=store.chunk_overlap
+    )
+    if workers == 1:
+        return _merge_prepared(store, map(prepare, documents), replace=replace)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Two batches per worker keep the pool busy without reading ahead of the merge.
+        window = 2 * (workers or os.cpu_count() or 1)
+        prepared = _prepare_in_pool(pool, prepare, documents, window)
+        return _merge_prepared(store, prepared, replace=replace)
+
+
+def _prepare_in_pool(
+    pool: ProcessPoolExecutor,
+    prepare: Callable[[Any], tuple[SourceDocument, list[_PreparedSection]]],
+    documents: Iterable[Mapping[str, Any] | SourceDocument],
+    window: int,
+) -> Iterator[tuple[SourceDocument, list[_PreparedSection]]]:
+    """Prepared documents in input order, with at most ``window`` batches in flight."""
+
+    remaining = iter(documents)
+    in_flight: deque[Future[list[tuple[SourceDocument, list[_PreparedSection]]]]] = deque()
+    while batch := list(islice(remaining, _INGEST_BATCH_SIZE)):
+        in_flight.append(pool.submit(_prepare_batch, prepare, batch))
+        if len(in_flight) >= window:
+            yield from in_flight.popleft().result()
+    while in_flight:
+        yield from in_flight.popleft().result()
+
+
+def _prepare_batch(
+    prepare: Callable[[Any], tuple[SourceDocument, list[_PreparedSection]]],
+    batch: list[Mapping[str, Any] | SourceDocument],
+) -> list[tuple[SourceDocument, list[_PreparedSection]]]:
+    return [prepare(raw) for raw in batch]
+
 
-    for doc in normalized:
-        sections = doc.sections or [SourceSection(heading="Full Document", content="")]
+def _prepare_document(
+    raw: Mapping[str, Any] | SourceDocument, *, chunk_size: int, chunk_overlap: int
+) -> tuple[SourceDocument, list[_PreparedSection]]:
+    """Normalize and split one document; runs in ingest worker processes."""
+
+    doc = _normalize_document(raw)
+    sections = []
+    for section in doc.sections:
+        if not section.content:
+            continue
+        spans = _split_spans(section.content, chunk_size, chunk_overlap)
+        term_counts = [_term_counts(section.content[start:end]) for start, end in spans]
+        sections.append(_PreparedSection(section.heading, section.content, spans, term_counts))
+    # Sections travel back as prepared spans, so the document is returned without them.
+    stripped = SourceDocument(doc.title, doc.id, doc.year, doc.citations, doc.authors)
+    return stripped, sections
+
+
+def _merge_prepared(
+    store: ParentChildVectorStore,
+    prepared: Iterable[tuple[SourceDocument, list[_PreparedSection]]],
+    *,
+    replace: bool,
+) -> int:
+    added = 0
+    for doc, sections in prepared:
+        if replace:
+            for parent_id in store.parents_for_document(doc.id or doc.title):
+                store.remove_parent(parent_id)
         for section in sections:
-            if not section.content:
-                continue
-            parent_id = f"parent-{uuid.uuid4()}"
+            # Content-derived ids keep identical corpora byte-identical (see snapshots);
+            # the row count makes repeats unique, with a random id as the last resort.
+            row = len(store._parent_rows)
+            seed = f"{doc.id}\0{doc.title}\0{section.heading}\0{section.content}\0{row}"
+            parent_id = f"parent-{uuid.uuid5(uuid.NAMESPACE_OID, seed)}"
+            if parent_id in store.parents:
+                parent_id = f"parent-{uuid.uuid4()}"
             parent_metadata = {
                 "id": parent_id,
                 "type": "parent",
+                "document_id": doc.id,
                 "title": doc.title,
                 "section_heading": section.heading,
                 "year": doc.year,
@@ -128,26 +2218,45 @@ def ingest_documents(
                 "authors": doc.authors,
             }
             parent_chunk = Chunk(page_content=section.content, metadata=parent_metadata)
+            added += store._add_section_spans(
+                parent_chunk, section.spans, term_counts=section.term_counts
+            )
+    return added
 
-            child_chunks = []
-            for index, content in enumerate(
-                _split_text(section.content, chunk_size, chunk_overlap)
-            ):
-                metadata = {
-                    "parent_id": parent_id,
-                    "section_heading": section.heading,
-                    "title": doc.title,
-                    "year": doc.year,
-                    "citations": doc.citations,
-                    "authors": doc.authors,
-                    "chunk_index": index,
-                }
-                child_chunks.append(Chunk(page_content=content, metadata=metadata))
-
-            store.add_section(parent_chunk, child_chunks)
 
+def file_vector_store_uri(directory: str | Path) -> str:
+    """Return the ``file://`` vector_store_uri for a persisted store directory."""
+
+    return f"{_FILE_URI_PREFIX}{Path(directory).resolve()}"
+
+
+def open_vector_store(vector_store_uri: str, *, embedder: Embedder | None = None) -> VectorStore:
+    """Return the registered store for a URI, mapping ``file://`` stores on first use.
+
+    Unknown URIs are reattached from the registry's ``snapshot_directory`` if set.
+    """
+
+    if vector_store_uri in _VECTOR_STORES:
+        return _VECTOR_STORES[vector_store_uri]
+    snapshots = _VECTOR_STORES.snapshot_directory
+    if snapshots is not None and restore_vector_store(
+        vector_store_uri, snapshots, embedder=embedder
+    ):
+        return _VECTOR_STORES[vector_store_uri]
+    if not vector_store_uri.startswith(_FILE_URI_PREFIX):
+        raise ValueError(f"Unknown vector_store_uri: {vector_store_uri}")
+    store = ParentChildVectorStore.open(
+        _file_uri_path(vector_store_uri), uri=vector_store_uri, embedder=embedder
+    )
     _VECTOR_STORES[vector_store_uri] = store
-    return vector_store_uri
+    return store
+
+
+def _local_store(vector_store_uri: str) -> ParentChildVectorStore:
+    store = open_vector_store(vector_store_uri)
+    if not isinstance(store, ParentChildVectorStore):
+        raise ValueError(f"{vector_store_uri} is not a single-process ParentChildVectorStore")
+    return store
 
 
 def search_sections(
@@ -156,13 +2265,235 @@ def search_sections(
     vector_store_uri: str,
     filters: Mapping[str, Any] | None = None,
     k: int = 5,
+    scoring: ScoringMode | None = None,
+    timings: MutableMapping[str, float] | None = None,
 ) -> list[SearchResult]:
-    """Search child chunks with optional metadata filtering."""
+    """Search child chunks with optional metadata filtering.
 
-    if vector_store_uri not in _VECTOR_STORES:
-        raise ValueError(f"Unknown vector_store_uri: {vector_store_uri}")
-    store = _VECTOR_STORES[vector_store_uri]
-    return store.search(query, filters=filters, k=k)
+    ``scoring`` overrides the store's default ranking for this query; ``"hybrid"``
+    fuses BM25 and dense rankings. ``timings`` receives per-stage latency in
+    milliseconds. ``file://`` URIs are opened memory-mapped on first use.
+    """
+
+    store = open_vector_store(vector_store_uri)
+    return store.search(query, filters=filters, k=k, scoring=scoring, timings=timings)
+
+
+def search_many(
+    queries: Sequence[str],
+    *,
+    vector_store_uri: str,
+    filters: Mapping[str, Any] | Sequence[Mapping[str, Any] | None] | None = None,
+    k: int = 5,
+    scoring: ScoringMode | None = None,
+) -> list[list[SearchResult]]:
+    """Search several queries at once; returns one result list per query.
+
+    ``filters`` is shared by all queries or given once per query. See
+    :meth:`ParentChildVectorStore.search_many`.
+    """
+
+    store = open_vector_store(vector_store_uri)
+    return store.search_many(queries, filters=filters, k=k, scoring=scoring)
+
+
+def search_parents(
+    query: str,
+    *,
+    vector_store_uri: str,
+    filters: Mapping[str, Any] | None = None,
+    k: int = 5,
+    scoring: ScoringMode | None = None,
+    combine: ParentCombiner = "max",
+) -> list[ParentSearchResult]:
+    """Search with hits grouped by parent section.
+
+    See :meth:`ParentChildVectorStore.search_parents`.
+    """
+
+    store = open_vector_store(vector_store_uri)
+    return store.search_parents(query, filters=filters, k=k, scoring=scoring, combine=combine)
+
+
+def rerank_search(
+    queries: Sequence[str],
+    *,
+    vector_store_uri: str,
+    filters: Mapping[str, Any] | Sequence[Mapping[str, Any] | None] | None = None,
+    k: int = 5,
+    candidates: int = 100,
+    scoring: ScoringMode | None = None,
+    stage: RerankStage | None = None,
+    time_budget: float | None = None,
+    timings: MutableMapping[str, float] | None = None,
+) -> list[list[SearchResult]]:
+    """Retrieve ``candidates`` children per query, then rerank them down to ``k``.
+
+    First-stage retrieval is one :func:`search_many` call. ``stage`` defaults to a
+    shared :class:`RerankStage` with the offline :class:`LexicalReranker`, so its
+    pair-score cache persists across calls. Reranked hits carry the rerank score;
+    hits left unscored when ``time_budget`` (seconds) ran out keep their first-stage
+    score and follow the reranked ones. ``timings`` receives ``retrieve_ms``,
+    ``rerank_ms`` and ``total_ms``.
+    """
+
+    started = time.perf_counter()
+    store = open_vector_store(vector_store_uri)
+    retrieved = store.search_many(queries, filters=filters, k=max(k, candidates), scoring=scoring)
+    reranking = time.perf_counter()
+    ranked = (stage or _default_rerank_stage()).rank(
+        queries,
+        [[hit.chunk.page_content for hit in hits] for hits in retrieved],
+        time_budget=time_budget,
+    )
+    results = [
+        [
+            hits[index] if score is None else replace(hits[index], score=score)
+            for index, score in order[:k]
+        ]
+        for hits, order in zip(retrieved, ranked)
+    ]
+    if timings is not None:
+        finished = time.perf_counter()
+        timings["retrieve_ms"] = 1000 * (reranking - started)
+        timings["rerank_ms"] = 1000 * (finished - reranking)
+        timings["total_ms"] = 1000 * (finished - started)
+    return results
+
+
+@cache
+def _default_rerank_stage() -> RerankStage:
+    return RerankStage()
+
+
+def verify_passage(
+    passage: str, *, vector_store_uri: str, min_overlap: float = 0.5, k: int = 3
+) -> list[PassageMatch]:
+    """Check whether ``passage`` (or something close to it) appears in an ingested source.
+
+    See :meth:`ParentChildVectorStore.verify_passage`.
+    """
+
+    return _local_store(vector_store_uri).verify_passage(passage, min_overlap=min_overlap, k=k)
+
+
+def ann_recall_report(
+    queries: Sequence[str], *, vector_store_uri: str, k: int = 10
+) -> AnnRecallReport:
+    """Measure recall@k and latency of a store's ANN index against exact search."""
+
+    return _local_store(vector_store_uri).ann_recall(queries, k=k)
+
+
+def snapshot_vector_store(vector_store_uri: str, directory: str | Path) -> str:
+    """Snapshot a store into a content-addressed directory and return its digest.
+
+    The store is saved in the memory-mappable :meth:`ParentChildVectorStore.save`
+    format under ``objects/<sha256>``, the digest covering every saved file, so
+    identical corpora are stored once. ``refs.json`` maps ``vector_store_uri`` to its
+    latest digest for :func:`restore_vector_store`. A store unchanged since its last
+    snapshot into ``directory`` is not saved again.
+    """
+
+    store = _local_store(vector_store_uri)
+    root = Path(directory).resolve()
+    objects = root / "objects"
+    previous = store._snapshot
+    if (
+        previous is not None
+        and previous[:2] == (root, store.version)
+        and (objects / previous[2]).exists()
+    ):
+        digest = previous[2]
+    else:
+        staging = objects / f".staging-{uuid.uuid4().hex}"
+        store.save(staging)
+        digest = _directory_digest(staging)
+        if (objects / digest).exists():
+            shutil.rmtree(staging)
+        else:
+            staging.rename(objects / digest)
+        store._snapshot = (root, store.version, digest)
+    refs = _snapshot_refs(root)
+    if refs.get(vector_store_uri) != digest:
+        refs[vector_store_uri] = digest
+        _write_file(root / "refs.json", json.dumps(refs, indent=2, sort_keys=True))
+    return digest
+
+
+def restore_vector_store(
+    vector_store_uri: str, directory: str | Path, *, embedder: Embedder | None = None
+) -> bool:
+    """Reattach the latest snapshot of ``vector_store_uri``; returns whether one exists.
+
+    The snapshot is opened memory-mapped, so reattaching costs a few file opens
+    whatever the corpus size; the first mutation copies the store into memory and
+    leaves the snapshot untouched. URIs already in the registry are left alone.
+    """
+
+    if vector_store_uri in _VECTOR_STORES:
+        return True
+    root = Path(directory).resolve()
+    digest = _snapshot_refs(root).get(vector_store_uri)
+    if digest is None:
+        return False
+    store = ParentChildVectorStore.open(
+        root / "objects" / digest, uri=vector_store_uri, embedder=embedder
+    )
+    store._snapshot = (root, store.version, digest)
+    _VECTOR_STORES[vector_store_uri] = store
+    return True
+
+
+def _snapshot_refs(root: Path) -> dict[str, str]:
+    path = root / "refs.json"
+    return json.loads(path.read_text()) if path.exists() else {}
+
+
+def _directory_digest(directory: Path) -> str:
+    digest = hashlib.sha256()
+    for path in sorted(directory.rglob("*")):
+        if not path.is_file():
+            continue
+        digest.update(path.relative_to(directory).as_posix().encode("utf-8") + b"\0")
+        with path.open("rb") as handle:
+            for block in iter(lambda: handle.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def _file_uri_path(vector_store_uri: str) -> Path:
+    return Path(vector_store_uri[len(_FILE_URI_PREFIX) :])
+
+
+def _write_texts(directory: Path, kind: str, texts: Sequence[str]) -> None:
+    encoded = [text.encode("utf-8") for text in texts]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(item) for item in encoded], out=offsets[1:])
+    _write_file(directory / f"{kind}_texts.bin", b"".join(encoded))
+    _save_array(directory / f"{kind}_offsets.npy", offsets)
+
+
+def _write_file(path: Path, data: str | bytes) -> None:
+    # Write beside the target and rename over it, so processes that already mapped the
+    # old file keep a consistent view.
+    temporary = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    temporary.write_bytes(data.encode("utf-8") if isinstance(data, str) else data)
+    os.replace(temporary, path)
+
+
+def _save_array(path: Path, values: np.ndarray) -> None:
+    temporary = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    with temporary.open("wb") as handle:
+        np.save(handle, values)
+    os.replace(temporary, path)
+
+
+def _describe_embedder(embedder: Embedder | None) -> dict[str, Any] | None:
+    if embedder is None:
+        return None
+    kind = "hashing" if isinstance(embedder, HashingEmbedder) else "custom"
+    return {"kind": kind, "dim": embedder.dim}
 
 
 def _normalize_document(doc: Mapping[str, Any] | SourceDocument) -> SourceDocument:
@@ -179,8 +2510,10 @@ def _normalize_document(doc: Mapping[str, Any] | SourceDocument) -> SourceDocume
     if content_fallback and not sections:
         sections = [SourceSection(heading="Full Document", content=content_fallback)]
 
+    document_id = doc.get("id")
     return SourceDocument(
         title=doc.get("title", "Untitled"),
+        id=str(document_id) if document_id is not None else None,
         year=doc.get("year"),
         citations=doc.get("citations"),
         authors=list(doc.get("authors", [])),
@@ -188,20 +2521,117 @@ def _normalize_document(doc: Mapping[str, Any] | SourceDocument) -> SourceDocume
     )
 
 
-def _split_text(text: str, chunk_size: int, chunk_overlap: int) -> list[str]:
-    words = text.split()
+def _validate_scoring(scoring: str) -> ScoringMode:
+    if scoring not in _SCORING_MODES:
+        raise ValueError(f"Unknown scoring mode: {scoring}")
+    return scoring  # type: ignore[return-value]
+
+
+def _validate_fusion(fusion: str, weight: float) -> FusionMode:
+    if fusion not in _FUSION_MODES:
+        raise ValueError(f"Unknown fusion mode: {fusion}")
+    if not 0 <= weight <= 1:
+        raise ValueError("fusion_weight must be in [0, 1]")
+    return fusion  # type: ignore[return-value]
+
+
+def _is_number(value: Any) -> TypeGuard[int | float]:
+    return isinstance(value, int | float) and not isinstance(value, bool)
+
+
+def _as_array(column: MutableSequence[Any] | np.ndarray, dtype: Any) -> np.ndarray:
+    # Zero-copy view over array.array buffers; callers must not keep it past the query.
+    if isinstance(column, np.ndarray) or len(column):
+        return np.asarray(column, dtype=dtype)
+    return np.empty(0, dtype=dtype)
+
+
+def _term_counts(text: str) -> tuple[int, Counter[str]]:
+    terms = _tokenize(text)
+    return len(terms), Counter(terms)
+
+
+def _filters_key(filters: Mapping[str, Any] | None) -> str:
+    return repr(sorted(filters.items())) if filters else ""
+
+
+def _heap_nbytes(column: Any) -> int:
+    if isinstance(column, np.memmap):
+        return 0
+    if isinstance(column, np.ndarray):
+        return int(column.nbytes)
+    if isinstance(column, array):
+        return column.itemsize * len(column)
+    return 0
+
+
+def _tokenize(text: str) -> list[str]:
+    return text.lower().split()
+
+
+def _split_spans(text: str, chunk_size: int, chunk_overlap: int) -> list[tuple[int, int]]:
+    """Character spans of overlapping ``chunk_size``-word windows over ``text``."""
+
+    words = [match.span() for match in _WORD.finditer(text)]
     if not words:
         return []
 
-    chunks: list[list[str]] = []
+    spans: list[tuple[int, int]] = []
     start = 0
     while start < len(words):
         end = start + chunk_size
-        chunks.append(words[start:end])
+        spans.append((words[start][0], words[min(end, len(words)) - 1][1]))
         start = end - chunk_overlap
         if start <= 0:
             start = end
-    return [" ".join(chunk) for chunk in chunks if chunk]
+    return spans
+
+
+def _inherited_metadata(parent_metadata: Mapping[str, Any], chunk_index: int) -> dict[str, Any]:
+    return {
+        "parent_id": parent_metadata["id"],
+        **{key: parent_metadata.get(key) for key in _INHERITED_METADATA},
+        "chunk_index": chunk_index,
+    }
+
+
+def _fuse_rankings(
+    lexical: Sequence[tuple[_Key, float]],
+    dense: Sequence[tuple[_Key, float]],
+    fusion: FusionMode,
+    weight: float,
+) -> list[tuple[_Key, float]]:
+    """Fuse two best-first ``(key, score)`` rankings into one.
+
+    "rrf" scores each key ``1 / (60 + rank)`` per list it appears in; "weighted"
+    min-max normalizes each list and mixes them as ``(1 - weight) * lexical +
+    weight * dense``. Ties keep lexical order, then dense order.
+    """
+
+    fused: dict[_Key, float] = {}
+    for ranking, share in ((lexical, 1 - weight), (dense, weight)):
+        if not ranking:
+            continue
+        if fusion == "rrf":
+            contributions = [1 / (_RRF_K + rank) for rank in range(1, len(ranking) + 1)]
+        else:
+            scores = [score for _, score in ranking]
+            low, spread = min(scores), max(scores) - min(scores)
+            contributions = [
+                share * ((score - low) / spread if spread else 1.0) for score in scores
+            ]
+        for (key, _), contribution in zip(ranking, contributions):
+            fused[key] = fused.get(key, 0.0) + contribution
+    return sorted(fused.items(), key=lambda pair: -pair[1])
+
+
+@cache
+def _hybrid_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(thread_name_prefix="hybrid-search")
+
+
+# Pool threads do not survive fork, so forked children (e.g. shard workers) start afresh.
+os.register_at_fork(after_in_child=_hybrid_executor.cache_clear)
 
 
 def _passes_filters(
@@ -233,12 +2663,37 @@ def _passes_filters(
 
 
 __all__ = [
+    "AnnRecallReport",
     "Chunk",
+    "ChildSpan",
+    "CorpusStats",
+    "FusionMode",
     "ParentChildVectorStore",
+    "ParentCombiner",
+    "ParentSearchResult",
+    "PassageMatch",
+    "ScoringMode",
+    "SearchCacheInfo",
     "SearchResult",
     "SourceDocument",
     "SourceSection",
+    "VectorStore",
+    "VectorStoreRegistry",
+    "ann_recall_report",
+    "append_documents",
+    "configure_vector_store_registry",
+    "file_vector_store_uri",
     "ingest_documents",
+    "open_vector_store",
+    "release_vector_store",
+    "remove_document",
+    "rerank_search",
+    "search_many",
+    "search_parents",
     "search_sections",
     "reset_vector_store_registry",
+    "restore_vector_store",
+    "snapshot_vector_store",
+    "verify_passage",
+    "vector_store_sizes",
 ]
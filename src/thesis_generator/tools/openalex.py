@@ -1,11 +1,34 @@
 from __future__ import annotations
 
-from collections.abc import Callable, Mapping, Sequence
-from typing import Any, cast
-
+import copy
+import math
+import queue
+import threading
+from collections import deque
+from collections.abc import Callable, Generator, Iterable, Iterator, Mapping, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import closing
+from functools import cache, partial
+from itertools import islice
+from typing import Any, TypeVar, cast
+
+import requests
 from pydantic import BaseModel, ConfigDict, Field
 
 from thesis_generator.config import load_settings
+from thesis_generator.tools.openalex_cache import (
+    CacheMode,
+    OpenAlexCache,
+    _validate_cache_mode,
+    work_key,
+)
+from thesis_generator.tools.openalex_snapshot import OpenAlexSnapshot
+from thesis_generator.tools.rate_limit import (
+    Priority,
+    TokenBucketScheduler,
+    retry_after_seconds,
+    shared_scheduler,
+)
 
 try:
     from langchain_core.tools import tool
@@ -44,6 +67,13 @@ DEFAULT_FIELDS: list[str] = [
     "cited_by_count",
     "referenced_works",
 ]
+# OpenAlex accepts at most this many values in one OR filter.
+MAX_OR_FILTER_VALUES = 100
+# Numbered pages only reach this far into a result set; beyond it OpenAlex needs a cursor.
+MAX_PAGED_RESULTS = 10_000
+OPENALEX_HOST = "api.openalex.org"
+_END_OF_PAGES = object()
+_T = TypeVar("_T")
 
 
 class OpenAlexPaper(BaseModel):
@@ -61,7 +91,17 @@ class OpenAlexPaper(BaseModel):
 
 
 class OpenAlexAPI:
-    """Lightweight wrapper around the OpenAlex API via pyalex."""
+    """Lightweight wrapper around the OpenAlex API via pyalex.
+
+    With a ``cache`` works and search results are served from SQLite while fresh.
+    ``cache_mode="cache_only"`` never touches the network (stale entries are served,
+    misses come back empty) and ``"refresh"`` always refetches and rewrites entries.
+    Every API request first waits on ``rate_limiter`` at ``priority``; it defaults to
+    the process-wide scheduler when querying OpenAlex through pyalex and to no
+    limiting for a supplied ``works_client``. A 429 pauses the host for its
+    ``Retry-After`` and is retried through the limiter up to ``max_retries`` times;
+    pyalex's own 429 retries are turned off so none bypass it.
+    """
 
     def __init__(
         self,
@@ -69,6 +109,11 @@ class OpenAlexAPI:
         mailto: str | None = None,
         works_client: Any | None = None,
         max_results_per_page: int = 100,
+        cache: OpenAlexCache | None = None,
+        cache_mode: CacheMode = "default",
+        rate_limiter: TokenBucketScheduler | None = None,
+        priority: Priority = "interactive",
+        max_retries: int = 2,
     ) -> None:
         if mailto and hasattr(openalex_config, "mailto"):
             openalex_config.mailto = mailto
@@ -76,9 +121,21 @@ class OpenAlexAPI:
             self.works = works_client
         elif Works is not None:
             self.works = Works()
+            if hasattr(openalex_config, "retry_http_codes"):
+                openalex_config.retry_http_codes = [
+                    code for code in openalex_config.retry_http_codes if code != 429
+                ]
         else:  # pragma: no cover - only when pyalex is absent
             raise RuntimeError("pyalex is not installed; provide a works_client.")
+        self._template = _detached(self.works)
         self.max_results_per_page = max(1, min(max_results_per_page, 200))
+        self.cache = cache
+        self.cache_mode = _validate_cache_mode(cache_mode)
+        if rate_limiter is None and works_client is None:
+            rate_limiter = shared_scheduler()
+        self.rate_limiter = rate_limiter
+        self.priority = priority
+        self.max_retries = max_retries
 
     def search_papers(
         self,
@@ -91,41 +148,313 @@ class OpenAlexAPI:
     ) -> list[OpenAlexPaper]:
         """Search works with pagination and optional year filter."""
 
-        request = self.works.search(query)
-        request = request.select(",".join(fields or DEFAULT_FIELDS))
+        selected = ",".join(fields or DEFAULT_FIELDS)
+        cache, key = self.cache, ""
+        if cache is not None:
+            key = cache.search_key(query, year_range, selected)
+            if self.cache_mode != "refresh":
+                cached = cache.get_search(key, limit, allow_stale=self.cache_mode == "cache_only")
+                if cached is not None:
+                    return [self._parse_work(item) for item in cached]
+            if self.cache_mode == "cache_only":
+                return []
+
+        request = self._new_request().search(query)
+        request = request.select(selected)
 
         if year_range:
             request = request.filter(publication_year=f"{year_range[0]}-{year_range[1]}")
 
         page_size = max(1, min(per_page, limit, self.max_results_per_page))
-        papers: list[OpenAlexPaper] = []
+        items: list[Mapping[str, Any]] = []
+        complete = True
 
-        for page in request.paginate(per_page=page_size):
+        for page in self._paced(request.paginate(per_page=page_size), page_size):
             if not page:
                 break
 
-            for item in page:
-                papers.append(self._parse_work(item))
-                if len(papers) >= limit:
-                    return papers
+            items.extend(page)
+            if len(items) >= limit:
+                complete = len(items) == limit and len(page) < page_size
+                break
 
-        return papers
+        items = items[:limit]
+        if cache is not None:
+            cache.put_search(key, selected, items, complete=complete)
+        return [self._parse_work(item) for item in items]
+
+    def iter_search_papers(
+        self,
+        query: str,
+        *,
+        year_range: tuple[int, int] | None = None,
+        limit: int | None = None,
+        per_page: int = 200,
+        prefetch: int = 4,
+        fields: Sequence[str] | None = None,
+    ) -> Iterator[OpenAlexPaper]:
+        """Stream search results while the following pages are still being fetched.
+
+        Up to ``prefetch`` pages are requested ahead of the consumer. Sweeps that fit
+        in :data:`MAX_PAGED_RESULTS` fetch numbered pages concurrently; larger or
+        unbounded (``limit=None``) sweeps follow the cursor on a background thread,
+        which overlaps each round trip with the caller's processing. Results keep
+        API order, bypass the cache, and stopping early cancels outstanding pages.
+        """
+
+        if prefetch < 1:
+            raise ValueError("prefetch must be a positive integer")
+        if limit is not None and limit <= 0:
+            return
+        selected = ",".join(fields or DEFAULT_FIELDS)
+        page_size = max(1, min(per_page, limit or per_page, self.max_results_per_page))
+
+        def build() -> Any:
+            request = self._new_request().search(query).select(selected)
+            if year_range:
+                request = request.filter(publication_year=f"{year_range[0]}-{year_range[1]}")
+            return request
+
+        if limit is not None and limit <= MAX_PAGED_RESULTS:
+            pages = self._numbered_pages(build, page_size, math.ceil(limit / page_size), prefetch)
+        else:
+            pages = self._cursor_pages(build, page_size, prefetch)
+        produced = 0
+        with closing(pages):
+            for page in pages:
+                for item in page:
+                    if limit is not None and produced >= limit:
+                        return
+                    produced += 1
+                    yield self._parse_work(item)
 
     def get_paper_details(
         self, work_id: str, *, fields: Sequence[str] | None = None
     ) -> OpenAlexPaper:
         """Fetch a single work with the requested fields."""
 
-        request = self.works.filter(openalex_id=work_id).select(
-            ",".join(fields or DEFAULT_FIELDS)
-        )
-        results = request.get(per_page=1)
+        selected = ",".join(fields or DEFAULT_FIELDS)
+        cache = self.cache
+        if cache is not None and self.cache_mode != "refresh":
+            cached = cache.get_work(work_id, selected, allow_stale=self.cache_mode == "cache_only")
+            if cached is not None:
+                return self._parse_work(cached)
+            if self.cache_mode == "cache_only":
+                raise RuntimeError(f"OpenAlex work not cached: {work_id}")
+
+        request = self._new_request().filter(openalex_id=work_id).select(selected)
+        results = self._request(lambda: request.get(per_page=1))
 
         if not results:
             raise RuntimeError(f"OpenAlex work not found: {work_id}")
 
+        if cache is not None:
+            cache.put_work(work_id, selected, results[0])
         return self._parse_work(results[0])
 
+    def get_papers_bulk(
+        self,
+        work_ids: Sequence[str],
+        *,
+        fields: Sequence[str] | None = None,
+        batch_size: int = MAX_OR_FILTER_VALUES,
+        max_workers: int = 4,
+    ) -> list[OpenAlexPaper | None]:
+        """Fetch many works by id, ``batch_size`` ids per OR-filter request.
+
+        At most ``max_workers`` requests are in flight. Results follow ``work_ids``
+        order with ``None`` for works OpenAlex did not return; repeated ids are
+        fetched once. With a cache, cached works are served first and fetched ones
+        stored.
+        """
+
+        if not 1 <= batch_size <= MAX_OR_FILTER_VALUES:
+            raise ValueError(f"batch_size must be between 1 and {MAX_OR_FILTER_VALUES}")
+        selected = ",".join(fields or DEFAULT_FIELDS)
+        keys = [work_key(work_id) for work_id in work_ids]
+        found: dict[str, Mapping[str, Any]] = {}
+        pending = list(dict.fromkeys(keys))
+        cache = self.cache
+        if cache is not None and self.cache_mode != "refresh":
+            for key in pending:
+                cached = cache.get_work(key, selected, allow_stale=self.cache_mode == "cache_only")
+                if cached is not None:
+                    found[key] = cached
+            if self.cache_mode == "cache_only":
+                pending = []
+            else:
+                pending = [key for key in pending if key not in found]
+
+        def fetch(batch: list[str]) -> list[Mapping[str, Any]]:
+            request = self._new_request().filter(openalex_id="|".join(batch)).select(selected)
+            return list(self._request(lambda: request.get(per_page=len(batch))) or [])
+
+        batches = [
+            pending[start : start + batch_size] for start in range(0, len(pending), batch_size)
+        ]
+        if batches:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(batches)))) as pool:
+                for works in pool.map(fetch, batches):
+                    for work in works:
+                        key = work_key(work.get("id") or "")
+                        found[key] = work
+                        if cache is not None:
+                            cache.put_work(key, selected, work)
+        return [self._parse_work(found[key]) if key in found else None for key in keys]
+
+    def get_citing_papers(
+        self,
+        work_ids: Sequence[str],
+        *,
+        limit: int = 200,
+        fields: Sequence[str] | None = None,
+        batch_size: int = MAX_OR_FILTER_VALUES,
+        max_workers: int = 4,
+    ) -> list[OpenAlexPaper]:
+        """Up to ``limit`` works citing any of ``work_ids``, most cited first.
+
+        Ids are sent ``batch_size`` per ``cites`` OR-filter request with at most
+        ``max_workers`` in flight; each batch follows the cursor until it has its
+        ``limit`` most cited citers and the merged list is deduplicated. Not
+        cached; ``cache_only`` mode returns no citers.
+        """
+
+        if not 1 <= batch_size <= MAX_OR_FILTER_VALUES:
+            raise ValueError(f"batch_size must be between 1 and {MAX_OR_FILTER_VALUES}")
+        pending = list(dict.fromkeys(work_key(work_id) for work_id in work_ids))
+        if limit <= 0 or not pending or self.cache_mode == "cache_only":
+            return []
+        selected = ",".join(fields or DEFAULT_FIELDS)
+        per_page = min(limit, 200)
+
+        def fetch(batch: list[str]) -> list[Mapping[str, Any]]:
+            request = self._new_request().filter(cites="|".join(batch)).select(selected)
+            request = request.sort(cited_by_count="desc")
+            works: list[Mapping[str, Any]] = []
+            cursor: str | None = "*"
+            while cursor and len(works) < limit:
+                page = self._request(partial(request.get, per_page=per_page, cursor=cursor))
+                works.extend(page or [])
+                cursor = (getattr(page, "meta", None) or {}).get("next_cursor") if page else None
+            return works
+
+        batches = [
+            pending[start : start + batch_size] for start in range(0, len(pending), batch_size)
+        ]
+        found: dict[str, Mapping[str, Any]] = {}
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(batches)))) as pool:
+            for works in pool.map(fetch, batches):
+                for work in works:
+                    found.setdefault(work_key(work.get("id") or ""), work)
+        ranked = sorted(found.values(), key=lambda work: -(work.get("cited_by_count") or 0))
+        return [self._parse_work(work) for work in ranked[:limit]]
+
+    def _numbered_pages(
+        self, build: Callable[[], Any], page_size: int, count: int, prefetch: int
+    ) -> Generator[list[Mapping[str, Any]], None, None]:
+        """Pages ``1..count`` in order, with up to ``prefetch`` requests in flight."""
+
+        def fetch(number: int) -> list[Mapping[str, Any]]:
+            request = build()
+            return list(self._request(lambda: request.get(per_page=page_size, page=number)) or [])
+
+        pool = ThreadPoolExecutor(max_workers=min(prefetch, count))
+        in_flight: deque[Future[list[Mapping[str, Any]]]] = deque()
+        numbers = iter(range(1, count + 1))
+        try:
+            in_flight.extend(pool.submit(fetch, number) for number in islice(numbers, prefetch))
+            while in_flight:
+                page = in_flight.popleft().result()
+                # Keep the pool busy while the consumer works through this page.
+                in_flight.extend(pool.submit(fetch, number) for number in islice(numbers, 1))
+                yield page
+                if len(page) < page_size:
+                    return
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _cursor_pages(
+        self, build: Callable[[], Any], page_size: int, prefetch: int
+    ) -> Generator[list[Mapping[str, Any]], None, None]:
+        """Cursor pages fetched by a background thread into a queue of ``prefetch`` pages."""
+
+        pages: queue.Queue[Any] = queue.Queue(maxsize=prefetch)
+        stop = threading.Event()
+
+        def put(item: Any) -> bool:
+            while not stop.is_set():
+                try:
+                    pages.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce() -> None:
+            try:
+                request = build()
+                cursor: str | None = "*"
+                while cursor:
+                    page = self._request(partial(request.get, per_page=page_size, cursor=cursor))
+                    cursor = (getattr(page, "meta", None) or {}).get("next_cursor")
+                    if not page or not put(list(page)):
+                        break
+                put(_END_OF_PAGES)
+            except Exception as exc:  # noqa: BLE001 - re-raised in the consumer
+                put(exc)
+
+        threading.Thread(target=produce, name="openalex-cursor", daemon=True).start()
+        try:
+            while (page := pages.get()) is not _END_OF_PAGES:
+                if isinstance(page, Exception):
+                    raise page
+                yield page
+        finally:
+            stop.set()
+
+    def _request(self, call: Callable[[], _T]) -> _T:
+        """Run one API request in a rate-limiter slot, retrying 429s after penalizing."""
+
+        for attempt in range(self.max_retries + 1):
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(OPENALEX_HOST, priority=self.priority)
+            try:
+                return call()
+            except requests.HTTPError as exc:
+                if exc.response is None or exc.response.status_code != 429:
+                    raise
+                if self.rate_limiter is None or attempt == self.max_retries:
+                    raise
+                self.rate_limiter.penalize(OPENALEX_HOST, retry_after_seconds(exc.response))
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    def _paced(self, pages: Iterable[Any], page_size: int) -> Iterator[Any]:
+        """Iterate a pyalex paginator, taking a request slot for each page it fetches.
+
+        A short page is the last one, so iteration stops there instead of spending a
+        slot on the paginator's request-free final step. A failed page leaves the
+        paginator where it was, so 429s retry the same page.
+        """
+
+        iterator = iter(pages)
+        while True:
+            try:
+                page = self._request(lambda: next(iterator))
+            except StopIteration:
+                return
+            yield page
+            if len(page) < page_size:
+                return
+
+    def _new_request(self) -> Any:
+        """A fresh works client, as it was when this API was created, to build one request on.
+
+        pyalex query builders mutate themselves, so neither concurrent nor successive
+        requests can share one: earlier searches and filters would carry over.
+        """
+
+        return _detached(self._template)
+
     @staticmethod
     def _parse_work(work: Mapping[str, Any]) -> OpenAlexPaper:
         authorships = work.get("authorships") or []
@@ -156,6 +485,35 @@ class OpenAlexAPI:
         return OpenAlexPaper(**normalized)
 
 
+def _detached(works: Any) -> Any:
+    """A copy of ``works`` whose query parameters are no longer shared with it."""
+
+    request = copy.copy(works)
+    if hasattr(request, "params"):
+        request.params = copy.deepcopy(request.params)
+    return request
+
+
+def _default_api() -> OpenAlexAPI:
+    settings = load_settings()
+    cache, works = _shared_backends(settings.openalex_cache_path, settings.openalex_snapshot_path)
+    return OpenAlexAPI(mailto=settings.openalex_mailto, works_client=works, cache=cache)
+
+
+@cache
+def _shared_backends(
+    cache_path: str | None, snapshot_path: str | None
+) -> tuple[OpenAlexCache | None, OpenAlexSnapshot | None]:
+    """The response cache and snapshot for a configuration, opened once per process.
+
+    Both are thread-safe; the API wrapper itself stays per call because pyalex query
+    builders mutate themselves.
+    """
+
+    cache = OpenAlexCache(cache_path) if cache_path else None
+    return cache, OpenAlexSnapshot(snapshot_path) if snapshot_path else None
+
+
 def _parse_year_range(value: str | None) -> tuple[int, int] | None:
     if not value:
         return None
@@ -171,8 +529,7 @@ def openalex_search(
 ) -> list[dict[str, Any]]:
     """Search OpenAlex for works matching a query."""
 
-    settings = load_settings()
-    api = OpenAlexAPI(mailto=settings.openalex_mailto)
+    api = _default_api()
     parsed_years = _parse_year_range(year_range)
     papers = api.search_papers(query, year_range=parsed_years, limit=limit)
     return [paper.model_dump() for paper in papers]
@@ -182,8 +539,7 @@ def openalex_search(
 def openalex_get_paper(work_id: str) -> dict[str, Any]:
     """Fetch a single OpenAlex work by ID (or DOI)."""
 
-    settings = load_settings()
-    api = OpenAlexAPI(mailto=settings.openalex_mailto)
+    api = _default_api()
     paper = api.get_paper_details(work_id)
     return paper.model_dump()
 
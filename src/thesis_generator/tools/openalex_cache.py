@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Literal
+
+CacheMode = Literal["default", "cache_only", "refresh"]
+_CACHE_MODES: tuple[str, ...] = ("default", "cache_only", "refresh")
+_OPENALEX_PREFIX = "https://openalex.org/"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS works (
+    work_id TEXT NOT NULL,
+    fields TEXT NOT NULL,
+    payload BLOB NOT NULL,
+    digest BLOB NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (work_id, fields)
+);
+CREATE TABLE IF NOT EXISTS searches (
+    search_key TEXT PRIMARY KEY,
+    fields TEXT NOT NULL,
+    work_ids TEXT NOT NULL,
+    complete INTEGER NOT NULL,
+    fetched_at REAL NOT NULL
+);
+"""
+
+
+@dataclass(frozen=True)
+class OpenAlexCacheInfo:
+    """Counters for an :class:`OpenAlexCache` since it was opened."""
+
+    hits: int
+    misses: int
+    stale: int
+    revalidated: int
+    bytes_saved: int
+    works: int
+    searches: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def work_key(work_id: str) -> str:
+    """Normalize an OpenAlex id (``W123`` or ``https://openalex.org/W123``) for lookups."""
+
+    return work_id[len(_OPENALEX_PREFIX) :] if work_id.startswith(_OPENALEX_PREFIX) else work_id
+
+
+class OpenAlexCache:
+    """SQLite cache of OpenAlex works and search result pages.
+
+    Works are stored once per ``(id, selected fields)`` and shared by every search
+    that returned them; a search entry only keeps the ordered work ids, so a cached
+    sweep with a larger ``limit`` also answers smaller ones. Entries older than
+    ``work_ttl``/``search_ttl`` seconds (``None`` never expires) are stale: they are
+    refetched, and a refetch that returns identical content only renews the
+    timestamp (counted as ``revalidated``). ``path=":memory:"`` keeps the cache
+    per process; a file path shares it between runs.
+    """
+
+    def __init__(
+        self,
+        path: str | Path = ":memory:",
+        *,
+        work_ttl: float | None = 7 * 86400,
+        search_ttl: float | None = 86400,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = str(path)
+        self.work_ttl = work_ttl
+        self.search_ttl = search_ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.executescript(_SCHEMA)
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.revalidated = 0
+        self.bytes_saved = 0
+
+    @staticmethod
+    def search_key(query: str, year_range: tuple[int, int] | None, fields: str) -> str:
+        raw = json.dumps([query.strip().lower(), year_range, fields])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get_work(
+        self, work_id: str, fields: str, *, allow_stale: bool = False
+    ) -> dict[str, Any] | None:
+        """Cached work payload, or ``None`` on a miss (or a stale entry unless allowed)."""
+
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT payload, fetched_at FROM works WHERE work_id = ? AND fields = ?",
+                (work_key(work_id), fields),
+            ).fetchone()
+            if row is None or not self._fresh(row[1], self.work_ttl, allow_stale):
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.bytes_saved += len(row[0])
+            return json.loads(row[0])
+
+    def put_work(self, work_id: str, fields: str, work: Mapping[str, Any]) -> None:
+        """Store ``work`` under ``work_id`` and under its own ``id`` if that differs."""
+
+        with self._lock, self._connection:
+            self._store_work(work_id, fields, work)
+
+    def get_search(
+        self, key: str, limit: int, *, allow_stale: bool = False
+    ) -> list[dict[str, Any]] | None:
+        """Up to ``limit`` cached works for a search, or ``None`` if it is not covered."""
+
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT fields, work_ids, complete, fetched_at FROM searches WHERE search_key = ?",
+                (key,),
+            ).fetchone()
+            if row is None or not self._fresh(row[3], self.search_ttl, allow_stale):
+                self.misses += 1
+                return None
+            fields, work_ids, complete = row[0], json.loads(row[1]), bool(row[2])
+            if len(work_ids) < limit and not complete:
+                self.misses += 1
+                return None
+            works = []
+            for work_id in work_ids[:limit]:
+                found = self._connection.execute(
+                    "SELECT payload FROM works WHERE work_id = ? AND fields = ?",
+                    (work_id, fields),
+                ).fetchone()
+                if found is None:
+                    self.misses += 1
+                    return None
+                works.append(found[0])
+            self.hits += 1
+            self.bytes_saved += sum(len(payload) for payload in works)
+            return [json.loads(payload) for payload in works]
+
+    def put_search(
+        self, key: str, fields: str, works: Sequence[Mapping[str, Any]], *, complete: bool
+    ) -> None:
+        """Record a search's ordered results; ``complete`` marks an exhausted result set."""
+
+        with self._lock, self._connection:
+            work_ids = [self._store_work(work.get("id") or "", fields, work) for work in works]
+            self._connection.execute(
+                "INSERT OR REPLACE INTO searches VALUES (?, ?, ?, ?, ?)",
+                (key, fields, json.dumps(work_ids), int(complete), self._clock()),
+            )
+
+    def info(self) -> OpenAlexCacheInfo:
+        with self._lock:
+            (works,) = self._connection.execute("SELECT COUNT(*) FROM works").fetchone()
+            (searches,) = self._connection.execute("SELECT COUNT(*) FROM searches").fetchone()
+        return OpenAlexCacheInfo(
+            self.hits,
+            self.misses,
+            self.stale,
+            self.revalidated,
+            self.bytes_saved,
+            works,
+            searches,
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def _fresh(self, fetched_at: float, ttl: float | None, allow_stale: bool) -> bool:
+        if ttl is None or self._clock() - fetched_at <= ttl:
+            return True
+        self.stale += 1
+        return allow_stale
+
+    def _store_work(self, work_id: str, fields: str, work: Mapping[str, Any]) -> str:
+        payload = json.dumps(work, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        digest = hashlib.sha256(payload).digest()
+        now = self._clock()
+        keys = dict.fromkeys([work_key(work.get("id") or work_id), work_key(work_id)])
+        for key in keys:
+            renewed = self._connection.execute(
+                "UPDATE works SET fetched_at = ? WHERE work_id = ? AND fields = ? AND digest = ?",
+                (now, key, fields, digest),
+            )
+            if renewed.rowcount:
+                self.revalidated += 1
+                continue
+            self._connection.execute(
+                "INSERT OR REPLACE INTO works VALUES (?, ?, ?, ?, ?)",
+                (key, fields, payload, digest, now),
+            )
+        return next(iter(keys))
+
+
+def _validate_cache_mode(mode: str) -> CacheMode:
+    if mode not in _CACHE_MODES:
+        raise ValueError(f"Unknown cache mode: {mode}")
+    return mode  # type: ignore[return-value]
+
+
+__all__ = ["CacheMode", "OpenAlexCache", "OpenAlexCacheInfo", "work_key"]
@@ -0,0 +1,342 @@
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import re
+import sqlite3
+import threading
+import uuid
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import IO, Any
+
+from thesis_generator.tools.openalex_cache import work_key
+
+_INDEX_VERSION = 1
+_DEFAULT_PER_PAGE = 25
+_SNAPSHOT_WORD = re.compile(r"\w+")
+_YEAR_RANGE = re.compile(r"^(\d{4})?-(\d{4})?$")
+_SORTABLE = {"cited_by_count", "publication_year"}
+
+_SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE works (
+    work_id TEXT NOT NULL UNIQUE,
+    publication_year INTEGER,
+    cited_by_count INTEGER,
+    payload TEXT NOT NULL
+);
+CREATE INDEX works_year ON works (publication_year);
+CREATE TABLE refs (citing INTEGER NOT NULL, cited TEXT NOT NULL);
+CREATE INDEX refs_cited ON refs (cited);
+CREATE VIRTUAL TABLE works_text USING fts5(
+    title, abstract, content='', tokenize='porter unicode61'
+);
+"""
+
+
+class SnapshotPage(list[dict[str, Any]]):
+    """One page of snapshot results; ``meta`` mirrors the OpenAlex response meta."""
+
+    meta: dict[str, Any]
+
+
+class OpenAlexSnapshot:
+    """Local OpenAlex works dump (JSONL, optionally gzipped) usable as a ``works_client``.
+
+    The first open builds a SQLite index next to the dump (``<path>.index.sqlite``
+    unless ``index_path`` is given): works by id, publication year and citation
+    count, a referenced-works table for ``cites`` filters, and an FTS5 index over
+    titles and abstracts. Later opens reuse it until the dump's size or mtime
+    changes; a rebuild is written to a temporary file and renamed into place, so
+    concurrent openers never see a partial index. Queries follow the pyalex builder
+    interface that :class:`OpenAlexAPI` uses (``search``/``filter``/``select``/
+    ``sort``/``get``/``paginate``) and each step returns a new query, so one
+    snapshot can be shared between threads.
+    """
+
+    def __init__(self, path: str | Path, *, index_path: str | Path | None = None) -> None:
+        self.path = Path(path)
+        if not self.path.is_file():
+            raise ValueError(f"OpenAlex snapshot not found: {self.path}")
+        self.index_path = Path(index_path or f"{self.path}.index.sqlite")
+        self._lock = threading.Lock()
+        stat = self.path.stat()
+        self._signature = json.dumps([_INDEX_VERSION, stat.st_size, stat.st_mtime_ns])
+        self._connection = sqlite3.connect(self.index_path, check_same_thread=False)
+        self.built = self._stored_signature() != self._signature
+        if self.built:
+            self._connection.close()
+            self._build()
+            self._connection = sqlite3.connect(self.index_path, check_same_thread=False)
+
+    def __len__(self) -> int:
+        return int(self._query("SELECT COUNT(*) FROM works", ())[0][0])
+
+    def search(self, text: str) -> SnapshotQuery:
+        return SnapshotQuery(self).search(text)
+
+    def filter(self, **filters: Any) -> SnapshotQuery:
+        return SnapshotQuery(self).filter(**filters)
+
+    def select(self, fields: str | list[str]) -> SnapshotQuery:
+        return SnapshotQuery(self).select(fields)
+
+    def sort(self, **keys: str) -> SnapshotQuery:
+        return SnapshotQuery(self).sort(**keys)
+
+    def get(self, **kwargs: Any) -> SnapshotPage:
+        return SnapshotQuery(self).get(**kwargs)
+
+    def paginate(self, **kwargs: Any) -> Iterator[SnapshotPage]:
+        return SnapshotQuery(self).paginate(**kwargs)
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def _query(self, sql: str, params: tuple[Any, ...]) -> list[tuple[Any, ...]]:
+        with self._lock:
+            return self._connection.execute(sql, params).fetchall()
+
+    def _stored_signature(self) -> str | None:
+        try:
+            row = self._query("SELECT value FROM meta WHERE key = 'signature'", ())
+        except sqlite3.OperationalError:
+            return None
+        return row[0][0] if row else None
+
+    def _build(self) -> None:
+        # Build beside the index and rename over it: readers keep the file they opened
+        # and concurrent builders each replace it with a complete index.
+        temporary = self.index_path.with_name(f".{self.index_path.name}.{uuid.uuid4().hex}.tmp")
+        connection = sqlite3.connect(temporary)
+        try:
+            with connection:
+                connection.executescript(_SCHEMA)
+                with _open_text(self.path) as lines:
+                    for number, line in enumerate(lines, 1):
+                        if line.strip():
+                            self._index_work(connection, json.loads(line), number)
+                connection.execute("INSERT INTO meta VALUES ('signature', ?)", (self._signature,))
+            connection.close()
+            os.replace(temporary, self.index_path)
+        finally:
+            connection.close()
+            temporary.unlink(missing_ok=True)
+
+    def _index_work(
+        self, connection: sqlite3.Connection, work: Mapping[str, Any], line: int
+    ) -> None:
+        work_id = work_key(work.get("id") or "")
+        if not work_id:
+            raise ValueError(f"{self.path}:{line}: work without an id")
+        cursor = connection.execute(
+            "INSERT OR REPLACE INTO works (work_id, publication_year, cited_by_count, payload)"
+            " VALUES (?, ?, ?, ?)",
+            (
+                work_id,
+                work.get("publication_year"),
+                work.get("cited_by_count"),
+                json.dumps(work, ensure_ascii=False),
+            ),
+        )
+        index = work.get("abstract_inverted_index") or {}
+        abstract = " ".join(
+            word
+            for _, word in sorted((pos, word) for word, found in index.items() for pos in found)
+        )
+        connection.execute(
+            "INSERT INTO works_text (rowid, title, abstract) VALUES (?, ?, ?)",
+            (cursor.lastrowid, work.get("display_name") or work.get("title") or "", abstract),
+        )
+        connection.executemany(
+            "INSERT INTO refs VALUES (?, ?)",
+            [(cursor.lastrowid, work_key(ref)) for ref in work.get("referenced_works") or []],
+        )
+
+
+@dataclass(frozen=True)
+class SnapshotQuery:
+    """An immutable query against an :class:`OpenAlexSnapshot`."""
+
+    snapshot: OpenAlexSnapshot
+    text: str | None = None
+    filters: dict[str, Any] = field(default_factory=dict)
+    fields: tuple[str, ...] | None = None
+    order: tuple[tuple[str, str], ...] = ()
+
+    def search(self, text: str) -> SnapshotQuery:
+        return replace(self, text=text)
+
+    def filter(self, **filters: Any) -> SnapshotQuery:
+        unsupported = set(filters) - {"publication_year", "openalex_id", "cites"}
+        if unsupported:
+            raise ValueError(f"Unsupported snapshot filter: {', '.join(sorted(unsupported))}")
+        return replace(self, filters={**self.filters, **filters})
+
+    def select(self, fields: str | list[str]) -> SnapshotQuery:
+        names = fields.split(",") if isinstance(fields, str) else fields
+        # Nested selections such as ``authorships.author.display_name`` keep the root field.
+        return replace(self, fields=tuple(dict.fromkeys(name.split(".")[0] for name in names)))
+
+    def sort(self, **keys: str) -> SnapshotQuery:
+        for key, direction in keys.items():
+            if key not in _SORTABLE or direction not in ("asc", "desc"):
+                raise ValueError(f"Unsupported snapshot sort: {key}={direction}")
+        return replace(self, order=self.order + tuple(keys.items()))
+
+    def get(
+        self, per_page: int | None = None, page: int | None = None, cursor: str | None = None
+    ) -> SnapshotPage:
+        """One page by number (from 1) or by cursor (``"*"`` starts), like the API.
+
+        Cursors are keyset positions (the sort key of the page's last work), so deep
+        cursor scans seek instead of skipping over every earlier row.
+        """
+
+        size = per_page or _DEFAULT_PER_PAGE
+        if not 1 <= size <= 200:
+            raise ValueError("per_page should be an integer between 1 and 200")
+        if cursor is not None:
+            sql, params = self._sql(None if cursor == "*" else json.loads(cursor))
+            rows = self.snapshot._query(f"{sql} LIMIT ?", (*params, size + 1))
+        else:
+            sql, params = self._sql()
+            offset = ((page or 1) - 1) * size
+            rows = self.snapshot._query(f"{sql} LIMIT ? OFFSET ?", (*params, size + 1, offset))
+        result = SnapshotPage(self._project(json.loads(row[0])) for row in rows[:size])
+        more = len(rows) > size
+        result.meta = {
+            "page": None if cursor is not None else page or 1,
+            "per_page": size,
+            "next_cursor": json.dumps(list(rows[size - 1][1:])) if more else None,
+        }
+        return result
+
+    def paginate(
+        self,
+        method: str = "cursor",
+        page: int = 1,
+        per_page: int | None = None,
+        cursor: str = "*",
+        n_max: int | None = 10000,
+    ) -> Iterator[SnapshotPage]:
+        if method not in ("cursor", "page"):
+            raise ValueError("Method should be 'cursor' or 'page'")
+        seen = 0
+        while not n_max or seen < n_max:
+            if method == "cursor":
+                result = self.get(per_page=per_page, cursor=cursor)
+            else:
+                result = self.get(per_page=per_page, page=page)
+                page += 1
+            seen += len(result)
+            yield result
+            if result.meta["next_cursor"] is None:
+                return
+            cursor = result.meta["next_cursor"]
+
+    def _sql(self, after: list[Any] | None = None) -> tuple[str, tuple[Any, ...]]:
+        """The query's SQL, selecting each payload followed by its sort key values.
+
+        ``after`` is a previous row's sort key; only rows ordered after it match.
+        """
+
+        clauses: list[str] = []
+        params: list[Any] = []
+        tables = "works"
+        terms = _SNAPSHOT_WORD.findall((self.text or "").lower())
+        if terms:
+            tables = "works JOIN works_text ON works_text.rowid = works.rowid"
+            clauses.append("works_text MATCH ?")
+            params.append(" OR ".join(f'"{term}"' for term in terms))
+        for key, value in self.filters.items():
+            if key == "publication_year":
+                clause, bounds = _year_clause(value)
+                clauses.append(clause)
+                params.extend(bounds)
+            else:
+                ids = [work_key(item) for item in str(value).split("|")]
+                marks = ", ".join("?" * len(ids))
+                if key == "openalex_id":
+                    clauses.append(f"works.work_id IN ({marks})")
+                else:
+                    clauses.append(
+                        f"works.rowid IN (SELECT citing FROM refs WHERE cited IN ({marks}))"
+                    )
+                params.extend(ids)
+        order = [(f"works.{key}", direction.upper()) for key, direction in self.order]
+        if terms and not order:
+            order.append(("bm25(works_text)", "ASC"))
+        order.append(("works.rowid", "ASC"))
+        if after is not None:
+            clause, bounds = _after_clause(order, after)
+            clauses.append(clause)
+            params.extend(bounds)
+        keys = ", ".join(expression for expression, _ in order)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        ordering = ", ".join(f"{expression} {direction}" for expression, direction in order)
+        sql = f"SELECT works.payload, {keys} FROM {tables}{where} ORDER BY {ordering}"
+        return sql, tuple(params)
+
+    def _project(self, work: dict[str, Any]) -> dict[str, Any]:
+        if self.fields is None:
+            return work
+        return {name: work[name] for name in self.fields if name in work}
+
+
+def _year_clause(value: Any) -> tuple[str, tuple[int, ...]]:
+    text = str(value).strip()
+    if text.isdigit():
+        return "works.publication_year = ?", (int(text),)
+    if text[:1] in "<>" and text[1:].isdigit():
+        return f"works.publication_year {text[0]} ?", (int(text[1:]),)
+    match = _YEAR_RANGE.match(text)
+    if not match or not any(match.groups()):
+        raise ValueError(f"Unsupported publication_year filter: {value}")
+    start, end = match.groups()
+    return (
+        "works.publication_year BETWEEN ? AND ?",
+        (int(start or 0), int(end or 9999)),
+    )
+
+
+def _after_clause(
+    order: list[tuple[str, str]], values: list[Any]
+) -> tuple[str, tuple[Any, ...]]:
+    """Rows that sort after ``values`` under ``order``; SQLite puts NULLs first ascending."""
+
+    if len(values) != len(order):
+        raise ValueError("Cursor does not belong to this query")
+    alternatives: list[str] = []
+    params: list[Any] = []
+    for position, ((expression, direction), value) in enumerate(zip(order, values)):
+        terms = [f"{earlier} IS ?" for earlier, _ in order[:position]]
+        bounds = list(values[:position])
+        if value is None:
+            if direction == "DESC":
+                continue  # NULLs sort last descending, so nothing follows on this key
+            terms.append(f"{expression} IS NOT NULL")
+        elif direction == "ASC":
+            terms.append(f"{expression} > ?")
+            bounds.append(value)
+        else:
+            terms.append(f"({expression} < ? OR {expression} IS NULL)")
+            bounds.append(value)
+        alternatives.append(" AND ".join(terms))
+        params.extend(bounds)
+    if not alternatives:
+        return "0", ()
+    return f"({' OR '.join(f'({term})' for term in alternatives)})", tuple(params)
+
+
+def _open_text(path: Path) -> IO[str]:
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8")
+    return path.open(encoding="utf-8")
+
+
+__all__ = ["OpenAlexSnapshot", "SnapshotPage", "SnapshotQuery"]
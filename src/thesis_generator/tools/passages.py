@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import re
+from array import array
+from collections import defaultdict
+from collections.abc import Iterable
+
+import numpy as np
+
+_PASSAGE_WORD = re.compile(r"\w+")
+
+
+class ShingleIndex:
+    """Positional index of word ``shingle_size``-grams over an append-only list of texts.
+
+    Every shingle is stored as ``(hash, word id)``; word ids are global positions that
+    map back to a text row and character offsets. Lookups binary-search the sorted
+    hashes, so matching a sentence costs a few ``searchsorted`` calls plus work
+    proportional to the hits rather than to the corpus.
+    """
+
+    def __init__(self, shingle_size: int = 5) -> None:
+        if shingle_size <= 0:
+            raise ValueError("shingle_size must be positive")
+        self.shingle_size = shingle_size
+        self._row_offsets = array("q", [0])
+        self._word_starts = array("q")
+        self._word_ends = array("q")
+        self._keys = array("q")
+        self._word_ids = array("q")
+        self._sorted: tuple[np.ndarray, np.ndarray, np.ndarray] | None = None
+
+    def __len__(self) -> int:
+        return len(self._row_offsets) - 1
+
+    def extend(self, texts: Iterable[str]) -> None:
+        """Index ``texts`` as the next rows."""
+
+        size = self.shingle_size
+        for text in texts:
+            base = len(self._word_starts)
+            words = []
+            for match in _PASSAGE_WORD.finditer(text):
+                words.append(match.group().lower())
+                self._word_starts.append(match.start())
+                self._word_ends.append(match.end())
+            for position in range(len(words) - size + 1):
+                self._keys.append(hash(" ".join(words[position : position + size])))
+                self._word_ids.append(base + position)
+            self._row_offsets.append(len(self._word_starts))
+        self._sorted = None
+
+    def match(self, passage: str, *, max_shift: int = 3) -> list[tuple[int, int, int, float]]:
+        """Return ``(row, start, end, overlap)`` for each row sharing shingles with ``passage``.
+
+        ``overlap`` is the fraction of the passage's shingles found in the row along
+        one alignment (allowing ``max_shift`` words of insertions or deletions);
+        ``start``/``end`` are the character offsets of that aligned region. Results
+        are ordered by overlap, then row.
+        """
+
+        words = [word.lower() for word in _PASSAGE_WORD.findall(passage)]
+        size = self.shingle_size
+        count = len(words) - size + 1
+        if count <= 0 or not len(self._keys):
+            return []
+        keys, word_ids, offsets = self._sorted_shingles()
+        query = np.array(
+            [hash(" ".join(words[position : position + size])) for position in range(count)],
+            dtype=np.int64,
+        )
+        lows = np.searchsorted(keys, query, side="left")
+        highs = np.searchsorted(keys, query, side="right")
+
+        hits: defaultdict[int, list[tuple[int, int]]] = defaultdict(list)
+        for position, (low, high) in enumerate(zip(lows.tolist(), highs.tolist())):
+            if low == high:
+                continue
+            found = word_ids[low:high]
+            rows = np.searchsorted(offsets, found, side="right") - 1
+            for row, word_id in zip(rows.tolist(), found.tolist()):
+                hits[row].append((word_id, position))
+
+        matches = []
+        for row, pairs in hits.items():
+            shifts = defaultdict(set)
+            for word_id, position in pairs:
+                shifts[word_id - position].add(position)
+            best = max(shifts, key=lambda shift: (len(shifts[shift]), -shift))
+            aligned = [
+                (word_id, position)
+                for word_id, position in pairs
+                if abs(word_id - position - best) <= max_shift
+            ]
+            covered = {position for _, position in aligned}
+            first = min(word_id for word_id, _ in aligned)
+            last = max(word_id for word_id, _ in aligned) + size - 1
+            matches.append(
+                (row, self._word_starts[first], self._word_ends[last], len(covered) / count)
+            )
+        matches.sort(key=lambda match: (-match[3], match[0]))
+        return matches
+
+    def _sorted_shingles(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        if self._sorted is None:
+            keys = np.asarray(self._keys, dtype=np.int64)
+            order = np.argsort(keys, kind="stable")
+            word_ids = np.asarray(self._word_ids, dtype=np.int64)[order]
+            self._sorted = (keys[order], word_ids, np.asarray(self._row_offsets, dtype=np.int64))
+        return self._sorted
+
+
+__all__ = ["ShingleIndex"]
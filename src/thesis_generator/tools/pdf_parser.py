@@ -6,10 +6,15 @@ from pathlib import Path
 import requests
 
 from thesis_generator.security import mask_pii
+from thesis_generator.tools.rate_limit import retry_after_seconds, shared_scheduler
 
 
 def _download_pdf(url: str) -> bytes:
+    scheduler = shared_scheduler()
+    scheduler.acquire(url, priority="batch")
     response = requests.get(url, timeout=15)
+    if response.status_code == 429:
+        scheduler.penalize(url, retry_after_seconds(response))
     response.raise_for_status()
     return response.content
 
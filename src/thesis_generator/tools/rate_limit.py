@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from functools import cache
+from typing import Any, Literal
+from urllib.parse import urlsplit
+
+Priority = Literal["interactive", "batch"]
+_PRIORITY_RANK: dict[str, int] = {"interactive": 0, "batch": 1}
+
+
+@dataclass(frozen=True)
+class HostBudget:
+    """Sustained ``rate`` (requests per second) and ``burst`` size for one host."""
+
+    rate: float
+    burst: int = 1
+
+    def __post_init__(self) -> None:
+        if self.rate <= 0 or self.burst < 1:
+            raise ValueError("rate must be positive and burst at least 1")
+
+
+# OpenAlex's polite pool allows 10 requests/s; the others are conservative guesses.
+DEFAULT_HOST_BUDGETS: dict[str, HostBudget] = {
+    "api.openalex.org": HostBudget(rate=10, burst=10),
+    "api.scite.ai": HostBudget(rate=5, burst=5),
+}
+DEFAULT_BUDGET = HostBudget(rate=2, burst=2)
+
+
+@dataclass(frozen=True)
+class RateLimitStats:
+    """Queueing counters for one host since the scheduler was created."""
+
+    granted: int
+    interactive: int
+    batch: int
+    waiting: int
+    max_waiting: int
+    wait_seconds: float
+    max_wait_seconds: float
+    throttled: int
+    timeouts: int
+
+    @property
+    def mean_wait(self) -> float:
+        return self.wait_seconds / self.granted if self.granted else 0.0
+
+
+@dataclass
+class _Bucket:
+    budget: HostBudget
+    tokens: float
+    updated: float
+    paused_until: float = 0.0
+    queue: list[tuple[int, int]] = field(default_factory=list)
+    granted: dict[str, int] = field(default_factory=lambda: dict.fromkeys(_PRIORITY_RANK, 0))
+    max_waiting: int = 0
+    wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+    throttled: int = 0
+    timeouts: int = 0
+
+    def refill(self, now: float) -> None:
+        # No tokens accrue while paused, so a host is not hit with a burst after a 429.
+        elapsed = max(0.0, now - max(self.updated, self.paused_until))
+        self.tokens = min(self.budget.burst, self.tokens + elapsed * self.budget.rate)
+        self.updated = now
+
+    def ready_in(self, now: float) -> float:
+        """Seconds until a token is available to the head of the queue."""
+
+        shortfall = max(0.0, (1 - self.tokens) / self.budget.rate)
+        return max(shortfall, self.paused_until - now)
+
+
+def host_of(target: str) -> str:
+    """The host a URL points at; bare host names are returned lower-cased."""
+
+    if "://" in target:
+        return (urlsplit(target).hostname or "").lower()
+    return target.lower()
+
+
+def retry_after_seconds(response: Any) -> float | None:
+    """A response's ``Retry-After`` header in seconds, if it is given as a number."""
+
+    value = (getattr(response, "headers", None) or {}).get("Retry-After")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class TokenBucketScheduler:
+    """Token buckets per host that every outgoing API request waits on.
+
+    Each host gets a :class:`HostBudget` (``budgets``, else ``default``), so over
+    any window ``t`` at most ``burst + rate * t`` requests start. Waiting callers
+    queue per host: ``interactive`` requests are served before ``batch`` ones and
+    callers of equal priority first come, first served. A 429 reported through
+    :meth:`penalize` pauses the host for its ``Retry-After`` and empties the bucket.
+    """
+
+    def __init__(
+        self,
+        budgets: Mapping[str, HostBudget] | None = None,
+        *,
+        default: HostBudget = DEFAULT_BUDGET,
+    ) -> None:
+        self.default = default
+        self._budgets = {host_of(host): budget for host, budget in (budgets or {}).items()}
+        self._condition = threading.Condition()
+        self._buckets: dict[str, _Bucket] = {}
+        self._tickets = itertools.count()
+
+    def configure(self, host: str, budget: HostBudget) -> None:
+        """Set ``host``'s budget; requests already waiting use it from now on."""
+
+        with self._condition:
+            host = host_of(host)
+            self._budgets[host] = budget
+            if host in self._buckets:
+                bucket = self._buckets[host]
+                bucket.refill(time.monotonic())
+                bucket.budget = budget
+                bucket.tokens = min(bucket.tokens, budget.burst)
+            self._condition.notify_all()
+
+    def acquire(
+        self, target: str, *, priority: Priority = "interactive", timeout: float | None = None
+    ) -> float:
+        """Block until a request to ``target`` (URL or host) may start; returns seconds waited.
+
+        Raises :class:`TimeoutError` if no slot frees up within ``timeout`` seconds.
+        """
+
+        if priority not in _PRIORITY_RANK:
+            raise ValueError(f"Unknown priority: {priority}")
+        host = host_of(target)
+        with self._condition:
+            started = time.monotonic()
+            bucket = self._bucket(host, started)
+            ticket = (_PRIORITY_RANK[priority], next(self._tickets))
+            heapq.heappush(bucket.queue, ticket)
+            bucket.max_waiting = max(bucket.max_waiting, len(bucket.queue))
+            while True:
+                now = time.monotonic()
+                bucket.refill(now)
+                delay = bucket.ready_in(now)
+                if bucket.queue[0] == ticket and delay <= 0:
+                    heapq.heappop(bucket.queue)
+                    bucket.tokens -= 1
+                    waited = now - started
+                    bucket.granted[priority] += 1
+                    bucket.wait_seconds += waited
+                    bucket.max_wait_seconds = max(bucket.max_wait_seconds, waited)
+                    self._condition.notify_all()
+                    return waited
+                if timeout is not None and now - started >= timeout:
+                    bucket.queue.remove(ticket)
+                    heapq.heapify(bucket.queue)
+                    bucket.timeouts += 1
+                    self._condition.notify_all()
+                    raise TimeoutError(f"No request slot for {host} within {timeout}s")
+                # Only the head waits for tokens; the rest are woken when it is served.
+                wait: float | None = delay if bucket.queue[0] == ticket else None
+                if timeout is not None:
+                    remaining = started + timeout - now
+                    wait = remaining if wait is None else min(wait, remaining)
+                self._condition.wait(wait)
+
+    def penalize(self, target: str, retry_after: float | None = None) -> None:
+        """Record a 429 from ``target``: drain its tokens and pause it for ``retry_after``."""
+
+        with self._condition:
+            now = time.monotonic()
+            bucket = self._bucket(host_of(target), now)
+            bucket.refill(now)
+            bucket.tokens = 0.0
+            pause = retry_after if retry_after is not None else 1 / bucket.budget.rate
+            bucket.paused_until = max(bucket.paused_until, now + pause)
+            bucket.throttled += 1
+            self._condition.notify_all()
+
+    def stats(self) -> dict[str, RateLimitStats]:
+        with self._condition:
+            return {
+                host: RateLimitStats(
+                    sum(bucket.granted.values()),
+                    bucket.granted["interactive"],
+                    bucket.granted["batch"],
+                    len(bucket.queue),
+                    bucket.max_waiting,
+                    bucket.wait_seconds,
+                    bucket.max_wait_seconds,
+                    bucket.throttled,
+                    bucket.timeouts,
+                )
+                for host, bucket in self._buckets.items()
+            }
+
+    def _bucket(self, host: str, now: float) -> _Bucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            budget = self._budgets.get(host, self.default)
+            bucket = self._buckets[host] = _Bucket(budget, float(budget.burst), now)
+        return bucket
+
+
+@cache
+def shared_scheduler() -> TokenBucketScheduler:
+    """The process-wide scheduler used by the OpenAlex, Scite and PDF download clients."""
+
+    return TokenBucketScheduler(DEFAULT_HOST_BUDGETS)
+
+
+__all__ = [
+    "DEFAULT_HOST_BUDGETS",
+    "HostBudget",
+    "Priority",
+    "RateLimitStats",
+    "TokenBucketScheduler",
+    "host_of",
+    "retry_after_seconds",
+    "shared_scheduler",
+]
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import hashlib
+import re
+import time
+from collections import OrderedDict
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Protocol
+
+import numpy as np
+
+_RERANK_WORD = re.compile(r"\w+")
+
+
+class Reranker(Protocol):
+    """Scores a batch of ``(query, passage)`` pairs; higher means more relevant."""
+
+    def __call__(self, pairs: Sequence[tuple[str, str]]) -> np.ndarray: ...
+
+
+class LexicalReranker:
+    """Deterministic, offline cross-scorer built from query/passage term alignment.
+
+    A pair scores the fraction of distinct query terms found in the passage, plus
+    ``bigram_weight`` times the fraction of query bigrams found adjacent, plus
+    ``proximity_weight`` times how tightly the matched terms cluster (matched terms
+    divided by the shortest window containing all of them). Unlike first-stage
+    scoring it looks at the pair together, so word order and proximity count.
+    """
+
+    def __init__(self, *, bigram_weight: float = 0.5, proximity_weight: float = 0.25) -> None:
+        self.bigram_weight = bigram_weight
+        self.proximity_weight = proximity_weight
+
+    def __call__(self, pairs: Sequence[tuple[str, str]]) -> np.ndarray:
+        return np.array([self._score(query, passage) for query, passage in pairs], np.float64)
+
+    def _score(self, query: str, passage: str) -> float:
+        query_terms = list(dict.fromkeys(_RERANK_WORD.findall(query.lower())))
+        words = _RERANK_WORD.findall(passage.lower())
+        if not query_terms or not words:
+            return 0.0
+        positions: dict[str, list[int]] = {}
+        for position, word in enumerate(words):
+            if word in query_terms:
+                positions.setdefault(word, []).append(position)
+        if not positions:
+            return 0.0
+        coverage = len(positions) / len(query_terms)
+
+        query_bigrams = set(zip(query_terms, query_terms[1:]))
+        bigrams = 0.0
+        if query_bigrams:
+            bigrams = len(query_bigrams & set(zip(words, words[1:]))) / len(query_bigrams)
+
+        proximity = len(positions) / _shortest_window(positions)
+        return coverage + self.bigram_weight * bigrams + self.proximity_weight * proximity
+
+    def __repr__(self) -> str:
+        return (
+            f"LexicalReranker(bigram_weight={self.bigram_weight}, "
+            f"proximity_weight={self.proximity_weight})"
+        )
+
+
+def _shortest_window(positions: dict[str, list[int]]) -> int:
+    """Length of the shortest word window containing every term in ``positions``."""
+
+    hits = sorted((position, term) for term, found in positions.items() for position in found)
+    counts: dict[str, int] = {}
+    best = hits[-1][0] - hits[0][0] + 1
+    left = 0
+    for position, term in hits:
+        counts[term] = counts.get(term, 0) + 1
+        while len(counts) == len(positions):
+            best = min(best, position - hits[left][0] + 1)
+            left_term = hits[left][1]
+            counts[left_term] -= 1
+            if not counts[left_term]:
+                del counts[left_term]
+            left += 1
+    return best
+
+
+def _pair_key(query: str, passage: str) -> bytes:
+    return hashlib.blake2b(f"{query}\0{passage}".encode(), digest_size=16).digest()
+
+
+@dataclass(frozen=True)
+class RerankInfo:
+    """Counters for a :class:`RerankStage`: score cache, batches and budget cut-offs."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+    batches: int
+    truncated: int
+
+
+class RerankStage:
+    """Second-stage scoring of retrieved candidates with a pluggable :class:`Reranker`.
+
+    Pairs from every query are scored together in batches of ``batch_size``, taking
+    each query's best first-stage candidates first, so when ``time_budget`` (seconds)
+    runs out every query has had its top candidates reranked. Scores are cached per
+    ``(query, passage)`` pair in an LRU of ``cache_size`` entries, and a pair repeated
+    within one call is scored once.
+    """
+
+    def __init__(
+        self,
+        reranker: Reranker | None = None,
+        *,
+        batch_size: int = 64,
+        time_budget: float | None = None,
+        cache_size: int = 4096,
+    ) -> None:
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+        self.reranker: Reranker = reranker or LexicalReranker()
+        self.batch_size = batch_size
+        self.time_budget = time_budget
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        self.batches = 0
+        self.truncated = 0
+        self._cache: OrderedDict[bytes, float] = OrderedDict()
+
+    def rank(
+        self,
+        queries: Sequence[str],
+        candidates: Sequence[Sequence[str]],
+        *,
+        time_budget: float | None = None,
+    ) -> list[list[tuple[int, float | None]]]:
+        """Reorder each query's candidate passages; returns ``(index, score)`` lists.
+
+        Scored candidates come first by descending score (ties keep first-stage
+        order). Candidates left unscored when the budget ran out follow in their
+        original order with a ``None`` score. ``time_budget`` overrides the stage's.
+        """
+
+        if len(candidates) != len(queries):
+            raise ValueError("candidates must be given once per query")
+        started = time.perf_counter()
+        budget = self.time_budget if time_budget is None else time_budget
+        scores: list[dict[int, float]] = [{} for _ in queries]
+        pending: dict[bytes, list[tuple[int, int]]] = {}
+        pairs: list[tuple[bytes, str, str]] = []
+        for rank in range(max(map(len, candidates), default=0)):
+            for row, (query, passages) in enumerate(zip(queries, candidates)):
+                if rank >= len(passages):
+                    continue
+                key = _pair_key(query, passages[rank])
+                if key in pending:
+                    pending[key].append((row, rank))
+                    continue
+                cached = self._cache.get(key)
+                if cached is not None:
+                    self.hits += 1
+                    self._cache.move_to_end(key)
+                    scores[row][rank] = cached
+                    continue
+                self.misses += 1
+                pending[key] = [(row, rank)]
+                pairs.append((key, query, passages[rank]))
+
+        for start in range(0, len(pairs), self.batch_size):
+            if budget is not None and time.perf_counter() - started >= budget:
+                self.truncated += 1
+                break
+            batch = pairs[start : start + self.batch_size]
+            values = self.reranker([(query, passage) for _, query, passage in batch])
+            self.batches += 1
+            for (key, _, _), value in zip(batch, np.asarray(values, np.float64).tolist()):
+                self._remember(key, value)
+                for row, rank in pending[key]:
+                    scores[row][rank] = value
+
+        ranked: list[list[tuple[int, float | None]]] = []
+        for passages, scored in zip(candidates, scores):
+            best = sorted(scored.items(), key=lambda item: (-item[1], item[0]))
+            order: list[tuple[int, float | None]] = list(best)
+            order.extend((rank, None) for rank in range(len(passages)) if rank not in scored)
+            ranked.append(order)
+        return ranked
+
+    def cache_info(self) -> RerankInfo:
+        return RerankInfo(
+            self.hits,
+            self.misses,
+            self.cache_size,
+            len(self._cache),
+            self.batches,
+            self.truncated,
+        )
+
+    def _remember(self, key: bytes, score: float) -> None:
+        if self.cache_size <= 0:
+            return
+        self._cache[key] = score
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+
+__all__ = ["LexicalReranker", "RerankInfo", "RerankStage", "Reranker"]
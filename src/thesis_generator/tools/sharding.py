@@ -0,0 +1,362 @@
+from __future__ import annotations
+
+import multiprocessing
+import time
+import uuid
+from collections.abc import Callable, Iterable, Mapping, MutableMapping, Sequence
+from dataclasses import replace
+from multiprocessing.connection import Connection
+from typing import Any, TypeVar
+
+from thesis_generator.tools.embeddings import Embedder
+from thesis_generator.tools.ingest import (
+    _VECTOR_STORES,
+    CorpusStats,
+    FusionMode,
+    ParentChildVectorStore,
+    ParentCombiner,
+    ParentSearchResult,
+    ScoringMode,
+    SearchResult,
+    SourceDocument,
+    _fuse_rankings,
+    _ingest_into,
+    _normalize_document,
+    _tokenize,
+    _validate_fusion,
+    _validate_scoring,
+)
+
+_SHARDED_URI_PREFIX = "sharded://"
+_Scored = TypeVar("_Scored", SearchResult, ParentSearchResult)
+
+
+def _serve_shard(connection: Connection, uri: str, options: dict[str, Any]) -> None:
+    """Worker loop owning one shard store; answers ``(command, args)`` messages."""
+
+    store = ParentChildVectorStore(uri, **options)
+
+    def remove(documents: Sequence[str]) -> int:
+        return sum(
+            store.remove_parent(parent_id)
+            for document in documents
+            for parent_id in store.parents_for_document(document)
+        )
+
+    def hybrid(
+        query: str, filters: Mapping[str, Any] | None, depth: int, stats: CorpusStats | None
+    ) -> tuple[list[SearchResult], list[SearchResult], float, float]:
+        allowed, residual = store._candidate_mask(filters)
+        lexical, dense, lexical_seconds, dense_seconds = store._hybrid_candidates(
+            query, allowed, residual, depth, stats
+        )
+        return (
+            [store._result(child_id, score) for child_id, score in lexical],
+            [store._result(child_id, score) for child_id, score in dense],
+            lexical_seconds,
+            dense_seconds,
+        )
+
+    handlers: dict[str, Callable[..., Any]] = {
+        "append": lambda documents: _ingest_into(store, documents),
+        "remove": remove,
+        "stats": store.corpus_stats,
+        "search": lambda query, filters, k, mode, stats: [
+            store._result(child_id, score)
+            for child_id, score in store._rank(query, filters, k, mode, stats)
+        ],
+        "hybrid": hybrid,
+        "search_parents": lambda query, filters, k, mode, combine, stats: store.search_parents(
+            query, filters, k, scoring=mode, combine=combine, stats=stats
+        ),
+        "nbytes": lambda: store.nbytes,
+        "children": lambda: len(store.children) - store._deleted_count,
+    }
+    while True:
+        command, args = connection.recv()
+        if command == "close":
+            connection.close()
+            return
+        try:
+            connection.send((True, handlers[command](*args)))
+        except Exception as exc:  # noqa: BLE001 - re-raised in the coordinator
+            connection.send((False, exc))
+
+
+class ShardedVectorStore:
+    """Child chunks partitioned across ``shards`` worker processes, searched scatter-gather.
+
+    Documents are dealt to shards round-robin, each shard a
+    :class:`ParentChildVectorStore` living in its own process. A query is sent to
+    every shard at once and the per-shard top-``k`` lists are merged; for BM25 the
+    shards first report their statistics so every shard scores with corpus-wide
+    IDF and average length, making the merged ranking exact. Ties are broken by
+    shard, then by each shard's insertion order. Whole documents live on one shard,
+    so parent-level results merge exactly as well.
+
+    Hybrid queries gather every shard's BM25 and dense top ``hybrid_depth`` lists,
+    merge each globally and fuse them here, so fusion sees corpus-wide ranks.
+    """
+
+    def __init__(
+        self,
+        uri: str,
+        *,
+        shards: int = 4,
+        scoring: ScoringMode = "overlap",
+        embedder: Embedder | None = None,
+        chunk_size: int = 400,
+        chunk_overlap: int = 40,
+        fusion: FusionMode = "rrf",
+        fusion_weight: float = 0.5,
+    ) -> None:
+        if shards < 1:
+            raise ValueError("shards must be a positive integer")
+        self.uri = uri
+        self.scoring = _validate_scoring(scoring)
+        self.fusion = _validate_fusion(fusion, fusion_weight)
+        self.fusion_weight = fusion_weight
+        self.hybrid_depth = 50
+        options = {
+            "scoring": scoring,
+            "embedder": embedder,
+            "chunk_size": chunk_size,
+            "chunk_overlap": chunk_overlap,
+            "cache_size": 0,
+        }
+        self._next_shard = 0
+        self._connections: list[Connection] = []
+        self._processes: list[multiprocessing.process.BaseProcess] = []
+        context = multiprocessing.get_context()
+        for index in range(shards):
+            ours, theirs = context.Pipe()
+            process = context.Process(
+                target=_serve_shard, args=(theirs, f"{uri}#shard-{index}", options), daemon=True
+            )
+            process.start()
+            theirs.close()
+            self._connections.append(ours)
+            self._processes.append(process)
+
+    @property
+    def shards(self) -> int:
+        return len(self._connections)
+
+    @property
+    def nbytes(self) -> int:
+        """Accounted bytes summed over the shard processes."""
+
+        return sum(self._broadcast("nbytes"))
+
+    def __len__(self) -> int:
+        return sum(self._broadcast("children"))
+
+    def append(
+        self, documents: Iterable[Mapping[str, Any] | SourceDocument], *, replace: bool = False
+    ) -> int:
+        """Deal documents to shards round-robin; returns the number of chunks added.
+
+        With ``replace=True`` documents already present under the same id (or title)
+        are removed from every shard first.
+        """
+
+        batches: list[list[Mapping[str, Any] | SourceDocument]] = [[] for _ in self._connections]
+        for document in documents:
+            batches[self._next_shard].append(document)
+            self._next_shard = (self._next_shard + 1) % self.shards
+        if replace:
+            keys = [_document_key(document) for batch in batches for document in batch]
+            self._broadcast("remove", keys)
+        return sum(self._scatter([("append", (batch,)) for batch in batches]))
+
+    def remove_document(self, document: str) -> int:
+        """Remove a document (by id or title) from every shard; returns chunks removed."""
+
+        return sum(self._broadcast("remove", [document]))
+
+    def search(
+        self,
+        query: str,
+        filters: Mapping[str, Any] | None = None,
+        k: int = 5,
+        *,
+        scoring: ScoringMode | None = None,
+        timings: MutableMapping[str, float] | None = None,
+    ) -> list[SearchResult]:
+        """Top ``k`` children across shards; ``timings`` as for a single store.
+
+        Stage timings are reported for hybrid queries, using the slowest shard's
+        retriever times; other modes report only ``total_ms``.
+        """
+
+        started = time.perf_counter()
+        mode = _validate_scoring(scoring or self.scoring)
+        if mode == "hybrid":
+            results = self._hybrid(query, filters, k, timings)
+        else:
+            results = self.search_many([query], [filters], k, scoring=mode)[0]
+        if timings is not None:
+            timings["total_ms"] = 1000 * (time.perf_counter() - started)
+        return results
+
+    def search_many(
+        self,
+        queries: Sequence[str],
+        filters: Mapping[str, Any] | Sequence[Mapping[str, Any] | None] | None = None,
+        k: int = 5,
+        *,
+        scoring: ScoringMode | None = None,
+    ) -> list[list[SearchResult]]:
+        mode = _validate_scoring(scoring or self.scoring)
+        if filters is None or isinstance(filters, Mapping):
+            per_query: list[Mapping[str, Any] | None] = [filters] * len(queries)
+        else:
+            per_query = list(filters)
+            if len(per_query) != len(queries):
+                raise ValueError("filters must be shared or given once per query")
+        if mode == "hybrid":
+            return [
+                self._hybrid(query, query_filters, k)
+                for query, query_filters in zip(queries, per_query)
+            ]
+        stats = self._corpus_stats(queries, mode)
+        return [
+            _merge_top(self._broadcast("search", query, query_filters, k, mode, stats), k)
+            for query, query_filters in zip(queries, per_query)
+        ]
+
+    def search_parents(
+        self,
+        query: str,
+        filters: Mapping[str, Any] | None = None,
+        k: int = 5,
+        *,
+        scoring: ScoringMode | None = None,
+        combine: ParentCombiner = "max",
+    ) -> list[ParentSearchResult]:
+        mode = _validate_scoring(scoring or self.scoring)
+        if mode == "hybrid":
+            raise ValueError("Sharded stores do not support hybrid parent search")
+        stats = self._corpus_stats([query], mode)
+        per_shard = self._broadcast("search_parents", query, filters, k, mode, combine, stats)
+        return _merge_top(per_shard, k)
+
+    def _hybrid(
+        self,
+        query: str,
+        filters: Mapping[str, Any] | None,
+        k: int,
+        timings: MutableMapping[str, float] | None = None,
+    ) -> list[SearchResult]:
+        depth = max(k, self.hybrid_depth)
+        stats = self._corpus_stats([query], "bm25")
+        replies = self._broadcast("hybrid", query, filters, depth, stats)
+        started = time.perf_counter()
+        hits: dict[tuple[str, int], SearchResult] = {}
+
+        def ranking(column: int) -> list[tuple[tuple[str, int], float]]:
+            ranked = []
+            for hit in _merge_top([reply[column] for reply in replies], depth):
+                key = (hit.chunk.metadata["parent_id"], hit.chunk.metadata["chunk_index"])
+                hits[key] = hit
+                ranked.append((key, hit.score))
+            return ranked
+
+        fused = _fuse_rankings(ranking(0), ranking(1), self.fusion, self.fusion_weight)[:k]
+        if timings is not None:
+            timings["lexical_ms"] = 1000 * max(reply[2] for reply in replies)
+            timings["dense_ms"] = 1000 * max(reply[3] for reply in replies)
+            timings["fusion_ms"] = 1000 * (time.perf_counter() - started)
+        return [replace(hits[key], score=score) for key, score in fused]
+
+    def _corpus_stats(self, queries: Sequence[str], mode: ScoringMode) -> CorpusStats | None:
+        if mode != "bm25":
+            return None
+        terms = {term for query in queries for term in _tokenize(query)}
+        return CorpusStats.combine(self._broadcast("stats", terms))
+
+    def close(self) -> None:
+        """Stop the shard processes; the store is unusable afterwards."""
+
+        for connection in self._connections:
+            try:
+                connection.send(("close", ()))
+            except (BrokenPipeError, OSError):
+                pass
+            connection.close()
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self._connections = []
+        self._processes = []
+
+    def _broadcast(self, command: str, *args: Any) -> list[Any]:
+        return self._scatter([(command, args)] * self.shards)
+
+    def _scatter(self, messages: Sequence[tuple[str, tuple[Any, ...]]]) -> list[Any]:
+        """Send one message per shard, then gather all replies so shards run in parallel."""
+
+        if not self._connections:
+            raise RuntimeError(f"Sharded vector store {self.uri} is closed")
+        for connection, message in zip(self._connections, messages):
+            connection.send(message)
+        replies = [connection.recv() for connection in self._connections]
+        for ok, value in replies:
+            if not ok:
+                raise value
+        return [value for _, value in replies]
+
+
+def ingest_sharded_documents(
+    documents: Iterable[Mapping[str, Any] | SourceDocument],
+    *,
+    shards: int = 4,
+    chunk_size: int = 400,
+    chunk_overlap: int = 40,
+    scoring: ScoringMode = "overlap",
+    embedder: Embedder | None = None,
+    vector_store_uri: str | None = None,
+    fusion: FusionMode = "rrf",
+    fusion_weight: float = 0.5,
+) -> str:
+    """Ingest documents into a new :class:`ShardedVectorStore` and register it.
+
+    The returned ``sharded://`` URI works with :func:`search_sections` and
+    :func:`search_many` like any other store. ``embedder`` must be picklable.
+    """
+
+    vector_store_uri = vector_store_uri or f"{_SHARDED_URI_PREFIX}ingest-{uuid.uuid4()}"
+    store = ShardedVectorStore(
+        vector_store_uri,
+        shards=shards,
+        scoring=scoring,
+        embedder=embedder,
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        fusion=fusion,
+        fusion_weight=fusion_weight,
+    )
+    store.append(documents)
+    _VECTOR_STORES[vector_store_uri] = store
+    return vector_store_uri
+
+
+def _merge_top(per_shard: Sequence[Sequence[_Scored]], k: int) -> list[_Scored]:
+    ranked = sorted(
+        (
+            (-hit.score, shard, rank, hit)
+            for shard, hits in enumerate(per_shard)
+            for rank, hit in enumerate(hits)
+        ),
+        key=lambda entry: entry[:3],
+    )
+    return [hit for *_, hit in ranked[:k]]
+
+
+def _document_key(document: Mapping[str, Any] | SourceDocument) -> str:
+    normalized = _normalize_document(document)
+    return normalized.id or normalized.title
+
+
+__all__ = ["ShardedVectorStore", "ingest_sharded_documents"]
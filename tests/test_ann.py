@@ -0,0 +1,23 @@
+import numpy as np
+
+from thesis_generator.tools.ann import IVFFlatIndex
+
+
+def test_ivf_probe_covers_all_rows_at_full_nprobe_and_tracks_adds() -> None:
+    rng = np.random.default_rng(1)
+    vectors = rng.normal(size=(300, 16)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    index = IVFFlatIndex(nlist=8, nprobe=2, iterations=5)
+    index.train(vectors[:250])
+    query = vectors[10]
+    assert 10 in index.probe(query).tolist()
+    assert sorted(index.probe(query, nprobe=8).tolist()) == list(range(250))
+
+    index.add(vectors[250:])
+    assert len(index) == 300 and 260 in index.probe(vectors[260]).tolist()
+
+    index.keep(np.arange(100, 300))
+    assert sorted(index.probe(query, nprobe=8).tolist()) == list(range(200))
+    restored = IVFFlatIndex.from_arrays(index.describe(), index.arrays())
+    assert restored.probe(query).tolist() == index.probe(query).tolist()
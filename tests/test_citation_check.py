@@ -5,6 +5,7 @@ from typing import Any
 import pytest
 
 from thesis_generator.tools.citation_check import SciteClient, check_citations
+from thesis_generator.tools.rate_limit import HostBudget, TokenBucketScheduler
 
 
 class FakeResponse:
@@ -117,3 +118,20 @@ def test_check_citations_handles_multiple_dois(monkeypatch: pytest.MonkeyPatch)
     assert results[0]["trust_score"] > 0
     assert results[1]["manual_review_required"] is True
     assert results[1]["warning"]
+
+
+def test_rate_limit_is_retried_after_pausing_the_host() -> None:
+    limited = FakeResponse(429, {"message": "rate limit"})
+    limited.headers = {"Retry-After": "0.05"}
+    ok = FakeResponse(200, {"tallies": {"supporting": 1, "mentioning": 0, "contrasting": 0}})
+    scheduler = TokenBucketScheduler({"api.scite.ai": HostBudget(rate=100, burst=1)})
+    client = SciteClient(
+        api_key="dummy", session=FakeSession([limited, ok]), rate_limiter=scheduler, max_retries=1
+    )
+
+    report = client.evaluate_doi("10.1000/busy")
+
+    assert report["source"] == "scite"
+    stats = scheduler.stats()["api.scite.ai"]
+    assert (stats.granted, stats.throttled) == (2, 1)
+    assert stats.max_wait_seconds >= 0.04
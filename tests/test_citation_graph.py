@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import copy
+from typing import Any
+
+import numpy as np
+import pytest
+
+from thesis_generator.tools.citation_graph import CitationGraph, expand_citation_graph
+from thesis_generator.tools.openalex import OpenAlexAPI
+
+# W1 and W2 are seeds; W3 is cited by both, W5 cites W1, W6 cites W3.
+REFERENCES = {
+    "W1": ["W3", "W4"],
+    "W2": ["W3"],
+    "W3": ["W7"],
+    "W4": [],
+    "W5": ["W1"],
+    "W6": ["W3", "W1"],
+    "W7": [],
+}
+
+
+class CorpusWorks:
+    def __init__(self) -> None:
+        self.params: dict[str, Any] = {}
+        self.requests: list[dict[str, Any]] = []  # shared by the per-request copies
+
+    def __copy__(self) -> CorpusWorks:
+        clone = CorpusWorks()
+        clone.params = copy.deepcopy(self.params)
+        clone.requests = self.requests
+        return clone
+
+    def search(self, s: str) -> CorpusWorks:
+        self.params["search"] = s
+        return self
+
+    def filter(self, **kwargs: Any) -> CorpusWorks:
+        self.params.setdefault("filter", {}).update(kwargs)
+        return self
+
+    def select(self, s: str) -> CorpusWorks:
+        return self
+
+    def sort(self, **kwargs: Any) -> CorpusWorks:
+        self.params["sort"] = kwargs
+        return self
+
+    def paginate(self, per_page: int | None = None, **_: Any) -> Any:
+        return iter([])  # no work in the corpus matches a text search
+
+    def get(self, per_page: int | None = None, **_: Any) -> list[dict[str, Any]]:
+        filters = self.params["filter"]
+        self.requests.append(dict(filters))
+        if "search" in self.params:
+            return []
+        if "openalex_id" in filters:
+            ids = filters["openalex_id"].split("|")
+        else:
+            cited = set(filters["cites"].split("|"))
+            ids = [work for work, refs in REFERENCES.items() if cited & set(refs)]
+        works = [
+            {
+                "id": f"https://openalex.org/{work}",
+                "display_name": f"Paper {work}",
+                "cited_by_count": sum(work in refs for refs in REFERENCES.values()),
+                "referenced_works": [f"https://openalex.org/{ref}" for ref in REFERENCES[work]],
+            }
+            for work in ids
+            if work in REFERENCES
+        ]
+        return works[:per_page]
+
+
+def test_expand_citation_graph_snowballs_both_directions() -> None:
+    works = CorpusWorks()
+    api = OpenAlexAPI(works_client=works)
+
+    graph = expand_citation_graph(api, ["W1", "https://openalex.org/W2", "W1"], depth=2)
+
+    assert graph.work_ids[:2] == ("W1", "W2")
+    assert set(graph.work_ids) == set(REFERENCES)
+    assert dict(zip(graph.work_ids, graph.levels.tolist()))["W7"] == 2
+    # Referenced by both seeds, W3 leads level one.
+    assert graph.work_ids[2] == "W3"
+    assert graph.references("W1") == ["W3", "W4"]
+    assert sorted(graph.cited_by("W3")) == ["W1", "W2", "W6"]
+    assert graph.num_edges == sum(map(len, REFERENCES.values()))
+    assert graph.indptr.dtype == np.int64 and graph.indices.dtype == np.int32
+    # W7 inherits all of W3's rank, so it edges out W3 itself.
+    assert [paper.title for paper, _ in graph.rank(2)] == ["Paper W7", "Paper W3"]
+    assert graph.rank(1, by="in_degree")[0][1] == 3.0
+    assert not any("openalex_id" in request and "cites" in request for request in works.requests)
+
+
+def test_expand_citation_graph_ignores_earlier_searches_on_the_same_api() -> None:
+    works = CorpusWorks()
+    api = OpenAlexAPI(works_client=works)
+
+    assert api.search_papers("graph", year_range=(2020, 2021)) == []
+    graph = expand_citation_graph(api, ["W1", "W2"], depth=2)
+
+    assert set(graph.work_ids) == set(REFERENCES)
+    assert sorted(graph.cited_by("W1")) == ["W5", "W6"]
+    assert not any("publication_year" in request for request in works.requests)
+
+
+def test_expand_citation_graph_caps_each_level() -> None:
+    api = OpenAlexAPI(works_client=CorpusWorks())
+
+    backward = expand_citation_graph(api, ["W1"], depth=3, max_per_level=1, direction="backward")
+    assert backward.work_ids == ("W1", "W3", "W7")
+    assert backward.levels.tolist() == [0, 1, 2]
+
+    assert expand_citation_graph(api, ["W9"], depth=2).work_ids == ()
+    with pytest.raises(ValueError):
+        expand_citation_graph(api, ["W1"], direction="sideways")  # type: ignore[arg-type]
+
+
+def test_pagerank_handles_dangling_nodes() -> None:
+    api = OpenAlexAPI(works_client=CorpusWorks())
+    graph = expand_citation_graph(api, ["W5"], depth=1, direction="backward")
+
+    assert isinstance(graph, CitationGraph) and graph.work_ids == ("W5", "W1")
+    ranks = graph.pagerank()
+    assert ranks.sum() == pytest.approx(1.0)
+    assert ranks[1] > ranks[0]
+    with pytest.raises(KeyError):
+        graph.node("W404")
@@ -0,0 +1,17 @@
+from thesis_generator.tools.dedupe import MinHashLSH
+
+
+def test_minhash_lsh_finds_near_duplicates_only() -> None:
+    base = " ".join(f"token{i}" for i in range(60))
+    near = base.replace("token30", "changed")
+    unrelated = " ".join(f"other{i}" for i in range(60))
+
+    index = MinHashLSH(threshold=0.7)
+    index.insert("base", index.signature(base))
+    index.insert("unrelated", index.signature(unrelated))
+
+    matches = index.query(index.signature(near))
+    assert [item for item, _ in matches] == ["base"]
+    assert 0.7 <= matches[0][1] < 1.0
+    assert index.query(index.signature("completely different words here now")) == []
+    assert index.signature(base).tolist() == MinHashLSH(threshold=0.7).signature(base).tolist()
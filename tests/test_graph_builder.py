@@ -1,9 +1,17 @@
 from __future__ import annotations
 
+import pytest
 from langgraph.constants import END, START
 
-from thesis_generator.graph.builder import build_main_graph
+from thesis_generator.graph.builder import _with_store_snapshots, build_main_graph
 from thesis_generator.state import ResearchDocument, Section, ThesisState
+from thesis_generator.tools.ingest import (
+    configure_vector_store_registry,
+    ingest_documents,
+    release_vector_store,
+    reset_vector_store_registry,
+    search_sections,
+)
 
 
 def test_graph_compiles_without_isolated_nodes() -> None:
@@ -35,3 +43,62 @@ def test_graph_runs_from_start_to_finish() -> None:
     assert result.get("manuscript"), "writer should populate manuscript"
     assert result.get("documents"), "documents should persist through the graph"
     assert result.get("next_node") == "FINISH"
+
+
+def test_graph_snapshots_and_reattaches_the_state_vector_store(tmp_path) -> None:
+    def researcher(state: ThesisState) -> ThesisState:
+        uri = ingest_documents([{"title": "Doc", "content": "graph retrieval evidence"}])
+        documents = [ResearchDocument(id="d1", title="Doc", perspective="tech")]
+        return state.model_copy(update={"vector_store_uri": uri, "documents": documents})
+
+    def writer(state: ThesisState) -> ThesisState:
+        hits = search_sections("graph", vector_store_uri=state.vector_store_uri)
+        section = Section(id="1", title="Intro", content=hits[0].chunk.page_content)
+        return state.model_copy(update={"manuscript": [section]})
+
+    initial = ThesisState(
+        topic="RAG",
+        target_word_count=100,
+        style_guide="apa",
+        outline=[Section(id="1", title="Intro")],
+    )
+    first = build_main_graph(researcher_node=researcher, snapshot_directory=tmp_path)
+    state = first.invoke(initial)
+    assert (tmp_path / "refs.json").exists()
+
+    # A restarted process resumes from the checkpointed state with an empty registry.
+    reset_vector_store_registry()
+    resumed = build_main_graph(writer_node=writer, snapshot_directory=tmp_path)
+    rewind = {"manuscript": [], "user_approval_status": "pending"}
+    result = resumed.invoke(ThesisState(**{**state, **rewind}))
+
+    assert result["manuscript"][0].content == "graph retrieval evidence"
+
+
+def test_store_snapshots_accept_dict_states_and_evicted_stores(tmp_path) -> None:
+    reset_vector_store_registry()
+    initial = ThesisState(topic="RAG", target_word_count=100, style_guide="apa")
+    uri = ingest_documents([{"title": "Doc", "content": "graph retrieval evidence"}])
+
+    def attach(state: ThesisState) -> dict:
+        return {"vector_store_uri": uri}
+
+    node = _with_store_snapshots(attach, tmp_path)
+    updated = node(initial.model_dump())
+    assert updated.vector_store_uri == uri and updated.topic == "RAG"
+
+    # Evicted without a spill directory: the earlier snapshot is reattached.
+    release_vector_store(uri)
+    assert node(initial).vector_store_uri == uri
+    assert search_sections("graph", vector_store_uri=uri)
+
+    configure_vector_store_registry(max_stores=1)
+    lost = ingest_documents([{"title": "Lost", "content": "never snapshotted"}])
+    ingest_documents([{"title": "Newer", "content": "evicts the lost store"}])
+
+    def attach_lost(state: ThesisState) -> dict:
+        return {"vector_store_uri": lost}
+
+    with pytest.raises(ValueError, match="evicted"):
+        _with_store_snapshots(attach_lost, tmp_path)(initial)
+    reset_vector_store_registry()
@@ -1,8 +1,28 @@
+import numpy as np
+import pytest
+
+from thesis_generator.tools.embeddings import HashingEmbedder
 from thesis_generator.tools.ingest import (
+    _VECTOR_STORES,
+    Chunk,
+    ParentChildVectorStore,
+    VectorStoreRegistry,
+    _passes_filters,
+    ann_recall_report,
+    append_documents,
+    configure_vector_store_registry,
     ingest_documents,
+    remove_document,
+    rerank_search,
     reset_vector_store_registry,
+    restore_vector_store,
+    search_many,
+    search_parents,
     search_sections,
+    snapshot_vector_store,
+    verify_passage,
 )
+from thesis_generator.tools.rerank import RerankStage
 
 
 def setup_function() -> None:
@@ -87,3 +107,737 @@ def test_year_filter_excludes_out_of_range_results() -> None:
     )
     assert len(older_only) == 1
     assert older_only[0].chunk.metadata["year"] == 2018
+
+
+def test_postings_search_matches_reference_overlap_ranking() -> None:
+    vocabulary = ["graph", "retrieval", "agents", "memory", "vector", "index", "the", "of"]
+    documents = [
+        {
+            "title": f"Paper {i}",
+            "year": 2015 + i % 8,
+            "sections": [
+                {
+                    "heading": "Body",
+                    "content": " ".join(
+                        vocabulary[(i * 7 + j * 3) % len(vocabulary)] for j in range(5 + i % 9)
+                    ),
+                }
+            ],
+        }
+        for i in range(40)
+    ]
+    uri = ingest_documents(documents, chunk_size=4, chunk_overlap=1)
+    store = _VECTOR_STORES[uri]
+
+    for query, filters in [
+        ("graph memory", None),
+        ("The index OF vector", {"year": {"gte": 2018}}),
+        ("agents", {"year": 2016}),
+    ]:
+        expected = [
+            (store._score(query, child.page_content), position)
+            for position, child in enumerate(store.children)
+            if _passes_filters(child.metadata, filters)
+        ]
+        expected.sort(key=lambda pair: pair[0], reverse=True)
+        expected_top = [(score, store.children[pos]) for score, pos in expected[:7] if score > 0]
+
+        results = search_sections(query, vector_store_uri=uri, filters=filters, k=7)
+
+        assert expected_top
+        assert [(r.score, r.chunk) for r in results] == expected_top
+
+
+def test_bm25_scoring_downweights_common_terms() -> None:
+    documents = [
+        {
+            "title": f"Common {i}",
+            "sections": [{"heading": "Body", "content": "the model the data the results"}],
+        }
+        for i in range(5)
+    ] + [
+        {
+            "title": "Rare",
+            "sections": [
+                {
+                    "heading": "Body",
+                    "content": "sparse attention kernels for long context transformers today",
+                }
+            ],
+        }
+    ]
+    uri = ingest_documents(documents, chunk_size=20)
+
+    overlap = search_sections("the attention", vector_store_uri=uri, k=1)
+    bm25 = search_sections("the attention", vector_store_uri=uri, k=1, scoring="bm25")
+
+    assert overlap[0].parent.metadata["title"] == "Common 0"
+    assert bm25[0].parent.metadata["title"] == "Rare"
+
+    bm25_uri = ingest_documents(documents, chunk_size=20, scoring="bm25")
+    default = search_sections("the attention", vector_store_uri=bm25_uri, k=1)
+    assert default[0].parent.metadata["title"] == "Rare"
+    assert default[0].score == pytest.approx(bm25[0].score)
+
+    with pytest.raises(ValueError):
+        search_sections("the", vector_store_uri=uri, scoring="cosine")  # type: ignore[arg-type]
+
+
+def test_dense_scoring_ranks_by_embedding_similarity() -> None:
+    documents = [
+        {
+            "title": "Graphs",
+            "year": 2021,
+            "sections": [{"heading": "Body", "content": "graph neural networks for molecules"}],
+        },
+        {
+            "title": "Retrieval",
+            "year": 2023,
+            "sections": [{"heading": "Body", "content": "dense retrieval with dual encoders"}],
+        },
+        {
+            "title": "Retrieval Again",
+            "year": 2019,
+            "sections": [{"heading": "Body", "content": "retrieval with encoders and indexes"}],
+        },
+    ]
+    uri = ingest_documents(documents, scoring="dense")
+    store = _VECTOR_STORES[uri]
+
+    assert store._embeddings.dtype == np.float32
+    results = search_sections("dense retrieval encoders", vector_store_uri=uri, k=2)
+    assert [r.parent.metadata["title"] for r in results] == ["Retrieval", "Retrieval Again"]
+    assert results[0].score > results[1].score
+
+    filtered = search_sections(
+        "dense retrieval encoders", vector_store_uri=uri, filters={"year": {"lte": 2020}}
+    )
+    assert [r.parent.metadata["title"] for r in filtered] == ["Retrieval Again"]
+
+    overlap_uri = ingest_documents(documents)
+    with pytest.raises(ValueError):
+        search_sections("retrieval", vector_store_uri=overlap_uri, scoring="dense")
+
+
+def test_dense_scoring_accepts_custom_embedder() -> None:
+    class LengthEmbedder:
+        dim = 2
+
+        def __call__(self, texts):
+            return np.array([[1.0, float(len(text.split()))] for text in texts], np.float32)
+
+    documents = [
+        {"title": "Short", "sections": [{"heading": "Body", "content": "one two"}]},
+        {"title": "Long", "sections": [{"heading": "Body", "content": "one two three four"}]},
+    ]
+    uri = ingest_documents(documents, embedder=LengthEmbedder())
+
+    results = search_sections("anything", vector_store_uri=uri, scoring="dense")
+
+    assert [r.parent.metadata["title"] for r in results] == ["Long", "Short"]
+    assert HashingEmbedder()(["Same text"]).tolist() == HashingEmbedder()(["same TEXT"]).tolist()
+
+
+def test_file_uri_persists_store_and_reopens_memory_mapped(tmp_path) -> None:
+    documents = [
+        {
+            "title": "Persisted RAG",
+            "year": 2024,
+            "citations": 3,
+            "authors": ["Dana Ruiz"],
+            "sections": [
+                {"heading": "Intro", "content": "memory mapped stores share one corpus"},
+                {"heading": "Método", "content": "índices invertidos para búsqueda rápida"},
+            ],
+        }
+    ]
+    uri = ingest_documents(
+        documents,
+        chunk_size=3,
+        chunk_overlap=0,
+        embedder=HashingEmbedder(dim=32),
+        vector_store_uri=f"file://{tmp_path / 'store'}",
+    )
+    in_memory = search_sections("corpus shared", vector_store_uri=uri, k=3)
+    in_memory_dense = search_sections("búsqueda", vector_store_uri=uri, scoring="dense")
+
+    reset_vector_store_registry()
+    reopened = search_sections("corpus shared", vector_store_uri=uri, k=3)
+    store = _VECTOR_STORES[uri]
+
+    assert isinstance(store._embeddings, np.memmap)
+    assert [(r.chunk, r.parent, r.score) for r in reopened] == [
+        (r.chunk, r.parent, r.score) for r in in_memory
+    ]
+    dense = search_sections("búsqueda", vector_store_uri=uri, scoring="dense")
+    assert [(r.chunk, r.score) for r in dense] == [(r.chunk, r.score) for r in in_memory_dense]
+    assert search_sections("corpus", vector_store_uri=uri, filters={"year": {"lt": 2024}}) == []
+
+    store.add_section(
+        Chunk(page_content="appended corpus", metadata={"id": "p-new", "title": "New"}),
+        [Chunk(page_content="appended corpus", metadata={"parent_id": "p-new"})],
+    )
+    assert search_sections("appended", vector_store_uri=uri)[0].parent.metadata["id"] == "p-new"
+
+    with pytest.raises(ValueError):
+        search_sections("corpus", vector_store_uri=f"file://{tmp_path / 'missing'}")
+
+
+def test_columnar_filters_match_per_chunk_filter_semantics(tmp_path) -> None:
+    documents = [
+        {
+            "title": f"Paper {i % 4}",
+            "year": None if i % 5 == 0 else 2010 + i,
+            "citations": None if i % 3 == 0 else i * 10,
+            "authors": [f"Author {i % 2}"],
+            "sections": [{"heading": f"H{i % 3}", "content": f"shared token number {i}"}],
+        }
+        for i in range(15)
+    ]
+    memory_uri = ingest_documents(documents)
+    file_uri = ingest_documents(documents, vector_store_uri=f"file://{tmp_path / 'cols'}")
+    store = _VECTOR_STORES[memory_uri]
+    filter_cases = [
+        {"year": {"gte": 2014, "lt": 2022}},
+        {"year": None},
+        {"year": 2013, "citations": {"gt": 25}},
+        {"citations": {}},
+        {"citations": {"eq": 40}, "title": "Paper 0"},
+        {"title": {"eq": "Paper 2"}, "section_heading": "H1"},
+        {"title": "Missing"},
+        {"title": {"gte": "Paper 2"}},
+        {"authors": ["Author 1"], "year": {"lte": 2020}},
+    ]
+
+    for filters in filter_cases:
+        expected = [
+            (child.page_content, child.metadata["year"])
+            for child in store.children
+            if _passes_filters(child.metadata, filters)
+            and store._score("shared", child.page_content) > 0
+        ]
+        for uri in (memory_uri, file_uri):
+            results = search_sections("shared", vector_store_uri=uri, filters=filters, k=50)
+            assert [(r.chunk.page_content, r.chunk.metadata["year"]) for r in results] == expected
+
+    mask, residual = store._columns.mask({"year": {"gte": 2014}, "authors": ["Author 1"]})
+    assert mask is not None and mask.dtype == bool
+    assert residual == {"authors": ["Author 1"]}
+
+
+def _paper(title: str, content: str, **extra) -> dict:
+    return {"title": title, "sections": [{"heading": "Body", "content": content}], **extra}
+
+
+def test_append_documents_streams_into_existing_store() -> None:
+    uri = ingest_documents([_paper("First", "graph retrieval agents")], scoring="bm25")
+    consumed: list[str] = []
+
+    def stream():
+        for title in ("Second", "Third"):
+            consumed.append(title)
+            yield _paper(title, f"{title.lower()} graph memory")
+
+    added = append_documents(stream(), vector_store_uri=uri)
+
+    assert added == 2 and consumed == ["Second", "Third"]
+    results = search_sections("graph", vector_store_uri=uri, k=5)
+    assert {r.parent.metadata["title"] for r in results} == {"First", "Second", "Third"}
+
+
+def test_open_readers_keep_their_generation_across_appends(tmp_path) -> None:
+    papers = [_paper(f"P{i}", f"graph retrieval notes {i}") for i in range(4)]
+    uri = ingest_documents(
+        papers, scoring="bm25", vector_store_uri=f"file://{tmp_path / 'shared'}"
+    )
+    reader = ParentChildVectorStore.open(tmp_path / "shared")
+    before = [(r.chunk, r.score) for r in reader.search("graph retrieval", k=10)]
+
+    append_documents([_paper("New", "graph retrieval extra notes")], vector_store_uri=uri)
+    remove_document("P0", vector_store_uri=uri)
+
+    assert [(r.chunk, r.score) for r in reader.search("graph retrieval", k=10)] == before
+    assert [c.metadata["title"] for c in reader.children] == ["P0", "P1", "P2", "P3"]
+    latest = ParentChildVectorStore.open(tmp_path / "shared")
+    titles = {r.parent.metadata["title"] for r in latest.search("graph retrieval", k=10)}
+    assert titles == {"P1", "P2", "P3", "New"}
+
+
+def test_remove_and_replace_documents_keep_statistics_consistent(tmp_path) -> None:
+    uri = ingest_documents(
+        [
+            _paper("Keep", "sparse retrieval with inverted indexes", id="W1"),
+            _paper("Drop", "retrieval retrieval retrieval baselines", id="W2"),
+            _paper("Also Keep", "dense retrieval and graph baselines", id="W3"),
+        ],
+        scoring="bm25",
+        vector_store_uri=f"file://{tmp_path / 'mutable'}",
+    )
+
+    assert remove_document("Drop", vector_store_uri=uri) == 1
+    assert remove_document("W404", vector_store_uri=uri) == 0
+    append_documents(
+        [_paper("Keep v2", "sparse retrieval with learned indexes", id="W1")],
+        vector_store_uri=uri,
+        replace=True,
+    )
+    fresh = ingest_documents(
+        [
+            _paper("Also Keep", "dense retrieval and graph baselines"),
+            _paper("Keep v2", "sparse retrieval with learned indexes"),
+        ],
+        scoring="bm25",
+    )
+
+    expected = search_sections("retrieval baselines", vector_store_uri=fresh, k=5)
+    reset_vector_store_registry()
+    results = search_sections("retrieval baselines", vector_store_uri=uri, k=5)
+
+    assert [(r.parent.metadata["title"], r.score) for r in results] == [
+        (r.parent.metadata["title"], pytest.approx(r.score)) for r in expected
+    ]
+    assert len(_VECTOR_STORES[uri].children) == 2
+
+
+def test_tombstoned_children_are_masked_before_compaction() -> None:
+    papers = [_paper(f"P{i}", f"retrieval topic{i} shared words") for i in range(4)]
+    uri = ingest_documents(papers, scoring="bm25")
+    fresh = ingest_documents(papers[1:], scoring="bm25")
+
+    remove_document("P0", vector_store_uri=uri)
+
+    store = _VECTOR_STORES[uri]
+    assert store._deleted_count == 1 and len(store.children) == 4
+    results = search_sections("retrieval topic0 topic1", vector_store_uri=uri)
+    expected = search_sections("retrieval topic0 topic1", vector_store_uri=fresh)
+    assert [(r.chunk.page_content, r.score) for r in results] == [
+        (r.chunk.page_content, pytest.approx(r.score)) for r in expected
+    ]
+
+
+def test_children_are_spans_into_parent_text(tmp_path) -> None:
+    content = " ".join(f"word{i}" for i in range(10))
+    uri = ingest_documents([_paper("Spans", content)], chunk_size=4, chunk_overlap=1)
+    store = _VECTOR_STORES[uri]
+    parent = next(iter(store.parents.values()))
+
+    assert not hasattr(store, "_children")
+    assert [child.page_content for child in store.children] == [
+        "word0 word1 word2 word3",
+        "word3 word4 word5 word6",
+        "word6 word7 word8 word9",
+        "word9",
+    ]
+    for child_id, child in enumerate(store.children):
+        start, end = store._child_start[child_id], store._child_end[child_id]
+        assert child.page_content == parent.page_content[start:end]
+        assert child.metadata["title"] == "Spans"
+        assert child.metadata["chunk_index"] == child_id
+
+    store.add_section(
+        Chunk(page_content="alpha beta", metadata={"id": "manual", "title": "Manual"}),
+        [
+            Chunk(page_content="beta", metadata={"parent_id": "manual", "note": "x"}),
+            Chunk(page_content="gamma", metadata={"parent_id": "manual"}),
+        ],
+    )
+    store.save(tmp_path / "store")
+    reopened = ParentChildVectorStore.open(tmp_path / "store")
+    assert [(c.page_content, c.metadata.get("note")) for c in list(reopened.children)[-2:]] == [
+        ("beta", "x"),
+        ("gamma", None),
+    ]
+
+
+def test_parallel_ingest_matches_serial_ingest() -> None:
+    papers = [
+        _paper(
+            f"P{i}", " ".join(f"topic{(i * j) % 7} retrieval{j}" for j in range(30)), year=2000 + i
+        )
+        for i in range(12)
+    ]
+    serial = ingest_documents(papers, scoring="bm25", chunk_size=8, chunk_overlap=2)
+    parallel = ingest_documents(papers, scoring="bm25", chunk_size=8, chunk_overlap=2, workers=3)
+
+    def snapshot(uri: str) -> list:
+        store = _VECTOR_STORES[uri]
+        return [
+            (c.page_content, c.metadata["title"], c.metadata["chunk_index"]) for c in store.children
+        ]
+
+    assert snapshot(parallel) == snapshot(serial)
+    query = "topic3 retrieval5"
+    assert [
+        (r.chunk.page_content, r.score) for r in search_sections(query, vector_store_uri=parallel)
+    ] == [(r.chunk.page_content, r.score) for r in search_sections(query, vector_store_uri=serial)]
+    with pytest.raises(ValueError):
+        ingest_documents(papers, workers=0)
+
+
+def test_parallel_append_reads_lazy_documents_in_a_bounded_window() -> None:
+    uri = ingest_documents([_paper("Seed", "graph retrieval")], scoring="bm25")
+    store = _VECTOR_STORES[uri]
+    lags: list[int] = []
+
+    def stream():
+        for i in range(400):
+            # Documents read so far minus documents already merged into the store.
+            lags.append(i - (len(store.parents) - 1))
+            yield _paper(f"P{i}", f"topic{i % 9} retrieval notes")
+
+    added = append_documents(stream(), vector_store_uri=uri, workers=2)
+
+    assert added == 400 and len(store.parents) == 401
+    assert max(lags) < 100
+
+
+def test_registry_evicts_by_count_bytes_and_ttl_with_spill(tmp_path) -> None:
+    now = [0.0]
+    registry = VectorStoreRegistry(max_stores=2, spill_directory=tmp_path, clock=lambda: now[0])
+    stores = {}
+    for name in ("a", "b", "c"):
+        uri = ingest_documents([_paper(name, f"{name} retrieval text")])
+        stores[name] = _VECTOR_STORES[uri]
+        registry[uri] = stores[name]
+    uri_a, uri_b, uri_c = (store.uri for store in stores.values())
+
+    assert list(registry.sizes()) == [uri_b, uri_c]
+    assert registry.sizes()[uri_b] == stores["b"].nbytes > 0
+    reopened = registry[uri_a]  # spilled on eviction and mapped back in
+    assert reopened is not stores["a"] and reopened.children[0].page_content == "a retrieval text"
+    assert list(registry.sizes()) == [uri_c, uri_a]
+
+    registry.configure(max_bytes=registry.nbytes(uri_a), spill_directory=tmp_path)
+    assert list(registry.sizes()) == [uri_a]
+
+    registry.configure(ttl_seconds=10, spill_directory=tmp_path)
+    now[0] = 11.0
+    assert len(registry) == 0 and uri_a in registry
+    assert registry.release(uri_a) is False
+
+    registry.configure()
+    registry[uri_b] = stores["b"]
+    assert registry.release(uri_b) is True
+    with pytest.raises(KeyError):
+        registry[uri_b]
+
+
+@pytest.mark.parametrize("scoring", ["overlap", "bm25", "dense", "hybrid"])
+def test_search_many_matches_individual_searches(scoring) -> None:
+    papers = [
+        _paper(f"P{i}", f"retrieval topic{i % 3} graph{i % 2} agents", year=2015 + i)
+        for i in range(8)
+    ]
+    uri = ingest_documents(papers, scoring=scoring)
+    remove_document("P1", vector_store_uri=uri)
+    queries = ["retrieval topic1", "graph0 agents", "topic2 graph1", "unknownterm"]
+    per_query = [{"section_heading": {"gt": "A"}}, {"year": {"gte": 2018}}, {"title": "P5"}, None]
+
+    def flatten(results) -> list:
+        return [(r.chunk.page_content, pytest.approx(r.score)) for r in results]
+
+    shared = search_many(queries, vector_store_uri=uri, filters={"year": {"lte": 2020}}, k=3)
+    assert [flatten(results) for results in shared] == [
+        flatten(search_sections(q, vector_store_uri=uri, filters={"year": {"lte": 2020}}, k=3))
+        for q in queries
+    ]
+    mixed = search_many(queries, vector_store_uri=uri, filters=per_query, k=3)
+    assert [flatten(results) for results in mixed] == [
+        flatten(search_sections(q, vector_store_uri=uri, filters=f, k=3))
+        for q, f in zip(queries, per_query)
+    ]
+    with pytest.raises(ValueError):
+        search_many(queries, vector_store_uri=uri, filters=[None])
+
+
+def test_search_cache_hits_until_store_mutates() -> None:
+    papers = [_paper("A", "retrieval graphs"), _paper("B", "retrieval agents")]
+    uri = ingest_documents(papers, scoring="bm25")
+    store = _VECTOR_STORES[uri]
+
+    first = search_sections("Retrieval graphs", vector_store_uri=uri)
+    again = search_sections("graphs  retrieval", vector_store_uri=uri)
+    assert [r.chunk for r in again] == [r.chunk for r in first]
+    info = store.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (1, 1, 1)
+
+    search_sections("retrieval graphs", vector_store_uri=uri, filters={"title": "B"})
+    assert store.cache_info().misses == 2
+
+    append_documents([_paper("C", "graphs graphs")], vector_store_uri=uri)
+    updated = search_sections("retrieval graphs", vector_store_uri=uri)
+    assert [r.chunk.metadata["title"] for r in updated] == ["A", "C", "B"]
+    assert store.cache_info().misses == 3 and store.cache_info().currsize == 1
+
+    store.bm25_k1 = 0.5
+    retuned = search_sections("retrieval graphs", vector_store_uri=uri)
+    assert store.cache_info().misses == 4
+    assert [r.score for r in retuned] != [r.score for r in updated]
+
+
+def test_dedupe_collapses_near_duplicate_chunks_with_provenance(tmp_path) -> None:
+    body = " ".join(f"finding{i} about retrieval" for i in range(40))
+    papers = [
+        _paper("Preprint", body, id="W1"),
+        _paper("Journal", body.replace("finding7", "result7"), id="W2"),
+        _paper("Other", " ".join(f"unrelated{i}" for i in range(40)), id="W3"),
+    ]
+    uri = ingest_documents(papers, dedupe_threshold=0.8, chunk_size=500)
+    store = _VECTOR_STORES[uri]
+
+    assert len(store.children) == 2
+    journal = store.parents_for_document("W2")
+    [hit] = search_sections("finding7", vector_store_uri=uri, k=1)
+    assert hit.chunk.metadata["title"] == "Preprint"
+    assert hit.chunk.metadata["duplicate_parent_ids"] == journal
+
+    path = tmp_path / "deduped"
+    store.save(path)
+    reopened = ParentChildVectorStore.open(path)
+    assert reopened.dedupe_threshold == 0.8
+    assert reopened.children[0].metadata["duplicate_parent_ids"] == journal
+
+    remove_document("W2", vector_store_uri=uri)
+    assert store.children[0].metadata["duplicate_parent_ids"] == []
+    assert append_documents([_paper("Copy", body, id="W4")], vector_store_uri=uri) == 0
+
+
+def test_removing_canonical_duplicate_promotes_surviving_copy(tmp_path) -> None:
+    body = " ".join(f"finding{i} about retrieval" for i in range(40))
+    papers = [
+        _paper("Preprint", body, id="W1"),
+        _paper("Journal", body.replace("finding7", "result7"), id="W2"),
+        _paper("Reprint", body.replace("finding9", "result9"), id="W3"),
+    ]
+    uri = ingest_documents(papers, dedupe_threshold=0.8, chunk_size=500)
+    store = _VECTOR_STORES[uri]
+    store.save(tmp_path / "deduped")
+    reprint = store.parents_for_document("W3")
+
+    remove_document("W1", vector_store_uri=uri)
+
+    [hit] = search_sections("result7", vector_store_uri=uri, k=1)
+    assert hit.chunk.metadata["title"] == "Journal" and "result7" in hit.chunk.page_content
+    assert hit.chunk.metadata["duplicate_parent_ids"] == reprint
+    assert len(store.children) == 1
+
+    reopened = ParentChildVectorStore.open(tmp_path / "deduped")
+    reopened.remove_parent(reopened.parents_for_document("W1")[0])
+    assert [r.chunk.metadata["title"] for r in reopened.search("result7", k=1)] == ["Journal"]
+
+
+def test_ivf_index_serves_dense_search_and_persists(tmp_path) -> None:
+    papers = [
+        _paper(f"P{i}", f"topic{i % 25} method{i % 7} retrieval corpus", year=2000 + i % 20)
+        for i in range(200)
+    ]
+    queries = [f"topic{i} method{i % 7}" for i in range(25)]
+    uri = ingest_documents(papers, scoring="dense", ann_nlist=16, ann_nprobe=16)
+    store = _VECTOR_STORES[uri]
+    assert store.ann is not None and len(store.ann) == 200
+
+    exhaustive = ann_recall_report(queries, vector_store_uri=uri, k=5)
+    assert exhaustive.recall == 1.0 and exhaustive.queries > 20
+    search_sections("topic4 method4", vector_store_uri=uri)
+    store.ann.nprobe = 2
+    assert ann_recall_report(queries, vector_store_uri=uri, k=5).recall > 0.5
+    misses = store.cache_info().misses
+    probed = search_sections("topic4 method4", vector_store_uri=uri)
+    assert store.cache_info().misses == misses + 1
+    assert [(r.chunk.page_content, r.score) for r in probed] == [
+        (store.children[child_id].page_content, score)
+        for child_id, score in store._rank("topic4 method4", None, 5, "dense")
+    ]
+
+    filtered = search_sections("topic3", vector_store_uri=uri, filters={"year": 2003}, k=3)
+    assert filtered and all(r.chunk.metadata["year"] == 2003 for r in filtered)
+
+    path = tmp_path / "ann"
+    store.save(path)
+    reopened = ParentChildVectorStore.open(path)
+    assert reopened.ann is not None and reopened.ann.nprobe == 2
+    assert [r.chunk.page_content for r in reopened.search("topic4 method4")] == [
+        r.chunk.page_content for r in store.search("topic4 method4")
+    ]
+
+
+def test_verify_passage_returns_parent_and_child_spans(tmp_path) -> None:
+    content = " ".join(f"sentence{i} states a grounded finding." for i in range(60))
+    uri = ingest_documents(
+        [_paper("Source", content), _paper("Noise", "entirely different material " * 20)],
+        chunk_size=40,
+        chunk_overlap=5,
+        index_passages=True,
+    )
+    passage = "sentence41 states a grounded finding. sentence42 states a grounded finding."
+
+    [match] = verify_passage(passage, vector_store_uri=uri)
+    assert match.overlap == 1.0 and match.parent.metadata["title"] == "Source"
+    assert match.text == passage.rstrip(".")
+    assert "sentence41" in " ".join(c.page_content for c in match.children)
+
+    paraphrase = "sentence41 states a grounded finding; sentence42 states a weak finding."
+    assert 0.5 <= verify_passage(paraphrase, vector_store_uri=uri)[0].overlap < 1.0
+    assert verify_passage("nothing like this appears anywhere", vector_store_uri=uri) == []
+
+    store = _VECTOR_STORES[uri]
+    store.save(tmp_path / "passages")
+    reopened = ParentChildVectorStore.open(tmp_path / "passages")
+    [mapped] = reopened.verify_passage(passage)
+    assert mapped.text == match.text
+    assert [c.page_content for c in mapped.children] == [c.page_content for c in match.children]
+
+
+@pytest.mark.parametrize("scoring", ["overlap", "bm25", "dense", "hybrid"])
+def test_search_parents_groups_children_during_top_k(scoring) -> None:
+    long_section = " ".join(["graph retrieval evidence"] * 6 + ["filler words"] * 6)
+    papers = [
+        _paper("Long", long_section, year=2020),
+        _paper("Short", "graph retrieval once", year=2021),
+        _paper("Other", "graph only here", year=2022),
+    ]
+    uri = ingest_documents(papers, scoring=scoring, chunk_size=4, chunk_overlap=0)
+
+    children = search_sections("graph retrieval", vector_store_uri=uri, k=3)
+    assert {r.parent.metadata["title"] for r in children} == {"Long"}
+
+    parents = search_parents("graph retrieval", vector_store_uri=uri, k=3)
+    if scoring in ("overlap", "bm25"):
+        assert [p.parent.metadata["title"] for p in parents][:2] == ["Long", "Short"]
+    assert len({p.parent.metadata["id"] for p in parents}) == len(parents) == 3
+    best = parents[0]
+    assert best.score == max(span.score for span in best.children)
+    assert [span.score for span in best.children] == sorted(
+        (span.score for span in best.children), reverse=True
+    )
+    for span in best.children:
+        text = best.parent.page_content[span.start : span.end]
+        assert "graph" in text or "retrieval" in text
+
+    summed = search_parents("graph retrieval", vector_store_uri=uri, k=1, combine="sum")
+    assert summed[0].parent.metadata["title"] == "Long"
+    assert summed[0].score == pytest.approx(sum(span.score for span in summed[0].children))
+
+    filtered = search_parents(
+        "graph retrieval", vector_store_uri=uri, filters={"year": {"gte": 2021}}
+    )
+    assert [p.parent.metadata["title"] for p in filtered][0] in {"Short", "Other"}
+    with pytest.raises(ValueError):
+        search_parents("graph", vector_store_uri=uri, combine="mean")
+
+
+@pytest.mark.parametrize("scoring", ["bm25", "dense", "hybrid"])
+def test_search_parents_returns_k_parents_past_one_long_parent(scoring) -> None:
+    papers = [_paper("Big", " ".join(["graph retrieval"] * 400))] + [
+        _paper(f"Short {i}", f"graph retrieval short {i}") for i in range(5)
+    ]
+    uri = ingest_documents(papers, scoring=scoring, chunk_size=4, chunk_overlap=0)
+
+    parents = search_parents("graph retrieval", vector_store_uri=uri, k=4)
+
+    assert len({p.parent.metadata["id"] for p in parents}) == len(parents) == 4
+    assert parents[0].parent.metadata["title"] == "Big"
+
+
+def test_hybrid_search_fuses_bm25_and_dense_rankings(tmp_path) -> None:
+    papers = [
+        _paper(f"Paper {i}", f"retrieval topic{i % 4} graph{i % 3} study{i}", year=2010 + i)
+        for i in range(20)
+    ]
+    uri = ingest_documents(papers, embedder=HashingEmbedder())
+    store = _VECTOR_STORES[uri]
+    query = "retrieval topic2 graph1"
+
+    def ranks(scoring):
+        hits = search_sections(query, vector_store_uri=uri, k=50, scoring=scoring)
+        return {r.parent.metadata["title"]: rank for rank, r in enumerate(hits, start=1)}
+
+    lexical, dense = ranks("bm25"), ranks("dense")
+    timings: dict[str, float] = {}
+    fused = search_sections(query, vector_store_uri=uri, k=5, scoring="hybrid", timings=timings)
+    for result in fused:
+        title = result.parent.metadata["title"]
+        expected = sum(1 / (60 + r[title]) for r in (lexical, dense) if title in r)
+        assert result.score == pytest.approx(expected)
+    assert [r.score for r in fused] == sorted((r.score for r in fused), reverse=True)
+    assert {"filter_ms", "lexical_ms", "dense_ms", "fusion_ms", "total_ms"} <= timings.keys()
+
+    filtered = search_sections(
+        query, vector_store_uri=uri, scoring="hybrid", filters={"year": {"gte": 2025}}
+    )
+    assert filtered and all(r.parent.metadata["year"] >= 2025 for r in filtered)
+
+    store.fusion, store.fusion_weight = "weighted", 1.0
+    weighted = store.search(query, k=3, scoring="hybrid")
+    dense_hits = store.search(query, k=50, scoring="dense")
+    low, high = dense_hits[-1].score, dense_hits[0].score
+    assert [r.score for r in weighted] == pytest.approx(
+        [(r.score - low) / (high - low) for r in dense_hits[:3]]
+    )
+
+    store.save(tmp_path / "store")
+    reopened = ParentChildVectorStore.open(tmp_path / "store", embedder=HashingEmbedder())
+    assert (reopened.fusion, reopened.fusion_weight) == ("weighted", 1.0)
+    with pytest.raises(ValueError):
+        ParentChildVectorStore("memory://bad", fusion="borda")
+    with pytest.raises(ValueError):
+        search_sections(query, vector_store_uri=ingest_documents(papers), scoring="hybrid")
+
+
+def test_rerank_search_reorders_candidates_with_lexical_reranker() -> None:
+    papers = [
+        _paper("Scattered", "retrieval then graph"),
+        _paper("Adjacent", "graph retrieval works well here for long theses"),
+        _paper("Unrelated", "nothing in common"),
+    ]
+    uri = ingest_documents(papers)
+    stage = RerankStage(batch_size=2)
+    timings: dict[str, float] = {}
+
+    first_stage = search_sections("graph retrieval", vector_store_uri=uri, k=2)
+    reranked = rerank_search(
+        ["graph retrieval", "graph retrieval"],
+        vector_store_uri=uri,
+        k=2,
+        stage=stage,
+        timings=timings,
+    )
+
+    assert [r.parent.metadata["title"] for r in first_stage][0] == "Scattered"
+    assert [[r.parent.metadata["title"] for r in hits] for hits in reranked] == [
+        ["Adjacent", "Scattered"]
+    ] * 2
+    assert reranked[0][0].score > reranked[0][1].score
+    assert stage.cache_info().misses == 2 and stage.cache_info().hits == 0
+    assert {"retrieve_ms", "rerank_ms", "total_ms"} <= timings.keys()
+
+
+def test_snapshots_are_content_addressed_and_reattach_by_uri(tmp_path) -> None:
+    papers = [_paper("Graphs", "graph retrieval for theses"), _paper("Other", "unrelated")]
+    first = ingest_documents(papers, scoring="bm25")
+    second = ingest_documents(papers, scoring="bm25")
+    snapshots = tmp_path / "snapshots"
+
+    digest = snapshot_vector_store(first, snapshots)
+    assert snapshot_vector_store(second, snapshots) == digest
+    assert snapshot_vector_store(first, snapshots) == digest
+    assert [path.name for path in (snapshots / "objects").iterdir()] == [digest]
+    expected = search_sections("graph retrieval", vector_store_uri=first)
+
+    reset_vector_store_registry()
+    assert not restore_vector_store("memory://unknown", snapshots)
+    with pytest.raises(ValueError):
+        search_sections("graph", vector_store_uri=first)
+    configure_vector_store_registry(snapshot_directory=snapshots)
+    restored = search_sections("graph retrieval", vector_store_uri=first)
+    assert [(r.chunk, r.parent, r.score) for r in restored] == [
+        (r.chunk, r.parent, r.score) for r in expected
+    ]
+    assert _VECTOR_STORES[first]._files is not None
+
+    append_documents([_paper("New", "fresh graph material")], vector_store_uri=first)
+    changed = snapshot_vector_store(first, snapshots)
+    assert changed != digest
+    assert {path.name for path in (snapshots / "objects").iterdir()} == {digest, changed}
+    assert restore_vector_store(second, snapshots)
+    assert len(_VECTOR_STORES[second].parents) == 2
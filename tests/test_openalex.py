@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+from itertools import islice
 from typing import Any
 
 import pytest
 
 from thesis_generator.tools.openalex import OpenAlexAPI, OpenAlexPaper
+from thesis_generator.tools.openalex_cache import OpenAlexCache
 
 
 class FakeWorks:
@@ -17,6 +19,7 @@ class FakeWorks:
         self.details = details or {}
         self.params: dict[str, Any] | None = None
         self.per_page: int | None = None
+        self.sent: list[dict[str, Any]] = []  # params of each request, shared by the copies
 
     def search(self, s: str) -> FakeWorks:
         self.params = self.params or {}
@@ -37,15 +40,19 @@ class FakeWorks:
 
     def paginate(self, per_page: int | None = None, **_: Any):
         self.per_page = per_page
+        self.sent.append(dict(self.params or {}, per_page=per_page))
         return iter(self.pages)
 
     def get(self, per_page: int | None = None, page: int | None = None, cursor: str | None = None):
         del page, cursor  # unused
         self.per_page = per_page
+        self.sent.append(dict(self.params or {}, per_page=per_page))
         filters = (self.params or {}).get("filter", {})
         work_id = filters.get("openalex_id")
         if work_id is None:
             return []
+        if isinstance(work_id, str) and "|" in work_id:
+            work_id = work_id.split("|")
         if isinstance(work_id, list):
             return [self.details[i] for i in work_id if i in self.details]
         return [self.details.get(work_id)].copy() if work_id in self.details else []
@@ -88,8 +95,9 @@ def test_search_papers_paginates_and_limits_results() -> None:
     papers = api.search_papers("rag", year_range=(2020, 2024), limit=3, per_page=2)
 
     assert [p.paper_id for p in papers] == ["W1", "W2", "W3"]
-    assert works.per_page == 2
-    assert works.params["filter"]["publication_year"] == "2020-2024"
+    assert works.sent[-1]["per_page"] == 2
+    assert works.sent[-1]["filter"]["publication_year"] == "2020-2024"
+    assert works.params is None
 
 
 def test_get_paper_details_parses_json() -> None:
@@ -126,3 +134,199 @@ def test_get_paper_details_missing_raises() -> None:
 
     with pytest.raises(RuntimeError):
         api.get_paper_details("W999")
+
+
+class CountingWorks(FakeWorks):
+    @property
+    def calls(self) -> int:
+        return len(self.sent)
+
+
+def _work(work_id: str, title: str) -> dict[str, Any]:
+    return {"id": f"https://openalex.org/{work_id}", "display_name": title}
+
+
+def test_cache_serves_searches_and_shares_works_across_lookups(tmp_path) -> None:
+    now = [1000.0]
+    works = CountingWorks(pages=[[_work("W1", "Graph RAG"), _work("W2", "Agent RAG")]])
+    cache = OpenAlexCache(tmp_path / "openalex.sqlite", search_ttl=60, clock=lambda: now[0])
+    api = OpenAlexAPI(works_client=works, cache=cache)
+
+    first = api.search_papers("rag", limit=5)
+    assert [p.title for p in api.search_papers("RAG ", limit=1)] == ["Graph RAG"]
+    assert api.get_paper_details("W2").title == "Agent RAG"
+    assert works.calls == 1
+    assert api.search_papers("rag", limit=5) == first
+
+    info = cache.info()
+    assert (info.hits, info.misses, info.works, info.searches) == (3, 1, 2, 1)
+    assert info.hit_rate == 0.75 and info.bytes_saved > 0
+
+    now[0] += 120
+    reopened = OpenAlexCache(tmp_path / "openalex.sqlite", search_ttl=60, clock=lambda: now[0])
+    api = OpenAlexAPI(works_client=works, cache=reopened)
+    assert api.search_papers("rag", limit=5) == first
+    assert works.calls == 2
+    assert reopened.info().stale == 1 and reopened.info().revalidated == 2
+
+
+def test_cache_only_and_refresh_modes() -> None:
+    works = CountingWorks(details={"W9": _work("W9", "Cached")})
+    cache = OpenAlexCache()
+
+    offline = OpenAlexAPI(works_client=works, cache=cache, cache_mode="cache_only")
+    assert offline.search_papers("anything") == []
+    with pytest.raises(RuntimeError):
+        offline.get_paper_details("W9")
+    assert works.calls == 0
+
+    refresh = OpenAlexAPI(works_client=works, cache=cache, cache_mode="refresh")
+    refresh.get_paper_details("W9")
+    refresh.get_paper_details("W9")
+    assert works.calls == 2
+    assert offline.get_paper_details("https://openalex.org/W9").title == "Cached"
+    with pytest.raises(ValueError):
+        OpenAlexAPI(works_client=works, cache_mode="offline")
+
+
+def test_get_papers_bulk_batches_or_filters_in_input_order() -> None:
+    class BulkWorks(FakeWorks):
+        def __init__(self, *args: Any, **kwargs: Any) -> None:
+            super().__init__(*args, **kwargs)
+            self.batches: list[int] = []  # shared by the per-request copies
+
+        def get(self, *args: Any, **kwargs: Any):
+            self.batches.append(len(self.params["filter"]["openalex_id"].split("|")))
+            return super().get(*args, **kwargs)
+
+    details = {f"W{i}": _work(f"W{i}", f"Paper {i}") for i in range(0, 250, 2)}
+    works = BulkWorks(details=details)
+    cache = OpenAlexCache()
+    api = OpenAlexAPI(works_client=works, cache=cache)
+    requested = [f"https://openalex.org/W{i}" for i in range(250)] + ["W4"]
+
+    papers = api.get_papers_bulk(requested, max_workers=3)
+
+    assert len(papers) == 251
+    assert [p.title if p else None for p in papers[:4]] == ["Paper 0", None, "Paper 2", None]
+    assert papers[-1] is not None and papers[-1].paper_id == "https://openalex.org/W4"
+    assert sorted(works.batches) == [50, 100, 100]
+    assert works.params is None
+
+    assert api.get_papers_bulk(["W2", "W3"], batch_size=10) == [papers[2], None]
+    assert works.batches[-1] == 1  # W2 came from the cache
+    with pytest.raises(ValueError):
+        api.get_papers_bulk(["W1"], batch_size=101)
+
+
+def test_requests_start_from_a_clean_client_after_earlier_calls() -> None:
+    works = FakeWorks(details={f"W{i}": _work(f"W{i}", f"Paper {i}") for i in range(4)})
+    api = OpenAlexAPI(works_client=works)
+
+    api.search_papers("graph", year_range=(2020, 2021), limit=5)
+    assert api.get_paper_details("W3").title == "Paper 3"
+    papers = api.get_papers_bulk(["W1", "W2"])
+
+    assert [paper.title if paper else None for paper in papers] == ["Paper 1", "Paper 2"]
+    assert works.sent[-1]["filter"] == {"openalex_id": "W1|W2"}
+    assert "search" not in works.sent[-1]
+    assert works.params is None
+
+
+class PagedWorks(FakeWorks):
+    """Serves ``total`` works by page number or by cursor, like the OpenAlex API."""
+
+    class Page(list):
+        meta: dict[str, Any]
+
+    def __init__(self, total: int, *, fail_after: int | None = None) -> None:
+        super().__init__()
+        self.total = total
+        self.fail_after = fail_after
+        self.requests: list[tuple[int | None, str | None]] = []  # shared by the copies
+
+    def get(self, per_page: int | None = None, page: int | None = None, cursor: str | None = None):
+        self.requests.append((page, cursor))
+        self.sent.append(dict(self.params or {}, per_page=per_page))
+        size = per_page or 25
+        start = (page - 1) * size if page else int((cursor or "*").strip("*") or 0)
+        if self.fail_after is not None and start >= self.fail_after:
+            raise RuntimeError("OpenAlex unavailable")
+        result = self.Page(
+            _work(f"W{i}", f"Paper {i}") for i in range(start, min(start + size, self.total))
+        )
+        end = start + len(result)
+        result.meta = {"next_cursor": str(end) if end < self.total else None}
+        return result
+
+
+def test_iter_search_papers_prefetches_numbered_pages_in_order() -> None:
+    works = PagedWorks(total=45)
+    api = OpenAlexAPI(works_client=works, max_results_per_page=10)
+
+    stream = api.iter_search_papers("rag", year_range=(2020, 2024), limit=100, prefetch=3)
+    first = next(stream)
+
+    assert first.title == "Paper 0"
+    assert len(works.requests) >= 2  # later pages were requested before the first was used
+    titles = [first.title] + [paper.title for paper in stream]
+    assert titles == [f"Paper {i}" for i in range(45)]
+    # The short fifth page ends the sweep; at most ``prefetch`` pages run past it.
+    assert {page for page, _ in works.requests} <= set(range(1, 9))
+    assert works.params is None
+
+
+def test_iter_search_papers_follows_cursor_beyond_paging_window() -> None:
+    works = PagedWorks(total=35)
+    api = OpenAlexAPI(works_client=works, max_results_per_page=10)
+
+    papers = list(api.iter_search_papers("rag", prefetch=2))
+
+    assert [paper.title for paper in papers] == [f"Paper {i}" for i in range(35)]
+    assert [cursor for _, cursor in works.requests] == ["*", "10", "20", "30"]
+
+    limited = api.iter_search_papers("rag", limit=12_000, prefetch=1)
+    assert [paper.title for paper in islice(limited, 3)] == ["Paper 0", "Paper 1", "Paper 2"]
+    limited.close()
+
+
+def test_iter_search_papers_after_a_details_lookup_sweeps_the_whole_query() -> None:
+    works = PagedWorks(total=12)
+    api = OpenAlexAPI(works_client=works, max_results_per_page=5)
+
+    assert api.get_paper_details("W5").title == "Paper 0"
+    titles = [paper.title for paper in api.iter_search_papers("q", limit=12, prefetch=2)]
+
+    assert titles == [f"Paper {i}" for i in range(12)]
+    assert not any("filter" in params for params in works.sent[1:])
+    assert {params["search"] for params in works.sent[1:]} == {"q"}
+
+
+def test_iter_search_papers_reraises_fetch_errors_in_the_consumer() -> None:
+    api = OpenAlexAPI(works_client=PagedWorks(total=50, fail_after=20), max_results_per_page=10)
+
+    for stream in (api.iter_search_papers("rag"), api.iter_search_papers("rag", limit=50)):
+        seen = []
+        with pytest.raises(RuntimeError, match="unavailable"):
+            for paper in stream:
+                seen.append(paper.title)
+        assert len(seen) == 20
+    with pytest.raises(ValueError):
+        next(api.iter_search_papers("rag", prefetch=0))
+
+
+def test_get_citing_papers_follows_the_cursor_past_one_page() -> None:
+    class CitedWorks(PagedWorks):
+        def sort(self, **kwargs: Any) -> CitedWorks:
+            self.params = self.params or {}
+            self.params["sort"] = kwargs
+            return self
+
+    works = CitedWorks(total=450)
+    api = OpenAlexAPI(works_client=works)
+
+    papers = api.get_citing_papers(["W1"], limit=420)
+
+    assert len({paper.paper_id for paper in papers}) == 420
+    assert [cursor for _, cursor in works.requests] == ["*", "200", "400"]
+    assert len(api.get_citing_papers(["W1"], limit=1000)) == 450
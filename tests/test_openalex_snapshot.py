@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import gzip
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from thesis_generator.tools import openalex
+from thesis_generator.tools.openalex import OpenAlexAPI
+from thesis_generator.tools.openalex_snapshot import OpenAlexSnapshot
+
+
+def _write_snapshot(path: Path, count: int = 30) -> None:
+    works = [
+        {
+            "id": f"https://openalex.org/W{i}",
+            "display_name": f"Graph retrieval study {i}" if i % 3 == 0 else f"Survey {i}",
+            "abstract_inverted_index": {"Agents": [0], "plan": [1]} if i == 4 else None,
+            "publication_year": 2010 + i % 15,
+            "cited_by_count": i,
+            "referenced_works": [f"https://openalex.org/W{i - 1}"] if i else [],
+            "authorships": [{"author": {"display_name": f"Author {i}"}}],
+        }
+        for i in range(count)
+    ]
+    with gzip.open(path, "wt", encoding="utf-8") as handle:
+        for work in works:
+            handle.write(json.dumps(work) + "\n")
+
+
+def test_snapshot_answers_searches_and_lookups_offline(tmp_path) -> None:
+    path = tmp_path / "works.jsonl.gz"
+    _write_snapshot(path)
+    api = OpenAlexAPI(works_client=OpenAlexSnapshot(path), max_results_per_page=4)
+
+    papers = api.search_papers("graph retrieval", year_range=(2015, 2024), limit=20)
+    assert [p.paper_id for p in papers] == [
+        f"https://openalex.org/W{i}" for i in (6, 9, 12, 21, 24, 27)
+    ]
+    assert papers[0].authors == ["Author 6"] and papers[0].year == 2016
+    assert [p.title for p in api.search_papers("agents planning")] == ["Survey 4"]
+
+    assert api.get_paper_details("W4").abstract == "Agents plan"
+    bulk = api.get_papers_bulk(["W2", "W404", "https://openalex.org/W3"])
+    assert [p.title if p else None for p in bulk] == ["Survey 2", None, "Graph retrieval study 3"]
+    assert [p.paper_id for p in api.get_citing_papers(["W7"])] == ["https://openalex.org/W8"]
+
+    streamed = list(api.iter_search_papers("survey", limit=12, per_page=5))
+    assert len(streamed) == 12 and streamed[0].title == "Survey 1"
+    assert len(list(api.iter_search_papers("survey", limit=None, per_page=7))) == 20
+
+
+def test_snapshot_index_is_reused_until_the_dump_changes(tmp_path) -> None:
+    path = tmp_path / "works.jsonl.gz"
+    _write_snapshot(path, count=5)
+
+    first = OpenAlexSnapshot(path)
+    assert first.built and len(first) == 5
+    first.close()
+    reopened = OpenAlexSnapshot(path)
+    assert not reopened.built and len(reopened) == 5
+    reopened.close()
+
+    _write_snapshot(path, count=8)
+    os.utime(path, ns=(0, path.stat().st_mtime_ns + 1))
+    rebuilt = OpenAlexSnapshot(path)
+    assert rebuilt.built and len(rebuilt) == 8
+    assert Path(f"{path}.index.sqlite").is_file()
+
+    query = rebuilt.filter(publication_year=">2015").sort(cited_by_count="desc")
+    page = query.get(per_page=1, cursor="*")
+    assert page[0]["id"] == "https://openalex.org/W7"
+    assert query.get(per_page=1, cursor=page.meta["next_cursor"])[0]["id"].endswith("/W6")
+    assert not list(tmp_path.glob(".*.tmp"))
+    with pytest.raises(ValueError):
+        rebuilt.filter(institution="I1")
+    with pytest.raises(ValueError):
+        OpenAlexSnapshot(tmp_path / "missing.jsonl")
+
+
+def test_snapshot_cursors_seek_in_sort_order_past_null_keys(tmp_path) -> None:
+    path = tmp_path / "works.jsonl"
+    works = [
+        {
+            "id": f"https://openalex.org/W{i}",
+            "display_name": f"Retrieval study {i % 4}",
+            "publication_year": None if i % 5 == 0 else 2000 + i % 7,
+            "cited_by_count": None if i % 4 == 0 else i % 6,
+        }
+        for i in range(40)
+    ]
+    path.write_text("".join(json.dumps(work) + "\n" for work in works))
+    snapshot = OpenAlexSnapshot(path)
+
+    queries = [
+        snapshot.filter(publication_year="2001-2005"),
+        snapshot.sort(cited_by_count="desc", publication_year="asc"),
+        snapshot.sort(cited_by_count="asc"),
+        snapshot.search("retrieval study 2"),
+    ]
+    for query in queries:
+        expected = [work["id"] for work in query.get(per_page=200, page=1)]
+        pages = list(query.paginate(per_page=3, n_max=None))
+        assert [work["id"] for page in pages for work in page] == expected
+        by_number = query.paginate(method="page", per_page=3, n_max=None)
+        assert [work["id"] for page in by_number for work in page] == expected
+    snapshot.close()
+
+
+def test_default_api_reuses_one_snapshot_and_cache(tmp_path, monkeypatch) -> None:
+    path = tmp_path / "works.jsonl.gz"
+    _write_snapshot(path, count=5)
+
+    class Settings:
+        openalex_mailto = None
+        openalex_cache_path = str(tmp_path / "cache.sqlite")
+        openalex_snapshot_path = str(path)
+
+    monkeypatch.setattr(openalex, "load_settings", Settings)
+    first, second = openalex._default_api(), openalex._default_api()
+
+    assert first.works is second.works and first.cache is second.cache
+    assert second.get_paper_details("W3").title == "Graph retrieval study 3"
+    openalex._shared_backends.cache_clear()
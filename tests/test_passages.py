@@ -0,0 +1,22 @@
+from thesis_generator.tools.passages import ShingleIndex
+
+
+def test_shingle_index_locates_exact_and_edited_passages() -> None:
+    source = (
+        "Background text first. Retrieval augmented generation grounds large language "
+        "models in external evidence, reducing hallucinated claims. Closing remarks."
+    )
+    index = ShingleIndex(shingle_size=3)
+    index.extend(["unrelated words only here", source])
+
+    [(row, start, end, overlap)] = index.match(
+        "retrieval augmented generation grounds large language models"
+    )
+    assert (row, overlap) == (1, 1.0)
+    assert source[start:end] == "Retrieval augmented generation grounds large language models"
+
+    edited = index.match(
+        "Retrieval-augmented generation grounds LLM models in external evidence, reducing claims"
+    )
+    assert edited[0][0] == 1 and 0.3 < edited[0][3] < 1.0
+    assert index.match("too short") == []
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any
+
+import pytest
+import requests
+
+from thesis_generator.tools.openalex import OpenAlexAPI, openalex_config
+from thesis_generator.tools.rate_limit import HostBudget, TokenBucketScheduler, host_of
+
+
+def test_scheduler_holds_throughput_at_the_budget() -> None:
+    scheduler = TokenBucketScheduler({"api.example.org": HostBudget(rate=50, burst=2)})
+
+    def worker() -> None:
+        for _ in range(3):
+            scheduler.acquire("https://api.example.org/works?page=1")
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    # Two requests ride the burst; the other ten are spaced at the 50/s rate.
+    assert 0.18 <= elapsed < 1.0
+    stats = scheduler.stats()["api.example.org"]
+    assert (stats.granted, stats.interactive, stats.waiting) == (12, 12, 0)
+    assert stats.max_waiting >= 2 and stats.mean_wait > 0
+    assert host_of("https://API.example.org:8443/x") == "api.example.org"
+
+
+def test_interactive_requests_overtake_queued_batch_work() -> None:
+    scheduler = TokenBucketScheduler(default=HostBudget(rate=20, burst=1))
+    scheduler.acquire("host")
+    order: list[str] = []
+
+    def request(priority: Any) -> None:
+        scheduler.acquire("host", priority=priority)
+        order.append(priority)
+
+    threads = [threading.Thread(target=request, args=("batch",)) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    while scheduler.stats()["host"].waiting < 3:
+        time.sleep(0.001)
+    threads.append(threading.Thread(target=request, args=("interactive",)))
+    threads[-1].start()
+    for thread in threads:
+        thread.join()
+
+    assert order[0] == "interactive" and order.count("batch") == 3
+    stats = scheduler.stats()["host"]
+    assert (stats.interactive, stats.batch, stats.max_waiting) == (2, 3, 4)
+
+
+def test_penalize_pauses_the_host_and_timeouts_leave_the_queue() -> None:
+    scheduler = TokenBucketScheduler(default=HostBudget(rate=100, burst=5))
+    scheduler.penalize("https://api.example.org/a", retry_after=0.1)
+    assert scheduler.acquire("api.example.org") >= 0.09
+
+    slow = TokenBucketScheduler(default=HostBudget(rate=1))
+    slow.acquire("host")
+    with pytest.raises(TimeoutError):
+        slow.acquire("host", timeout=0.05)
+    stats = slow.stats()["host"]
+    assert (stats.granted, stats.waiting, stats.timeouts) == (1, 0, 1)
+    assert scheduler.stats()["api.example.org"].throttled == 1
+    with pytest.raises(ValueError):
+        HostBudget(rate=0)
+
+
+def test_openalex_requests_go_through_the_scheduler() -> None:
+    class Works:
+        params: dict[str, Any] = {}
+
+        def filter(self, **kwargs: Any) -> Works:
+            return self
+
+        def select(self, fields: str) -> Works:
+            return self
+
+        def get(self, **kwargs: Any) -> list[dict[str, Any]]:
+            return []
+
+    scheduler = TokenBucketScheduler(default=HostBudget(rate=100, burst=3))
+    api = OpenAlexAPI(works_client=Works(), rate_limiter=scheduler, priority="batch")
+
+    assert api.get_papers_bulk([f"W{i}" for i in range(250)]) == [None] * 250
+    stats = scheduler.stats()["api.openalex.org"]
+    assert (stats.granted, stats.batch) == (3, 3)
+    assert OpenAlexAPI(works_client=Works()).rate_limiter is None
+
+
+def test_openalex_429s_penalize_the_host_and_pages_spend_one_slot_each() -> None:
+    throttled = requests.Response()
+    throttled.status_code = 429
+    throttled.headers["Retry-After"] = "0.05"
+
+    class Works:
+        params: dict[str, Any] = {}
+        failures = 1
+
+        def search(self, text: str) -> Works:
+            return self
+
+        def filter(self, **kwargs: Any) -> Works:
+            return self
+
+        def select(self, fields: str) -> Works:
+            return self
+
+        def get(self, **kwargs: Any) -> list[dict[str, Any]]:
+            if self.failures:
+                self.failures -= 1
+                raise requests.HTTPError(response=throttled)
+            return [{"id": "W1", "display_name": "Paper"}]
+
+        def paginate(self, per_page: int, **kwargs: Any) -> Any:
+            return iter([[{"id": "W1", "display_name": "A"}] * per_page, [{"id": "W2"}]])
+
+    scheduler = TokenBucketScheduler(default=HostBudget(rate=100, burst=5))
+    api = OpenAlexAPI(works_client=Works(), rate_limiter=scheduler)
+
+    started = time.perf_counter()
+    assert api.get_paper_details("W1").title == "Paper"
+    assert time.perf_counter() - started >= 0.04
+    stats = scheduler.stats()["api.openalex.org"]
+    assert (stats.granted, stats.throttled) == (2, 1)
+
+    assert len(api.search_papers("rag", limit=10, per_page=2)) == 3
+    assert scheduler.stats()["api.openalex.org"].granted == 4
+
+    Works.failures = 5
+    impatient = OpenAlexAPI(works_client=Works(), rate_limiter=scheduler, max_retries=1)
+    with pytest.raises(requests.HTTPError):
+        impatient.get_paper_details("W1")
+
+    OpenAlexAPI()
+    assert 429 not in openalex_config.retry_http_codes
@@ -0,0 +1,60 @@
+import time
+
+import numpy as np
+import pytest
+
+from thesis_generator.tools.rerank import LexicalReranker, RerankStage
+
+
+class CountingReranker:
+    def __init__(self) -> None:
+        self.batches: list[int] = []
+
+    def __call__(self, pairs):
+        self.batches.append(len(pairs))
+        return np.array([float(len(passage)) for _, passage in pairs])
+
+
+def test_lexical_reranker_prefers_adjacent_query_terms() -> None:
+    reranker = LexicalReranker()
+    scores = reranker(
+        [
+            ("graph retrieval", "we study graph retrieval for theses"),
+            ("graph retrieval", "retrieval of documents and a graph far away from it"),
+            ("graph retrieval", "nothing relevant here"),
+        ]
+    )
+
+    assert scores[0] > scores[1] > scores[2] == 0
+    # Full coverage, the one query bigram, and both terms in a two-word window.
+    assert scores[0] == pytest.approx(1 + 0.5 + 0.25)
+
+
+def test_rerank_stage_batches_across_queries_and_caches_pairs() -> None:
+    reranker = CountingReranker()
+    stage = RerankStage(reranker, batch_size=3)
+    candidates = [["a", "ccc", "bb"], ["dddd", "a"]]
+
+    ranked = stage.rank(["q1", "q2"], candidates)
+
+    assert ranked == [[(1, 3.0), (2, 2.0), (0, 1.0)], [(0, 4.0), (1, 1.0)]]
+    assert reranker.batches == [3, 2]
+    assert stage.rank(["q1", "q2"], candidates) == ranked
+    info = stage.cache_info()
+    assert (info.hits, info.misses, info.currsize, info.batches) == (5, 5, 5, 2)
+
+
+def test_rerank_stage_returns_partial_ranking_when_budget_runs_out() -> None:
+    class SlowReranker(CountingReranker):
+        def __call__(self, pairs):
+            time.sleep(0.05)
+            return super().__call__(pairs)
+
+    reranker = SlowReranker()
+    stage = RerankStage(reranker, batch_size=1, time_budget=0.01)
+
+    # The first batch starts within budget; the rest keep first-stage order unscored.
+    assert stage.rank(["q"], [["a", "bb", "ccc"]]) == [[(0, 1.0), (1, None), (2, None)]]
+    assert reranker.batches == [1] and stage.cache_info().truncated == 1
+    with pytest.raises(ValueError):
+        stage.rank(["q"], [])
@@ -0,0 +1,74 @@
+import pytest
+
+from thesis_generator.tools.ingest import (
+    _VECTOR_STORES,
+    ingest_documents,
+    reset_vector_store_registry,
+    search_many,
+    search_parents,
+    search_sections,
+)
+from thesis_generator.tools.sharding import ingest_sharded_documents
+
+
+def setup_function() -> None:
+    reset_vector_store_registry()
+
+
+def teardown_function() -> None:
+    _VECTOR_STORES.close()
+
+
+def _papers() -> list[dict]:
+    return [
+        {
+            "title": f"Paper {i}",
+            "id": f"W{i}",
+            "year": 2010 + i % 10,
+            "sections": [
+                {"heading": "Body", "content": f"retrieval topic{i % 5} graph{i % 3} study{i}"}
+            ],
+        }
+        for i in range(30)
+    ]
+
+
+@pytest.mark.parametrize("scoring", ["overlap", "bm25", "dense", "hybrid"])
+def test_sharded_search_matches_single_store_scores(scoring) -> None:
+    # Rank fusion depends on how ties are ordered, so compare score-based fusion.
+    single = ingest_documents(_papers(), scoring=scoring, fusion="weighted")
+    sharded = ingest_sharded_documents(_papers(), shards=3, scoring=scoring, fusion="weighted")
+    queries = ["retrieval topic2 graph1", "study7 topic4"]
+
+    for query in queries:
+        expected = search_sections(query, vector_store_uri=single, k=6)
+        actual = search_sections(query, vector_store_uri=sharded, k=6)
+        assert [r.score for r in actual] == pytest.approx([r.score for r in expected])
+        # Hits strictly above the k-th score are the same; ties may order differently.
+        cutoff = expected[-1].score + 1e-9
+        assert {r.chunk.page_content for r in actual if r.score > cutoff} == {
+            r.chunk.page_content for r in expected if r.score > cutoff
+        }
+
+    if scoring == "hybrid":
+        with pytest.raises(ValueError):
+            search_parents("retrieval", vector_store_uri=sharded)
+        return
+    expected_parents = search_parents("retrieval topic2", vector_store_uri=single, combine="sum")
+    actual_parents = search_parents("retrieval topic2", vector_store_uri=sharded, combine="sum")
+    assert [p.score for p in actual_parents] == pytest.approx([p.score for p in expected_parents])
+
+    filtered = search_many(queries, vector_store_uri=sharded, filters={"year": {"gte": 2015}})
+    assert all(r.chunk.metadata["year"] >= 2015 for results in filtered for r in results)
+
+
+def test_sharded_store_appends_and_removes_across_shards() -> None:
+    uri = ingest_sharded_documents(_papers()[:4], shards=2, scoring="bm25")
+    store = _VECTOR_STORES[uri]
+    assert len(store) == 4
+
+    store.append([{"title": "Paper 0", "id": "W0", "content": "replacement text"}], replace=True)
+    assert len(store) == 4
+    [hit] = search_sections("replacement", vector_store_uri=uri, k=1)
+    assert hit.parent.metadata["document_id"] == "W0"
+    assert store.remove_document("W1") == 1 and len(store) == 3